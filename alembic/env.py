@@ -73,8 +73,12 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
+        # Each revision commits on its own, so session settings one makes (lock_timeout)
+        # end with it and revisions that backfill in autocommit blocks start clean
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            transaction_per_migration=True,
         )
 
         with context.begin_transaction():
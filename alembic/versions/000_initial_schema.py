@@ -0,0 +1,216 @@
+"""initial schema
+
+Revision ID: 000
+Revises: 
+Create Date: 2026-10-17 20:00:00.000000
+
+The tables as they stood before 001, including the sitter_profiles flags that
+app/db/migration_fix used to add at startup. Databases that were built by
+create_all and never migrated already have these tables but none of the later
+revisions, so mark only this one as applied and upgrade from there:
+
+    alembic stamp 000    # or 001, if its columns were already added by hand
+    alembic upgrade head
+
+Don't stamp head: that records 001 onwards as applied without running them.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '000'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+ENUM_TYPES = [
+    'allowedhomeaccess',
+    'authproviderenum',
+    'availabilitytype',
+    'backgroundcheckstatus',
+    'cancellationpolicy',
+    'governmentidtype',
+    'homeownership',
+    'hometype',
+    'leashtype',
+    'payoutmethod',
+    'pottybreakfrequency',
+    'sleepingarrangement',
+    'trainingmethod',
+    'userrole',
+    'userstatus',
+    'walkduration',
+    'walktype',
+    'weatherpolicy',
+    'yardsize',
+]
+
+
+def upgrade() -> None:
+    op.create_table('user',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('email', sa.String(), nullable=True),
+    sa.Column('phone_number', sa.String(), nullable=True),
+    sa.Column('full_name', sa.String(), nullable=True),
+    sa.Column('avatar_url', sa.String(), nullable=True),
+    sa.Column('role', sa.Enum('USER', 'ADMIN', name='userrole'), nullable=False),
+    sa.Column('is_email_verified', sa.Boolean(), nullable=False),
+    sa.Column('is_phone_verified', sa.Boolean(), nullable=False),
+    sa.Column('status', sa.Enum('ACTIVE', 'BLOCKED', 'DELETED', name='userstatus'), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('phone_number')
+    )
+    op.create_index(op.f('ix_user_email'), 'user', ['email'], unique=True)
+    op.create_table('auth_providers',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('user_id', sa.Uuid(), nullable=False),
+    sa.Column('provider', sa.Enum('GOOGLE', 'OTP', 'EMAIL', name='authproviderenum'), nullable=False),
+    sa.Column('provider_uid', sa.String(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_auth_providers_provider_uid'), 'auth_providers', ['provider_uid'], unique=False)
+    op.create_table('sitter_profiles',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('user_id', sa.Uuid(), nullable=False),
+    sa.Column('full_name', sa.String(), nullable=False),
+    sa.Column('profile_photo', sa.String(), nullable=True),
+    sa.Column('date_of_birth', sa.Date(), nullable=False),
+    sa.Column('phone', sa.String(), nullable=False),
+    sa.Column('email', sa.String(), nullable=True),
+    sa.Column('government_id_type', sa.Enum('PASSPORT', 'NATIONAL_ID', name='governmentidtype'), nullable=True),
+    sa.Column('id_verified', sa.Boolean(), nullable=False),
+    sa.Column('is_phone_verified', sa.Boolean(), nullable=False),
+    sa.Column('is_shahkar_verified', sa.Boolean(), nullable=False),
+    sa.Column('background_check_status', sa.Enum('PENDING', 'APPROVED', 'REJECTED', name='backgroundcheckstatus'), nullable=False),
+    sa.Column('emergency_contact_name', sa.String(), nullable=True),
+    sa.Column('emergency_contact_phone', sa.String(), nullable=True),
+    sa.Column('is_personal_info_completed', sa.Boolean(), nullable=False),
+    sa.Column('is_location_completed', sa.Boolean(), nullable=False),
+    sa.Column('is_services_selected', sa.Boolean(), nullable=False),
+    sa.Column('is_boarding_completed', sa.Boolean(), nullable=False),
+    sa.Column('is_house_sitting_completed', sa.Boolean(), nullable=False),
+    sa.Column('is_drop_in_completed', sa.Boolean(), nullable=False),
+    sa.Column('is_dog_walking_completed', sa.Boolean(), nullable=False),
+    sa.Column('is_day_care_completed', sa.Boolean(), nullable=False),
+    sa.Column('is_experience_completed', sa.Boolean(), nullable=False),
+    sa.Column('is_home_completed', sa.Boolean(), nullable=False),
+    sa.Column('is_content_completed', sa.Boolean(), nullable=False),
+    sa.Column('is_pricing_completed', sa.Boolean(), nullable=False),
+    sa.Column('country', sa.String(), nullable=True),
+    sa.Column('city', sa.String(), nullable=True),
+    sa.Column('latitude', sa.Float(), nullable=True),
+    sa.Column('longitude', sa.Float(), nullable=True),
+    sa.Column('service_radius_km', sa.Integer(), nullable=True),
+    sa.Column('availability_type', sa.Enum('FULL_TIME', 'PART_TIME', name='availabilitytype'), nullable=True),
+    sa.Column('available_days', sa.ARRAY(sa.String()), nullable=True),
+    sa.Column('available_time_slots', sa.JSON(), nullable=True),
+    sa.Column('blackout_dates', sa.ARRAY(sa.Date()), nullable=True),
+    sa.Column('years_of_experience', sa.Integer(), nullable=False),
+    sa.Column('pet_experience_types', sa.ARRAY(sa.String()), nullable=True),
+    sa.Column('breeds_experience', sa.ARRAY(sa.String()), nullable=True),
+    sa.Column('size_experience', sa.ARRAY(sa.String()), nullable=True),
+    sa.Column('puppy_experience', sa.Boolean(), nullable=False),
+    sa.Column('senior_pet_experience', sa.Boolean(), nullable=False),
+    sa.Column('medication_experience', sa.Boolean(), nullable=False),
+    sa.Column('behavioral_experience', sa.ARRAY(sa.String()), nullable=True),
+    sa.Column('first_aid_certified', sa.Boolean(), nullable=False),
+    sa.Column('vet_clinic_reference', sa.String(), nullable=True),
+    sa.Column('home_type', sa.Enum('HOUSE', 'APARTMENT', 'CONDO', 'FARM', name='hometype'), nullable=True),
+    sa.Column('home_ownership', sa.Enum('OWN', 'RENT', name='homeownership'), nullable=True),
+    sa.Column('fenced_yard', sa.Boolean(), nullable=False),
+    sa.Column('yard_size', sa.Enum('NONE', 'SMALL', 'MEDIUM', 'LARGE', name='yardsize'), nullable=True),
+    sa.Column('pets_in_home', sa.Boolean(), nullable=False),
+    sa.Column('own_pets_details', sa.JSON(), nullable=True),
+    sa.Column('children_in_home', sa.Boolean(), nullable=False),
+    sa.Column('smoking_home', sa.Boolean(), nullable=False),
+    sa.Column('crate_available', sa.Boolean(), nullable=False),
+    sa.Column('cameras_in_home', sa.Boolean(), nullable=False),
+    sa.Column('base_price', sa.Float(), nullable=False),
+    sa.Column('additional_pet_price', sa.Float(), nullable=False),
+    sa.Column('puppy_rate', sa.Float(), nullable=False),
+    sa.Column('holiday_rate', sa.Float(), nullable=False),
+    sa.Column('long_stay_discount', sa.Float(), nullable=False),
+    sa.Column('cancellation_policy', sa.Enum('FLEXIBLE', 'MODERATE', 'STRICT', name='cancellationpolicy'), nullable=True),
+    sa.Column('payout_method', sa.Enum('BANK_TRANSFER', 'PAYPAL', 'STRIPE', name='payoutmethod'), nullable=True),
+    sa.Column('payout_verified', sa.Boolean(), nullable=False),
+    sa.Column('headline', sa.String(), nullable=True),
+    sa.Column('bio', sa.Text(), nullable=True),
+    sa.Column('care_routine_description', sa.Text(), nullable=True),
+    sa.Column('training_philosophy', sa.Text(), nullable=True),
+    sa.Column('photo_gallery', sa.ARRAY(sa.String()), nullable=True),
+    sa.Column('intro_video', sa.String(), nullable=True),
+    sa.Column('is_boarding_supported', sa.Boolean(), nullable=False),
+    sa.Column('is_house_sitting_supported', sa.Boolean(), nullable=False),
+    sa.Column('is_drop_in_supported', sa.Boolean(), nullable=False),
+    sa.Column('is_dog_walking_supported', sa.Boolean(), nullable=False),
+    sa.Column('is_day_care_supported', sa.Boolean(), nullable=False),
+    sa.Column('boarding_max_pets', sa.Integer(), nullable=True),
+    sa.Column('boarding_overnight_supervision', sa.Boolean(), nullable=False),
+    sa.Column('boarding_allowed_pet_types', sa.ARRAY(sa.String()), nullable=True),
+    sa.Column('boarding_daily_walks', sa.Integer(), nullable=True),
+    sa.Column('boarding_potty_break_freq', sa.Enum('EVERY_HOUR', 'EVERY_2_HOURS', 'EVERY_4_HOURS', 'EVERY_8_HOURS', name='pottybreakfrequency'), nullable=True),
+    sa.Column('boarding_sleeping_arrangement', sa.Enum('IN_BED', 'IN_CRATE', 'IN_OWN_BED', 'ANYWHERE', name='sleepingarrangement'), nullable=True),
+    sa.Column('boarding_separation_policy', sa.Boolean(), nullable=False),
+    sa.Column('house_sitting_overnight', sa.Boolean(), nullable=False),
+    sa.Column('house_sitting_daytime_hours', sa.Integer(), nullable=True),
+    sa.Column('house_sitting_mail_collection', sa.Boolean(), nullable=False),
+    sa.Column('house_sitting_plant_watering', sa.Boolean(), nullable=False),
+    sa.Column('house_sitting_security_check', sa.Boolean(), nullable=False),
+    sa.Column('house_sitting_allowed_access', sa.Enum('FULL_ACCESS', 'LIMITED_ACCESS', name='allowedhomeaccess'), nullable=True),
+    sa.Column('drop_in_duration_min', sa.Integer(), nullable=True),
+    sa.Column('drop_in_visits_per_day', sa.Integer(), nullable=True),
+    sa.Column('drop_in_feeding', sa.Boolean(), nullable=False),
+    sa.Column('drop_in_litter_cleaning', sa.Boolean(), nullable=False),
+    sa.Column('drop_in_medication', sa.Boolean(), nullable=False),
+    sa.Column('drop_in_photo_update', sa.Boolean(), nullable=False),
+    sa.Column('walking_duration', sa.Enum('MIN_30', 'MIN_60', name='walkduration'), nullable=True),
+    sa.Column('walking_type', sa.Enum('PRIVATE', 'GROUP', name='walktype'), nullable=True),
+    sa.Column('walking_max_dogs', sa.Integer(), nullable=True),
+    sa.Column('walking_leash_type', sa.Enum('STANDARD', 'RETRACTABLE', 'LONG_LINE', name='leashtype'), nullable=True),
+    sa.Column('walking_gps_tracking', sa.Boolean(), nullable=False),
+    sa.Column('walking_weather_policy', sa.Enum('RAIN_OR_SHINE', 'NO_EXTREME_WEATHER', name='weatherpolicy'), nullable=True),
+    sa.Column('daycare_hours', sa.JSON(), nullable=True),
+    sa.Column('daycare_rest_periods', sa.Boolean(), nullable=False),
+    sa.Column('daycare_structured_play', sa.Boolean(), nullable=False),
+    sa.Column('daycare_size_separation', sa.Boolean(), nullable=False),
+    sa.Column('daycare_feeding_schedule', sa.Boolean(), nullable=False),
+    sa.Column('daycare_nap_area', sa.Boolean(), nullable=False),
+    sa.Column('training_types', sa.ARRAY(sa.String()), nullable=True),
+    sa.Column('training_method', sa.Enum('POSITIVE_REINFORCEMENT', 'BALANCED', 'OTHER', name='trainingmethod'), nullable=True),
+    sa.Column('training_certifications', sa.ARRAY(sa.String()), nullable=True),
+    sa.Column('training_session_duration', sa.Integer(), nullable=True),
+    sa.Column('training_packages', sa.JSON(), nullable=True),
+    sa.Column('training_off_leash', sa.Boolean(), nullable=False),
+    sa.Column('training_behavioral_mod', sa.Boolean(), nullable=False),
+    sa.Column('rating', sa.Float(), nullable=False),
+    sa.Column('completed_bookings', sa.Integer(), nullable=False),
+    sa.Column('repeat_clients', sa.Integer(), nullable=False),
+    sa.Column('reviews', sa.JSON(), nullable=True),
+    sa.Column('response_time_minutes', sa.Integer(), nullable=True),
+    sa.Column('cancellation_rate', sa.Float(), nullable=False),
+    sa.Column('insurance_status', sa.Boolean(), nullable=False),
+    sa.Column('liability_acceptance', sa.Boolean(), nullable=False),
+    sa.Column('pet_emergency_protocol', sa.Text(), nullable=True),
+    sa.Column('terms_accepted', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('sitter_profiles')
+    op.drop_index(op.f('ix_auth_providers_provider_uid'), table_name='auth_providers')
+    op.drop_table('auth_providers')
+    op.drop_index(op.f('ix_user_email'), table_name='user')
+    op.drop_table('user')
+    for name in ENUM_TYPES:
+        postgresql.ENUM(name=name).drop(op.get_bind(), checkfirst=True)
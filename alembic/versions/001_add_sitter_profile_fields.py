@@ -1,7 +1,7 @@
 """add sitter profile fields
 
 Revision ID: 001
-Revises: 
+Revises: 000
 Create Date: 2023-10-27 10:00:00.000000
 
 """
@@ -11,7 +11,7 @@ import sqlmodel
 
 # revision identifiers, used by Alembic.
 revision = '001'
-down_revision = None
+down_revision = '000'
 branch_labels = None
 depends_on = None
 
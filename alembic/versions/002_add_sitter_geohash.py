@@ -0,0 +1,56 @@
+"""add sitter geohash
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from app.core.geo import encode_geohash
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+
+def upgrade() -> None:
+    op.add_column('sitter_profiles', sa.Column('geohash', sa.String(collation='C'), nullable=True))
+    op.create_index('ix_sitter_profiles_geohash', 'sitter_profiles', ['geohash'])
+
+    # Backfill existing sitters in batches along the primary key, each committed on its
+    # own once the DDL above has released its lock
+    conn = op.get_bind()
+    with op.get_context().autocommit_block():
+        last_id = None
+        while True:
+            query = "SELECT id, latitude, longitude FROM sitter_profiles WHERE latitude IS NOT NULL AND longitude IS NOT NULL"
+            params = {"limit": BATCH_SIZE}
+            if last_id is not None:
+                query += " AND id > :last_id"
+                params["last_id"] = last_id
+            rows = conn.execute(sa.text(query + " ORDER BY id LIMIT :limit"), params).fetchall()
+            if not rows:
+                break
+            # One statement per batch, so each batch is applied atomically
+            conn.execute(
+                sa.text(
+                    "UPDATE sitter_profiles p SET geohash = b.geohash "
+                    "FROM unnest(CAST(:ids AS uuid[]), CAST(:geohashes AS text[])) AS b(id, geohash) "
+                    "WHERE p.id = b.id"
+                ),
+                {
+                    "ids": [str(row.id) for row in rows],
+                    "geohashes": [encode_geohash(row.latitude, row.longitude) for row in rows],
+                },
+            )
+            last_id = rows[-1].id
+
+
+def downgrade() -> None:
+    op.drop_index('ix_sitter_profiles_geohash', table_name='sitter_profiles')
+    op.drop_column('sitter_profiles', 'geohash')
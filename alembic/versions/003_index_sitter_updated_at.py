@@ -0,0 +1,23 @@
+"""index sitter updated_at
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Used by the facet index to pick up rows changed by other workers
+    op.create_index('ix_sitter_profiles_updated_at', 'sitter_profiles', ['updated_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_sitter_profiles_updated_at', table_name='sitter_profiles')
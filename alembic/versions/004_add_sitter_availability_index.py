@@ -0,0 +1,68 @@
+"""add sitter availability index tables
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+from app.services.availability_service import availability_rows
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+
+def upgrade() -> None:
+    availability = op.create_table(
+        'sitter_availability',
+        sa.Column('sitter_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('sitter_profiles.id'), primary_key=True),
+        sa.Column('weekday', sa.Integer(), primary_key=True),
+        sa.Column('time_slot', sa.String(), primary_key=True),
+    )
+    op.create_index('ix_sitter_availability_weekday_slot', 'sitter_availability', ['weekday', 'time_slot', 'sitter_id'])
+
+    blackouts = op.create_table(
+        'sitter_blackout_dates',
+        sa.Column('sitter_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('sitter_profiles.id'), primary_key=True),
+        sa.Column('blackout_date', sa.Date(), primary_key=True),
+    )
+    op.create_index('ix_sitter_blackout_dates_date_sitter', 'sitter_blackout_dates', ['blackout_date', 'sitter_id'])
+
+    # Backfill from the existing profile columns in batches
+    conn = op.get_bind()
+    last_id = None
+    while True:
+        query = "SELECT id, available_days, available_time_slots, blackout_dates FROM sitter_profiles"
+        params = {"limit": BATCH_SIZE}
+        if last_id is not None:
+            query += " WHERE id > :last_id"
+            params["last_id"] = last_id
+        rows = conn.execute(sa.text(query + " ORDER BY id LIMIT :limit"), params).fetchall()
+        if not rows:
+            break
+        availability_data = []
+        blackout_data = []
+        for row in rows:
+            for weekday, slot in availability_rows(row.available_days, row.available_time_slots):
+                availability_data.append({"sitter_id": row.id, "weekday": weekday, "time_slot": slot})
+            for blackout_date in set(row.blackout_dates or []):
+                blackout_data.append({"sitter_id": row.id, "blackout_date": blackout_date})
+        if availability_data:
+            op.bulk_insert(availability, availability_data)
+        if blackout_data:
+            op.bulk_insert(blackouts, blackout_data)
+        last_id = rows[-1].id
+
+
+def downgrade() -> None:
+    op.drop_index('ix_sitter_blackout_dates_date_sitter', table_name='sitter_blackout_dates')
+    op.drop_table('sitter_blackout_dates')
+    op.drop_index('ix_sitter_availability_weekday_slot', table_name='sitter_availability')
+    op.drop_table('sitter_availability')
@@ -0,0 +1,61 @@
+"""add sitter full-text search vector
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+from app.core.config import settings
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+
+def upgrade() -> None:
+    op.add_column('sitter_profiles', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+
+    # Backfill in batches along the primary key, each committed on its own, so row
+    # locks are held for one batch at a time. The GIN index comes afterwards, built
+    # once and concurrently instead of being updated by every batch.
+    conn = op.get_bind()
+    with op.get_context().autocommit_block():
+        backfill = sa.text(
+            """
+            WITH batch AS (
+                SELECT id FROM sitter_profiles WHERE id > CAST(:last_id AS uuid) ORDER BY id LIMIT :limit
+            ), updated AS (
+                UPDATE sitter_profiles p SET search_vector =
+                    setweight(to_tsvector(CAST(:config AS regconfig), coalesce(p.headline, '')), 'A') ||
+                    setweight(to_tsvector(CAST(:config AS regconfig), coalesce(p.bio, '')), 'B') ||
+                    setweight(to_tsvector(CAST(:config AS regconfig), coalesce(p.care_routine_description, '')), 'C') ||
+                    setweight(to_tsvector(CAST(:config AS regconfig), coalesce(p.training_philosophy, '')), 'C')
+                FROM batch WHERE p.id = batch.id
+            )
+            SELECT id FROM batch ORDER BY id DESC LIMIT 1
+            """
+        )
+        last_id = '00000000-0000-0000-0000-000000000000'
+        while True:
+            last_id = conn.execute(
+                backfill, {"config": settings.FULL_TEXT_SEARCH_CONFIG, "last_id": last_id, "limit": BATCH_SIZE}
+            ).scalar()
+            if last_id is None:
+                break
+
+        op.create_index(
+            'ix_sitter_profiles_search_vector', 'sitter_profiles', ['search_vector'],
+            postgresql_using='gin', postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_sitter_profiles_search_vector', table_name='sitter_profiles')
+    op.drop_column('sitter_profiles', 'search_vector')
@@ -0,0 +1,26 @@
+"""add sitter rank score
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Populate with `python manage.py backfill-rank-score` after upgrading
+    op.add_column('sitter_profiles', sa.Column('rank_score', sa.Float(), nullable=False, server_default='0'))
+    op.create_index('ix_sitter_profiles_rank_score_id', 'sitter_profiles', ['rank_score', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_sitter_profiles_rank_score_id', table_name='sitter_profiles')
+    op.drop_column('sitter_profiles', 'rank_score')
@@ -0,0 +1,29 @@
+"""add sitter listing sort indexes
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # (sort key, id) indexes backing keyset pagination of the sitter listing
+    op.create_index('ix_sitter_profiles_rating_id', 'sitter_profiles', ['rating', 'id'])
+    op.create_index('ix_sitter_profiles_base_price_id', 'sitter_profiles', ['base_price', 'id'])
+    op.create_index('ix_sitter_profiles_created_at_id', 'sitter_profiles', ['created_at', 'id'])
+    op.create_index('ix_sitter_profiles_years_of_experience_id', 'sitter_profiles', ['years_of_experience', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_sitter_profiles_years_of_experience_id', table_name='sitter_profiles')
+    op.drop_index('ix_sitter_profiles_created_at_id', table_name='sitter_profiles')
+    op.drop_index('ix_sitter_profiles_base_price_id', table_name='sitter_profiles')
+    op.drop_index('ix_sitter_profiles_rating_id', table_name='sitter_profiles')
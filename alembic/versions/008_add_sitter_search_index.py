@@ -0,0 +1,111 @@
+"""add sitter_search_index projection
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+PROJECTED_COLUMNS = [
+    'id', 'user_id', 'full_name', 'profile_photo', 'headline', 'city',
+    'latitude', 'longitude', 'geohash', 'service_radius_km',
+    'base_price', 'additional_pet_price', 'puppy_rate', 'holiday_rate', 'long_stay_discount',
+    'is_boarding_supported', 'is_house_sitting_supported', 'is_drop_in_supported',
+    'is_dog_walking_supported', 'is_day_care_supported',
+    'rating', 'completed_bookings', 'years_of_experience', 'rank_score', 'search_vector',
+    'created_at', 'updated_at',
+]
+
+SORT_INDEXES = [
+    ('rank_score_id', ['rank_score', 'id']),
+    ('rating_id', ['rating', 'id']),
+    ('base_price_id', ['base_price', 'id']),
+    ('created_at_id', ['created_at', 'id']),
+    ('years_of_experience_id', ['years_of_experience', 'id']),
+]
+
+
+def upgrade() -> None:
+    op.create_table(
+        'sitter_search_index',
+        sa.Column('id', postgresql.UUID(as_uuid=True), sa.ForeignKey('sitter_profiles.id'), primary_key=True),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('full_name', sa.String(), nullable=False),
+        sa.Column('profile_photo', sa.String(), nullable=True),
+        sa.Column('headline', sa.String(), nullable=True),
+        sa.Column('city', sa.String(), nullable=True),
+        sa.Column('latitude', sa.Float(), nullable=True),
+        sa.Column('longitude', sa.Float(), nullable=True),
+        sa.Column('geohash', sa.String(collation='C'), nullable=True),
+        sa.Column('service_radius_km', sa.Integer(), nullable=True),
+        sa.Column('base_price', sa.Float(), nullable=False),
+        sa.Column('additional_pet_price', sa.Float(), nullable=False),
+        sa.Column('puppy_rate', sa.Float(), nullable=False),
+        sa.Column('holiday_rate', sa.Float(), nullable=False),
+        sa.Column('long_stay_discount', sa.Float(), nullable=False),
+        sa.Column('is_boarding_supported', sa.Boolean(), nullable=False),
+        sa.Column('is_house_sitting_supported', sa.Boolean(), nullable=False),
+        sa.Column('is_drop_in_supported', sa.Boolean(), nullable=False),
+        sa.Column('is_dog_walking_supported', sa.Boolean(), nullable=False),
+        sa.Column('is_day_care_supported', sa.Boolean(), nullable=False),
+        sa.Column('rating', sa.Float(), nullable=False),
+        sa.Column('completed_bookings', sa.Integer(), nullable=False),
+        sa.Column('years_of_experience', sa.Integer(), nullable=False),
+        sa.Column('rank_score', sa.Float(), nullable=False),
+        sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+    )
+
+    # Backfill before indexing so the bulk load doesn't pay per-row index maintenance
+    conn = op.get_bind()
+    columns = ", ".join(PROJECTED_COLUMNS)
+    last_id = None
+    while True:
+        query = "SELECT id FROM sitter_profiles"
+        params = {"limit": BATCH_SIZE}
+        if last_id is not None:
+            query += " WHERE id > :last_id"
+            params["last_id"] = last_id
+        ids = [row.id for row in conn.execute(sa.text(query + " ORDER BY id LIMIT :limit"), params)]
+        if not ids:
+            break
+        conn.execute(
+            sa.text(f"INSERT INTO sitter_search_index ({columns}) SELECT {columns} FROM sitter_profiles WHERE id = ANY(:ids)"),
+            {"ids": ids},
+        )
+        last_id = ids[-1]
+
+    op.create_index('ix_sitter_search_index_geohash', 'sitter_search_index', ['geohash'])
+    op.create_index(
+        'ix_sitter_search_index_search_vector', 'sitter_search_index', ['search_vector'], postgresql_using='gin'
+    )
+    for name, index_columns in SORT_INDEXES:
+        op.create_index(f'ix_sitter_search_index_{name}', 'sitter_search_index', index_columns)
+
+    # Search and listing now read the projection; drop the wide-row copies of these indexes
+    op.drop_index('ix_sitter_profiles_geohash', table_name='sitter_profiles')
+    op.drop_index('ix_sitter_profiles_search_vector', table_name='sitter_profiles')
+    for name, _ in SORT_INDEXES:
+        op.drop_index(f'ix_sitter_profiles_{name}', table_name='sitter_profiles')
+
+
+def downgrade() -> None:
+    op.create_index('ix_sitter_profiles_geohash', 'sitter_profiles', ['geohash'])
+    op.create_index(
+        'ix_sitter_profiles_search_vector', 'sitter_profiles', ['search_vector'], postgresql_using='gin'
+    )
+    for name, index_columns in SORT_INDEXES:
+        op.create_index(f'ix_sitter_profiles_{name}', 'sitter_profiles', index_columns)
+    op.drop_table('sitter_search_index')
@@ -0,0 +1,64 @@
+"""add sitter onboarding step
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+# Same step numbers as the section writers in sitter_service
+STEP_EXPRESSION = """
+    GREATEST(
+        1,
+        CASE WHEN is_personal_info_completed THEN 2 ELSE 1 END,
+        CASE WHEN is_location_completed THEN 3 ELSE 1 END,
+        CASE WHEN is_services_selected THEN 4 ELSE 1 END,
+        CASE WHEN is_boarding_completed OR is_house_sitting_completed OR is_drop_in_completed
+                  OR is_dog_walking_completed OR is_day_care_completed THEN 5 ELSE 1 END,
+        CASE WHEN is_experience_completed THEN 6 ELSE 1 END,
+        CASE WHEN is_home_completed THEN 7 ELSE 1 END,
+        CASE WHEN is_content_completed THEN 9 ELSE 1 END,
+        CASE WHEN is_pricing_completed THEN 10 ELSE 1 END
+    )
+"""
+
+
+def upgrade() -> None:
+    op.add_column(
+        'sitter_profiles', sa.Column('onboarding_step', sa.Integer(), nullable=False, server_default='1')
+    )
+
+    # Derive the step for profiles that already completed sections, in batches along
+    # the primary key that each commit on their own once add_column has released its lock
+    conn = op.get_bind()
+    with op.get_context().autocommit_block():
+        backfill = sa.text(
+            f"""
+            WITH batch AS (
+                SELECT id FROM sitter_profiles WHERE id > CAST(:last_id AS uuid) ORDER BY id LIMIT :limit
+            ), updated AS (
+                UPDATE sitter_profiles p SET onboarding_step = {STEP_EXPRESSION}
+                FROM batch WHERE p.id = batch.id AND {STEP_EXPRESSION} > p.onboarding_step
+            )
+            SELECT id FROM batch ORDER BY id DESC LIMIT 1
+            """
+        )
+        last_id = '00000000-0000-0000-0000-000000000000'
+        while True:
+            last_id = conn.execute(backfill, {"last_id": last_id, "limit": BATCH_SIZE}).scalar()
+            if last_id is None:
+                break
+
+
+def downgrade() -> None:
+    op.drop_column('sitter_profiles', 'onboarding_step')
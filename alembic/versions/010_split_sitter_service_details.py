@@ -0,0 +1,196 @@
+"""split service-specific sitter criteria into 1:1 tables
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-17 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '010'
+down_revision = '009'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+
+def _enum(name):
+    # The enum types already exist; they were created along with sitter_profiles
+    return postgresql.ENUM(name=name, create_type=False)
+
+
+def _service_columns():
+    # table -> (supported flag, completed flag, columns moved off sitter_profiles)
+    return {
+        'sitter_boarding': ('is_boarding_supported', 'is_boarding_completed', [
+            sa.Column('boarding_max_pets', sa.Integer(), nullable=True),
+            sa.Column('boarding_overnight_supervision', sa.Boolean(), nullable=False, server_default='false'),
+            sa.Column('boarding_allowed_pet_types', postgresql.ARRAY(sa.String()), nullable=True),
+            sa.Column('boarding_daily_walks', sa.Integer(), nullable=True),
+            sa.Column('boarding_potty_break_freq', _enum('pottybreakfrequency'), nullable=True),
+            sa.Column('boarding_sleeping_arrangement', _enum('sleepingarrangement'), nullable=True),
+            sa.Column('boarding_separation_policy', sa.Boolean(), nullable=False, server_default='false'),
+        ]),
+        'sitter_house_sitting': ('is_house_sitting_supported', 'is_house_sitting_completed', [
+            sa.Column('house_sitting_overnight', sa.Boolean(), nullable=False, server_default='false'),
+            sa.Column('house_sitting_daytime_hours', sa.Integer(), nullable=True),
+            sa.Column('house_sitting_mail_collection', sa.Boolean(), nullable=False, server_default='false'),
+            sa.Column('house_sitting_plant_watering', sa.Boolean(), nullable=False, server_default='false'),
+            sa.Column('house_sitting_security_check', sa.Boolean(), nullable=False, server_default='false'),
+            sa.Column('house_sitting_allowed_access', _enum('allowedhomeaccess'), nullable=True),
+        ]),
+        'sitter_drop_in': ('is_drop_in_supported', 'is_drop_in_completed', [
+            sa.Column('drop_in_duration_min', sa.Integer(), nullable=True),
+            sa.Column('drop_in_visits_per_day', sa.Integer(), nullable=True),
+            sa.Column('drop_in_feeding', sa.Boolean(), nullable=False, server_default='false'),
+            sa.Column('drop_in_litter_cleaning', sa.Boolean(), nullable=False, server_default='false'),
+            sa.Column('drop_in_medication', sa.Boolean(), nullable=False, server_default='false'),
+            sa.Column('drop_in_photo_update', sa.Boolean(), nullable=False, server_default='false'),
+        ]),
+        'sitter_walking': ('is_dog_walking_supported', 'is_dog_walking_completed', [
+            sa.Column('walking_duration', _enum('walkduration'), nullable=True),
+            sa.Column('walking_type', _enum('walktype'), nullable=True),
+            sa.Column('walking_max_dogs', sa.Integer(), nullable=True),
+            sa.Column('walking_leash_type', _enum('leashtype'), nullable=True),
+            sa.Column('walking_gps_tracking', sa.Boolean(), nullable=False, server_default='false'),
+            sa.Column('walking_weather_policy', _enum('weatherpolicy'), nullable=True),
+        ]),
+        'sitter_daycare': ('is_day_care_supported', 'is_day_care_completed', [
+            sa.Column('daycare_hours', sa.JSON(), nullable=True),
+            sa.Column('daycare_rest_periods', sa.Boolean(), nullable=False, server_default='false'),
+            sa.Column('daycare_structured_play', sa.Boolean(), nullable=False, server_default='false'),
+            sa.Column('daycare_size_separation', sa.Boolean(), nullable=False, server_default='false'),
+            sa.Column('daycare_feeding_schedule', sa.Boolean(), nullable=False, server_default='false'),
+            sa.Column('daycare_nap_area', sa.Boolean(), nullable=False, server_default='false'),
+        ]),
+    }
+
+
+def _source(column, row='p'):
+    # Old profile rows may hold NULL in boolean columns the detail tables declare NOT NULL
+    if isinstance(column.type, sa.Boolean):
+        return f"coalesce({row}.{column.name}, false)"
+    return f"{row}.{column.name}"
+
+
+def _comparable(column, row):
+    # json has no equality operator
+    if isinstance(column.type, sa.JSON):
+        return f"{row}.{column.name}::jsonb"
+    return f"{row}.{column.name}"
+
+
+def _sync_from_profiles(table, supported, completed, columns):
+    # Mirrors writes that workers still on the old code make to the legacy columns.
+    # New code never changes them (except through _sync_to_profiles, one trigger level
+    # down), so this doesn't fire on its writes.
+    names = ", ".join(column.name for column in columns)
+    sources = ", ".join(_source(column, 'NEW') for column in columns)
+    assignments = ", ".join(f"{column.name} = excluded.{column.name}" for column in columns)
+    new_values = ", ".join(_comparable(column, 'NEW') for column in columns)
+    old_values = ", ".join(_comparable(column, 'OLD') for column in columns)
+    op.execute(
+        f"""
+        CREATE FUNCTION {table}_from_profile() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            IF NEW.{supported} OR NEW.{completed} THEN
+                INSERT INTO {table} (sitter_id, {names}) VALUES (NEW.id, {sources})
+                ON CONFLICT (sitter_id) DO UPDATE SET {assignments};
+            END IF;
+            RETURN NULL;
+        END
+        $$
+        """
+    )
+    op.execute(
+        f"CREATE TRIGGER {table}_from_profile AFTER UPDATE ON sitter_profiles FOR EACH ROW "
+        f"WHEN (pg_trigger_depth() < 1 AND ROW({new_values}) IS DISTINCT FROM ROW({old_values})) "
+        f"EXECUTE FUNCTION {table}_from_profile()"
+    )
+
+
+def _sync_to_profiles(table, columns):
+    # Keeps the legacy columns current for workers still reading them
+    assignments = ", ".join(f"{column.name} = NEW.{column.name}" for column in columns)
+    op.execute(
+        f"""
+        CREATE FUNCTION {table}_to_profile() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            UPDATE sitter_profiles SET {assignments} WHERE id = NEW.sitter_id;
+            RETURN NULL;
+        END
+        $$
+        """
+    )
+    op.execute(
+        f"CREATE TRIGGER {table}_to_profile AFTER INSERT OR UPDATE ON {table} "
+        f"FOR EACH ROW WHEN (pg_trigger_depth() < 1) EXECUTE FUNCTION {table}_to_profile()"
+    )
+
+
+def upgrade() -> None:
+    # Expand only: the legacy columns stay, kept in step with the detail tables by
+    # triggers, so workers on the previous release keep reading and writing them during
+    # a rolling deploy. A later revision drops the triggers and columns once no such
+    # worker is left.
+    tables = _service_columns()
+    for table, (supported, completed, columns) in tables.items():
+        op.create_table(
+            table,
+            sa.Column('sitter_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('sitter_profiles.id'), primary_key=True),
+            *columns,
+        )
+        for column in columns:
+            if not column.nullable:
+                # New code inserts profiles without the legacy columns
+                op.alter_column('sitter_profiles', column.name, server_default=sa.false())
+        _sync_from_profiles(table, supported, completed, columns)
+
+    # Copy only sitters that offer (or filled in) the service, walking the primary key
+    # in batches that each commit on their own. Rows the trigger wrote meanwhile are
+    # newer than the batch's snapshot, hence DO NOTHING.
+    conn = op.get_bind()
+    with op.get_context().autocommit_block():
+        for table, (supported, completed, columns) in tables.items():
+            names = ", ".join(column.name for column in columns)
+            sources = ", ".join(_source(column) for column in columns)
+            copy = sa.text(
+                f"""
+                WITH batch AS (
+                    SELECT p.id, {sources} FROM sitter_profiles p
+                    WHERE p.id > CAST(:last_id AS uuid) AND (p.{supported} OR p.{completed})
+                    ORDER BY p.id LIMIT :limit
+                ), copied AS (
+                    INSERT INTO {table} (sitter_id, {names}) SELECT * FROM batch
+                    ON CONFLICT (sitter_id) DO NOTHING
+                )
+                SELECT id FROM batch ORDER BY id DESC LIMIT 1
+                """
+            )
+            last_id = '00000000-0000-0000-0000-000000000000'
+            while True:
+                last_id = conn.execute(copy, {"last_id": last_id, "limit": BATCH_SIZE}).scalar()
+                if last_id is None:
+                    break
+
+    # Only new code writes the detail tables, and none runs before this revision commits
+    for table, (_, _, columns) in tables.items():
+        _sync_to_profiles(table, columns)
+
+
+def downgrade() -> None:
+    for table, (_, _, columns) in _service_columns().items():
+        op.execute(f"DROP TRIGGER {table}_to_profile ON {table}")
+        op.execute(f"DROP FUNCTION {table}_to_profile()")
+        op.execute(f"DROP TRIGGER {table}_from_profile ON sitter_profiles")
+        op.execute(f"DROP FUNCTION {table}_from_profile()")
+        assignments = ", ".join(f"{column.name} = d.{column.name}" for column in columns)
+        op.execute(f"UPDATE sitter_profiles p SET {assignments} FROM {table} d WHERE d.sitter_id = p.id")
+        for column in columns:
+            if not column.nullable:
+                op.alter_column('sitter_profiles', column.name, server_default=None)
+        op.drop_table(table)
@@ -0,0 +1,177 @@
+"""move sitter reviews into sitter_reviews with running rating totals
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-17 21:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '011'
+down_revision = '010'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+
+def _legacy_reviews(sitter_id, reviews, created_at):
+    # Entries of the old JSON column (an array, or an object keyed by anything) that carry
+    # a numeric rating; author and timestamp weren't reliably recorded there. The id is
+    # derived from the entry's position, so copying the same entry twice inserts it once.
+    return f"""
+        SELECT md5({sitter_id}::text || '/' || e.position)::uuid, {sitter_id}, NULL::uuid,
+               LEAST(GREATEST(round((e.entry->>'rating')::numeric), 1), 5)::int,
+               e.entry->>'comment', {created_at}
+        FROM (
+            SELECT value, ordinality::text
+            FROM json_array_elements(CASE WHEN json_typeof({reviews}) = 'array' THEN {reviews} ELSE '[]' END)
+                 WITH ORDINALITY
+            UNION ALL
+            SELECT value, key
+            FROM json_each(CASE WHEN json_typeof({reviews}) = 'object' THEN {reviews} ELSE '{{}}' END)
+        ) AS e(entry, position)
+        WHERE json_typeof(e.entry) = 'object' AND json_typeof(e.entry->'rating') = 'number'
+    """
+
+
+# One statement per batch of profiles, so each batch commits whole. FOR UPDATE waits for
+# old workers writing to those profiles and reads their latest reviews, which the
+# trigger below has then already copied under the same ids.
+COPY_REVIEWS = f"""
+    WITH batch AS (
+        SELECT p.id, p.reviews, p.updated_at FROM sitter_profiles p
+        WHERE p.id > CAST(:last_id AS uuid) AND p.reviews IS NOT NULL
+        ORDER BY p.id LIMIT :limit
+        FOR UPDATE
+    ), copied AS (
+        INSERT INTO sitter_reviews (id, sitter_id, author_id, rating, comment, created_at)
+        SELECT r.* FROM batch b, LATERAL ({_legacy_reviews('b.id', 'b.reviews', 'b.updated_at')}) r
+        ON CONFLICT (id) DO NOTHING
+        RETURNING sitter_id, rating
+    ), totals AS (
+        SELECT sitter_id, sum(rating)::float AS rating_sum, count(*) AS review_count
+        FROM copied GROUP BY sitter_id
+    ), updated AS (
+        UPDATE sitter_profiles p
+        SET rating_sum = p.rating_sum + t.rating_sum,
+            review_count = p.review_count + t.review_count,
+            rating = (p.rating_sum + t.rating_sum) / (p.review_count + t.review_count)
+        FROM totals t
+        WHERE p.id = t.sitter_id
+        RETURNING p.id, p.rating
+    ), projected AS (
+        UPDATE sitter_search_index s SET rating = u.rating FROM updated u WHERE s.id = u.id
+    )
+    SELECT id FROM batch ORDER BY id DESC LIMIT 1
+"""
+
+# A rating that no copied review backs (set by hand, or from entries without a numeric
+# rating) is carried over as one review's worth of rating_sum, so the next review
+# averages with it instead of replacing it: a 4.8 sitter reviewed 3 becomes 3.9, not 3.
+SEED_RATINGS = """
+    WITH batch AS (
+        SELECT id FROM sitter_profiles
+        WHERE id > CAST(:last_id AS uuid)
+        ORDER BY id LIMIT :limit
+    ), seeded AS (
+        UPDATE sitter_profiles p SET rating_sum = p.rating, review_count = 1
+        FROM batch b
+        WHERE p.id = b.id AND p.review_count = 0 AND p.rating > 0
+    )
+    SELECT id FROM batch ORDER BY id DESC LIMIT 1
+"""
+
+# Mirrors writes that workers still on the old code make to the JSON column: the
+# sitter's copied reviews are replaced by the column's new entries, totals adjusted.
+# Dropped, with the column, by a later contract revision once no such worker is left.
+SYNC_FUNCTION = f"""
+    CREATE FUNCTION sitter_reviews_from_profile() RETURNS trigger LANGUAGE plpgsql AS $$
+    DECLARE
+        removed_sum float; removed_count int; added_sum float; added_count int;
+    BEGIN
+        WITH removed AS (
+            DELETE FROM sitter_reviews WHERE sitter_id = NEW.id AND author_id IS NULL RETURNING rating
+        )
+        SELECT coalesce(sum(rating), 0), count(*) INTO removed_sum, removed_count FROM removed;
+        WITH copied AS (
+            INSERT INTO sitter_reviews (id, sitter_id, author_id, rating, comment, created_at)
+            {_legacy_reviews('NEW.id', 'NEW.reviews', 'NEW.updated_at')}
+            ON CONFLICT (id) DO NOTHING
+            RETURNING rating
+        )
+        SELECT coalesce(sum(rating), 0), count(*) INTO added_sum, added_count FROM copied;
+        IF removed_count > 0 OR added_count > 0 THEN
+            UPDATE sitter_profiles
+            SET rating_sum = rating_sum - removed_sum + added_sum,
+                review_count = review_count - removed_count + added_count,
+                rating = CASE WHEN review_count - removed_count + added_count > 0
+                              THEN (rating_sum - removed_sum + added_sum) / (review_count - removed_count + added_count)
+                              ELSE rating END
+            WHERE id = NEW.id;
+            UPDATE sitter_search_index s SET rating = p.rating FROM sitter_profiles p WHERE s.id = p.id AND p.id = NEW.id;
+        END IF;
+        RETURN NULL;
+    END
+    $$
+"""
+
+
+def upgrade() -> None:
+    # Expand only: the reviews column stays for workers on the previous release
+    op.create_table(
+        'sitter_reviews',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('sitter_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('sitter_profiles.id'), nullable=False),
+        sa.Column('author_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('user.id'), nullable=True),
+        sa.Column('rating', sa.Integer(), nullable=False),
+        sa.Column('comment', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+    )
+    op.create_index(
+        'ix_sitter_reviews_sitter_id_created_at_id', 'sitter_reviews', ['sitter_id', 'created_at', 'id']
+    )
+    op.add_column('sitter_profiles', sa.Column('rating_sum', sa.Float(), nullable=False, server_default='0'))
+    op.add_column('sitter_profiles', sa.Column('review_count', sa.Integer(), nullable=False, server_default='0'))
+    op.execute(SYNC_FUNCTION)
+    # Not for the totals update the function itself makes
+    op.execute(
+        "CREATE TRIGGER sitter_reviews_from_profile AFTER UPDATE ON sitter_profiles FOR EACH ROW "
+        "WHEN (pg_trigger_depth() < 1 AND NEW.reviews::jsonb IS DISTINCT FROM OLD.reviews::jsonb) "
+        "EXECUTE FUNCTION sitter_reviews_from_profile()"
+    )
+
+    # rank_score picks up the new ratings with `python manage.py backfill-rank-score`
+    # after upgrading
+    conn = op.get_bind()
+    with op.get_context().autocommit_block():
+        for statement in (COPY_REVIEWS, SEED_RATINGS):
+            last_id = '00000000-0000-0000-0000-000000000000'
+            while True:
+                last_id = conn.execute(sa.text(statement), {"last_id": last_id, "limit": BATCH_SIZE}).scalar()
+                if last_id is None:
+                    break
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER sitter_reviews_from_profile ON sitter_profiles")
+    op.execute("DROP FUNCTION sitter_reviews_from_profile()")
+    op.execute(
+        """
+        UPDATE sitter_profiles p SET reviews = r.reviews
+        FROM (
+            SELECT sitter_id, json_agg(json_build_object(
+                'rating', rating, 'comment', comment, 'author_id', author_id, 'created_at', created_at
+            ) ORDER BY created_at) AS reviews
+            FROM sitter_reviews GROUP BY sitter_id
+        ) r
+        WHERE p.id = r.sitter_id
+        """
+    )
+    op.drop_column('sitter_profiles', 'review_count')
+    op.drop_column('sitter_profiles', 'rating_sum')
+    op.drop_index('ix_sitter_reviews_sitter_id_created_at_id', table_name='sitter_reviews')
+    op.drop_table('sitter_reviews')
@@ -0,0 +1,33 @@
+"""make (provider, provider_uid) unique on auth_providers
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-17 23:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '012'
+down_revision = '011'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Racing first logins could link one identity twice; the earliest link is kept
+    op.execute(
+        """
+        DELETE FROM auth_providers a
+        USING auth_providers b
+        WHERE a.provider = b.provider AND a.provider_uid = b.provider_uid
+          AND (a.created_at, a.id) > (b.created_at, b.id)
+        """
+    )
+    op.create_index(
+        'uq_auth_providers_provider_provider_uid', 'auth_providers', ['provider', 'provider_uid'], unique=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_auth_providers_provider_provider_uid', table_name='auth_providers')
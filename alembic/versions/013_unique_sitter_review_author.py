@@ -0,0 +1,67 @@
+"""allow one review per author and sitter
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '013'
+down_revision = '012'
+branch_labels = None
+depends_on = None
+
+# Keep each author's earliest review of a sitter and drop reviews sitters left on their
+# own profile, taking them back out of the running totals. rank_score picks up the
+# corrected ratings with `python manage.py backfill-rank-score` after upgrading.
+REMOVE_REVIEWS = """
+    WITH removed AS (
+        DELETE FROM sitter_reviews r
+        USING sitter_profiles p
+        WHERE p.id = r.sitter_id
+          AND (
+            r.author_id = p.user_id
+            OR EXISTS (
+                SELECT 1 FROM sitter_reviews e
+                WHERE e.sitter_id = r.sitter_id AND e.author_id = r.author_id
+                  AND (e.created_at, e.id) < (r.created_at, r.id)
+            )
+          )
+        RETURNING r.sitter_id, r.rating
+    ), totals AS (
+        SELECT sitter_id, sum(rating)::float AS rating_sum, count(*) AS review_count
+        FROM removed GROUP BY sitter_id
+    ), corrected AS (
+        UPDATE sitter_profiles p
+        SET rating_sum = p.rating_sum - t.rating_sum,
+            review_count = p.review_count - t.review_count,
+            rating = CASE WHEN p.review_count > t.review_count
+                          THEN (p.rating_sum - t.rating_sum) / (p.review_count - t.review_count)
+                          ELSE 0 END
+        FROM totals t
+        WHERE p.id = t.sitter_id
+        RETURNING p.id, p.rating
+    )
+    UPDATE sitter_search_index s SET rating = c.rating FROM corrected c WHERE s.id = c.id
+"""
+
+
+def upgrade() -> None:
+    op.execute(REMOVE_REVIEWS)
+
+    # Built without blocking review writes, then promoted to the constraint
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'uq_sitter_reviews_sitter_id_author_id', 'sitter_reviews', ['sitter_id', 'author_id'],
+            unique=True, postgresql_concurrently=True,
+        )
+    op.execute(
+        "ALTER TABLE sitter_reviews ADD CONSTRAINT uq_sitter_reviews_sitter_id_author_id "
+        "UNIQUE USING INDEX uq_sitter_reviews_sitter_id_author_id"
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_sitter_reviews_sitter_id_author_id', 'sitter_reviews', type_='unique')
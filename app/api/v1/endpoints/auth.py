@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, Request
 from fastapi_sso.sso.google import GoogleSSO
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from app.db.session import get_session
 from app.schemas.auth import GoogleAuthRequest, AuthResponse, EmailLoginRequest, VerifyOtpRequest, MobileLoginRequest, VerifyMobileOtpRequest
 from app.services.auth_service import authenticate_google_user, request_otp, verify_otp_login, request_mobile_otp, verify_mobile_otp_login, logout_user
@@ -21,47 +21,47 @@ async def google_login():
     return await google_sso.get_login_redirect()
 
 @router.get("/callback/google")
-async def google_callback(request: Request, session: Session = Depends(get_session)):
+async def google_callback(request: Request, session: AsyncSession = Depends(get_session)):
     # Re-using the service logic would require extracting the token from user_info first
     # For now, keeping the original callback logic or refactoring it to use service is possible
     # But since the requirement focused on the POST endpoint, let's focus on that.
     pass 
 
 @router.post("/google", response_model=AuthResponse)
-async def google_auth(request: GoogleAuthRequest, session: Session = Depends(get_session)):
-    return authenticate_google_user(session, request.id_token)
+async def google_auth(request: GoogleAuthRequest, session: AsyncSession = Depends(get_session)):
+    return await authenticate_google_user(session, request.id_token)
 
 @router.post("/email/login")
-async def email_login(request: EmailLoginRequest, session: Session = Depends(get_session)):
+async def email_login(request: EmailLoginRequest, session: AsyncSession = Depends(get_session)):
     """
     Step 1: Request OTP for email login/registration
     """
     return await request_otp(session, request.email)
 
 @router.post("/email/verify", response_model=AuthResponse)
-async def verify_otp(request: VerifyOtpRequest, session: Session = Depends(get_session)):
+async def verify_otp(request: VerifyOtpRequest, session: AsyncSession = Depends(get_session)):
     """
     Step 2: Verify OTP and login/register
     """
-    return verify_otp_login(session, request.email, request.otp)
+    return await verify_otp_login(session, request.email, request.otp)
 
 @router.post("/mobile/login")
 async def mobile_login(request: MobileLoginRequest):
     """
     Step 1: Request OTP for mobile login/registration
     """
-    return request_mobile_otp(request.phone_number)
+    return await request_mobile_otp(request.phone_number)
 
 @router.post("/mobile/verify", response_model=AuthResponse)
-async def verify_mobile_otp(request: VerifyMobileOtpRequest, session: Session = Depends(get_session)):
+async def verify_mobile_otp(request: VerifyMobileOtpRequest, session: AsyncSession = Depends(get_session)):
     """
     Step 2: Verify OTP and login/register
     """
-    return verify_mobile_otp_login(session, request.phone_number, request.otp)
+    return await verify_mobile_otp_login(session, request.phone_number, request.otp)
 
 @router.post("/logout")
 async def logout(token: str = Depends(get_current_user_token)):
     """
-    Logout user by blacklisting the token
+    Logout user by revoking the token on every worker until it expires
     """
     return logout_user(token)
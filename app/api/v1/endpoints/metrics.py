@@ -0,0 +1,37 @@
+from fastapi import APIRouter, Depends
+from app.core.security import require_admin, token_cache
+from app.db.session import get_pool_metrics
+from app.schemas.metrics import DatabaseMetrics, GatewayMetrics, MailQueueMetrics, TokenCacheMetrics
+from app.services.email_service import mail_queue
+from app.services.otp_gateway import otp_gateway
+
+# Per-worker internals: admins only
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+@router.get("/db-pool", response_model=DatabaseMetrics)
+async def db_pool_metrics():
+    """
+    Connection pool occupancy and checkout wait times for this worker
+    """
+    return DatabaseMetrics(pools=get_pool_metrics())
+
+@router.get("/token-cache", response_model=TokenCacheMetrics)
+async def token_cache_metrics():
+    """
+    Verified-token cache occupancy and hit rate for this worker
+    """
+    return TokenCacheMetrics(**token_cache.snapshot())
+
+@router.get("/otp-gateway", response_model=GatewayMetrics)
+async def otp_gateway_metrics():
+    """
+    Mobile OTP gateway call latency, failures and circuit state for this worker
+    """
+    return GatewayMetrics(circuit=otp_gateway.breaker.state, operations=otp_gateway.stats.snapshot())
+
+@router.get("/email-queue", response_model=MailQueueMetrics)
+async def email_queue_metrics():
+    """
+    Outbound email queue depth, retries and send latency for this worker
+    """
+    return MailQueueMetrics(**mail_queue.snapshot())
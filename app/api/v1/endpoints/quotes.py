@@ -0,0 +1,17 @@
+from fastapi import APIRouter, Depends
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.db.session import get_read_session
+from app.schemas.quote import QuoteRequest, QuoteResponse
+from app.services import quote_service
+
+router = APIRouter()
+
+@router.post("", response_model=QuoteResponse)
+async def quote_stay(
+    data: QuoteRequest,
+    session: AsyncSession = Depends(get_read_session)
+):
+    """
+    Price one stay for every candidate sitter at once
+    """
+    return await quote_service.quote_stay(session, data)
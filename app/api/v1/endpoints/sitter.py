@@ -1,22 +1,25 @@
-from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Request
-from sqlmodel import Session
-from app.db.session import get_session
-from app.core.security import get_current_user_token
-from app.core.config import settings
-from jose import jwt
+from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Request, Query
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.db.session import get_session, get_read_session
+from app.core.security import get_current_user_id
 from uuid import UUID, uuid4
 from app.schemas.sitter import (
     SitterPersonalInfoUpdate, SitterLocationUpdate, SitterBoardingUpdate,
     SitterWalkingUpdate, SitterExperienceUpdate, SitterHomeUpdate,
     SitterContentUpdate, SitterPricingUpdate, SitterProfileResponse,
     SitterGalleryDelete, SitterHouseSittingUpdate, SitterDropInUpdate, SitterDayCareUpdate,
-    SitterServiceSelectionUpdate
+    SitterServiceSelectionUpdate, SitterSearchResponse, SitterFacetResponse,
+    SitterAvailabilityResponse, SitterTextSearchResponse, SitterListResponse, SitterSortOrder,
+    SitterResponseMode, SitterSectionResponse, SitterProfileBatchUpdate
 )
-from app.services import sitter_service
+from app.schemas.review import SitterReviewCreate, SitterReviewResponse, SitterReviewListResponse
+from app.services import sitter_service, search_service, availability_service, listing_service, review_service
+from app.services.facet_index import FACETS
 from pydantic import BaseModel
 import shutil
 import os
-from typing import List
+from typing import List, Dict, Optional, Union
+from datetime import date
 
 router = APIRouter()
 
@@ -24,16 +27,6 @@ class VerifyPhoneUpdate(BaseModel):
     phone: str
     otp: str
 
-def get_current_user_id(token: str = Depends(get_current_user_token)) -> UUID:
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        user_id = payload.get("sub")
-        if user_id is None:
-            raise HTTPException(status_code=401, detail="Invalid token")
-        return UUID(user_id)
-    except Exception:
-        raise HTTPException(status_code=401, detail="Invalid token")
-
 def get_full_url(request: Request, path: str) -> str:
     if not path:
         return path
@@ -46,16 +39,127 @@ def get_full_url(request: Request, path: str) -> str:
         path = "/" + path
     return f"{base_url}{path}"
 
+def get_facet_filters(request: Request) -> Dict[str, List[str]]:
+    # Facet filters are passed as repeated query params, e.g.
+    # ?fenced_yard=true&size_experience=small&size_experience=medium
+    filters = {}
+    for name in FACETS:
+        values = request.query_params.getlist(name)
+        if values:
+            filters[name] = values
+    return filters
+
+def profile_payload(profile) -> dict:
+    # SitterProfileResponse is flat: profile columns, service details and progress together
+    payload = sitter_service.profile_fields(profile)
+    payload["next_step"] = sitter_service.calculate_next_step(profile)
+    return payload
+
+def profile_update_response(profile, data: BaseModel, mode: SitterResponseMode):
+    payload = profile_payload(profile)
+    if mode == SitterResponseMode.SECTION:
+        written = data.dict(exclude_unset=True)
+        if isinstance(data, SitterProfileBatchUpdate):
+            # Batch updates nest one dict per form
+            written = {name: value for form in written.values() for name, value in form.items()}
+        # Section writes only load the written columns, so skip anything left unloaded
+        return SitterSectionResponse(
+            id=profile.id,
+            onboarding_step=payload["onboarding_step"],
+            next_step=payload["next_step"],
+            section={name: payload[name] for name in written if name in payload},
+        )
+    return payload
+
+def validate_date_range(start_date: Optional[date], end_date: Optional[date]):
+    if end_date and not start_date:
+        raise HTTPException(status_code=400, detail="start_date is required when end_date is given")
+    if start_date and end_date and end_date < start_date:
+        raise HTTPException(status_code=400, detail="end_date must not be before start_date")
+
+@router.get("/search", response_model=SitterSearchResponse)
+async def search_sitters(
+    request: Request,
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    radius: float = Query(10, gt=0, le=100, description="Search radius in km"),
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    time_slot: Optional[str] = None,
+    facets: Dict[str, List[str]] = Depends(get_facet_filters),
+    session: AsyncSession = Depends(get_read_session)
+):
+    validate_date_range(start_date, end_date)
+    response = await search_service.search_nearby(
+        session, lat, lng, radius, limit, facets,
+        start_date=start_date, end_date=end_date, time_slot=time_slot, cursor=cursor
+    )
+    for result in response.items:
+        if result.profile_photo:
+            result.profile_photo = get_full_url(request, result.profile_photo)
+    return response
+
+@router.get("/text-search", response_model=SitterTextSearchResponse)
+async def text_search_sitters(
+    request: Request,
+    q: str = Query(..., min_length=2, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    session: AsyncSession = Depends(get_read_session)
+):
+    response = await search_service.text_search(session, q, limit, cursor)
+    for result in response.items:
+        if result.profile_photo:
+            result.profile_photo = get_full_url(request, result.profile_photo)
+    return response
+
+@router.get("/list", response_model=SitterListResponse)
+async def list_sitters(
+    request: Request,
+    sort: SitterSortOrder = SitterSortOrder.RANK,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    session: AsyncSession = Depends(get_read_session)
+):
+    response = await listing_service.list_sitters(session, sort, cursor, limit)
+    for result in response.items:
+        if result.profile_photo:
+            result.profile_photo = get_full_url(request, result.profile_photo)
+    return response
+
+@router.get("/facets", response_model=SitterFacetResponse)
+async def filter_sitters(
+    limit: int = Query(100, ge=1, le=1000),
+    facets: Dict[str, List[str]] = Depends(get_facet_filters),
+    session: AsyncSession = Depends(get_read_session)
+):
+    return await search_service.facet_search(session, facets, limit)
+
+@router.get("/availability", response_model=SitterAvailabilityResponse)
+async def available_sitters(
+    start_date: date,
+    end_date: Optional[date] = None,
+    time_slot: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    session: AsyncSession = Depends(get_read_session)
+):
+    validate_date_range(start_date, end_date)
+    sitter_ids, next_cursor = await availability_service.find_available_sitters(
+        session, start_date, end_date or start_date, time_slot, limit, cursor
+    )
+    return SitterAvailabilityResponse(sitter_ids=sitter_ids, next_cursor=next_cursor)
+
 @router.get("/me", response_model=SitterProfileResponse)
 async def get_my_profile(
     request: Request,
     user_id: UUID = Depends(get_current_user_id),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_session),
+    read_session: AsyncSession = Depends(get_read_session)
 ):
-    profile = sitter_service.get_profile(session, user_id)
-    
-    # Calculate next step
-    profile.next_step = sitter_service.calculate_next_step(profile)
+    profile = await sitter_service.get_profile(session, user_id, read_session)
     
     if profile.profile_photo:
          profile.profile_photo = get_full_url(request, profile.profile_photo)
@@ -66,34 +170,33 @@ async def get_my_profile(
     if profile.photo_gallery:
         profile.photo_gallery = [get_full_url(request, p) for p in profile.photo_gallery]
         
-    return profile
+    return profile_payload(profile)
 
-@router.patch("/personal-info", response_model=SitterProfileResponse)
+@router.patch("/personal-info", response_model=Union[SitterProfileResponse, SitterSectionResponse])
 async def update_personal_info(
     data: SitterPersonalInfoUpdate,
+    response: SitterResponseMode = SitterResponseMode.FULL,
     user_id: UUID = Depends(get_current_user_id),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_session)
 ):
-    profile = await sitter_service.update_personal_info(session, user_id, data)
-    profile.next_step = sitter_service.calculate_next_step(profile)
-    return profile
+    profile = await sitter_service.update_personal_info(session, user_id, data, response == SitterResponseMode.SECTION)
+    return profile_update_response(profile, data, response)
 
 @router.post("/verify-phone-update", response_model=SitterProfileResponse)
 async def verify_phone_update(
     data: VerifyPhoneUpdate,
     user_id: UUID = Depends(get_current_user_id),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_session)
 ):
     profile = await sitter_service.verify_profile_phone_update(session, user_id, data.phone, data.otp)
-    profile.next_step = sitter_service.calculate_next_step(profile)
-    return profile
+    return profile_payload(profile)
 
 @router.post("/upload-profile-photo", response_model=SitterProfileResponse)
 async def upload_profile_photo(
     request: Request,
     file: UploadFile = File(...),
     user_id: UUID = Depends(get_current_user_id),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_session)
 ):
     # Ensure upload directory exists
     upload_dir = "uploads/profile_photos"
@@ -119,21 +222,20 @@ async def upload_profile_photo(
         shutil.copyfileobj(file.file, buffer)
         
     # Update profile with file path
-    profile = sitter_service.update_profile_photo(session, user_id, file_path)
-    profile.next_step = sitter_service.calculate_next_step(profile)
+    profile = await sitter_service.update_profile_photo(session, user_id, file_path)
     
     # Return full URL in response
     if profile.profile_photo:
          profile.profile_photo = get_full_url(request, profile.profile_photo)
          
-    return profile
+    return profile_payload(profile)
 
 @router.post("/upload-government-id", response_model=SitterProfileResponse)
 async def upload_government_id(
     request: Request,
     file: UploadFile = File(...),
     user_id: UUID = Depends(get_current_user_id),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_session)
 ):
     # Ensure upload directory exists
     upload_dir = "uploads/government_ids"
@@ -159,21 +261,20 @@ async def upload_government_id(
         shutil.copyfileobj(file.file, buffer)
         
     # Update profile with file path
-    profile = sitter_service.update_government_id_image(session, user_id, file_path)
-    profile.next_step = sitter_service.calculate_next_step(profile)
+    profile = await sitter_service.update_government_id_image(session, user_id, file_path)
     
     # Return full URL in response
     if profile.government_id_image:
          profile.government_id_image = get_full_url(request, profile.government_id_image)
          
-    return profile
+    return profile_payload(profile)
 
 @router.post("/upload-id-document", response_model=SitterProfileResponse)
 async def upload_id_document(
     request: Request,
     file: UploadFile = File(...),
     user_id: UUID = Depends(get_current_user_id),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_session)
 ):
     # Alias for upload-government-id to match the curl request
     return await upload_government_id(request, file, user_id, session)
@@ -183,7 +284,7 @@ async def upload_gallery_photos(
     request: Request,
     files: List[UploadFile] = File(...),
     user_id: UUID = Depends(get_current_user_id),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_session)
 ):
     # Ensure upload directory exists
     upload_dir = "uploads/gallery_photos"
@@ -208,8 +309,7 @@ async def upload_gallery_photos(
         
     # Update profile with file paths
     try:
-        profile = sitter_service.add_gallery_photos(session, user_id, saved_paths)
-        profile.next_step = sitter_service.calculate_next_step(profile)
+        profile = await sitter_service.add_gallery_photos(session, user_id, saved_paths)
     except HTTPException as e:
         # If error (e.g. too many photos), clean up uploaded files
         for path in saved_paths:
@@ -221,130 +321,158 @@ async def upload_gallery_photos(
     if profile.photo_gallery:
         profile.photo_gallery = [get_full_url(request, p) for p in profile.photo_gallery]
         
-    return profile
+    return profile_payload(profile)
 
 @router.post("/delete-gallery-photos", response_model=SitterProfileResponse)
 async def delete_gallery_photos(
     request: Request,
     data: SitterGalleryDelete,
     user_id: UUID = Depends(get_current_user_id),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_session)
 ):
-    profile = sitter_service.delete_gallery_photos(session, user_id, data)
-    profile.next_step = sitter_service.calculate_next_step(profile)
+    profile = await sitter_service.delete_gallery_photos(session, user_id, data)
     
     # Return full URLs
     if profile.photo_gallery:
         profile.photo_gallery = [get_full_url(request, p) for p in profile.photo_gallery]
 
-    return profile
+    return profile_payload(profile)
 
-@router.patch("/location", response_model=SitterProfileResponse)
+@router.patch("/location", response_model=Union[SitterProfileResponse, SitterSectionResponse])
 async def update_location(
     data: SitterLocationUpdate,
+    response: SitterResponseMode = SitterResponseMode.FULL,
     user_id: UUID = Depends(get_current_user_id),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_session)
 ):
-    profile = sitter_service.update_location(session, user_id, data)
-    profile.next_step = sitter_service.calculate_next_step(profile)
-    return profile
+    profile = await sitter_service.update_location(session, user_id, data, response == SitterResponseMode.SECTION)
+    return profile_update_response(profile, data, response)
 
-@router.patch("/services/selection", response_model=SitterProfileResponse)
+@router.patch("/services/selection", response_model=Union[SitterProfileResponse, SitterSectionResponse])
 async def update_service_selection(
     data: SitterServiceSelectionUpdate,
+    response: SitterResponseMode = SitterResponseMode.FULL,
     user_id: UUID = Depends(get_current_user_id),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_session)
 ):
-    profile = sitter_service.update_service_selection(session, user_id, data)
-    profile.next_step = sitter_service.calculate_next_step(profile)
-    return profile
+    profile = await sitter_service.update_service_selection(session, user_id, data, response == SitterResponseMode.SECTION)
+    return profile_update_response(profile, data, response)
 
-@router.patch("/services/boarding", response_model=SitterProfileResponse)
+@router.patch("/services/boarding", response_model=Union[SitterProfileResponse, SitterSectionResponse])
 async def update_boarding(
     data: SitterBoardingUpdate,
+    response: SitterResponseMode = SitterResponseMode.FULL,
     user_id: UUID = Depends(get_current_user_id),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_session)
 ):
-    profile = sitter_service.update_boarding_service(session, user_id, data)
-    profile.next_step = sitter_service.calculate_next_step(profile)
-    return profile
+    profile = await sitter_service.update_boarding_service(session, user_id, data, response == SitterResponseMode.SECTION)
+    return profile_update_response(profile, data, response)
 
-@router.patch("/services/walking", response_model=SitterProfileResponse)
+@router.patch("/services/walking", response_model=Union[SitterProfileResponse, SitterSectionResponse])
 async def update_walking(
     data: SitterWalkingUpdate,
+    response: SitterResponseMode = SitterResponseMode.FULL,
     user_id: UUID = Depends(get_current_user_id),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_session)
 ):
-    profile = sitter_service.update_walking_service(session, user_id, data)
-    profile.next_step = sitter_service.calculate_next_step(profile)
-    return profile
+    profile = await sitter_service.update_walking_service(session, user_id, data, response == SitterResponseMode.SECTION)
+    return profile_update_response(profile, data, response)
 
-@router.patch("/services/house-sitting", response_model=SitterProfileResponse)
+@router.patch("/services/house-sitting", response_model=Union[SitterProfileResponse, SitterSectionResponse])
 async def update_house_sitting(
     data: SitterHouseSittingUpdate,
+    response: SitterResponseMode = SitterResponseMode.FULL,
     user_id: UUID = Depends(get_current_user_id),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_session)
 ):
-    profile = sitter_service.update_house_sitting_service(session, user_id, data)
-    profile.next_step = sitter_service.calculate_next_step(profile)
-    return profile
+    profile = await sitter_service.update_house_sitting_service(session, user_id, data, response == SitterResponseMode.SECTION)
+    return profile_update_response(profile, data, response)
 
-@router.patch("/services/drop-in", response_model=SitterProfileResponse)
+@router.patch("/services/drop-in", response_model=Union[SitterProfileResponse, SitterSectionResponse])
 async def update_drop_in(
     data: SitterDropInUpdate,
+    response: SitterResponseMode = SitterResponseMode.FULL,
     user_id: UUID = Depends(get_current_user_id),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_session)
 ):
-    profile = sitter_service.update_drop_in_service(session, user_id, data)
-    profile.next_step = sitter_service.calculate_next_step(profile)
-    return profile
+    profile = await sitter_service.update_drop_in_service(session, user_id, data, response == SitterResponseMode.SECTION)
+    return profile_update_response(profile, data, response)
 
-@router.patch("/services/daycare", response_model=SitterProfileResponse)
+@router.patch("/services/daycare", response_model=Union[SitterProfileResponse, SitterSectionResponse])
 async def update_daycare(
     data: SitterDayCareUpdate,
+    response: SitterResponseMode = SitterResponseMode.FULL,
     user_id: UUID = Depends(get_current_user_id),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_session)
 ):
-    profile = sitter_service.update_daycare_service(session, user_id, data)
-    profile.next_step = sitter_service.calculate_next_step(profile)
-    return profile
+    profile = await sitter_service.update_daycare_service(session, user_id, data, response == SitterResponseMode.SECTION)
+    return profile_update_response(profile, data, response)
 
-@router.patch("/experience", response_model=SitterProfileResponse)
+@router.patch("/experience", response_model=Union[SitterProfileResponse, SitterSectionResponse])
 async def update_experience(
     data: SitterExperienceUpdate,
+    response: SitterResponseMode = SitterResponseMode.FULL,
     user_id: UUID = Depends(get_current_user_id),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_session)
 ):
-    profile = sitter_service.update_experience(session, user_id, data)
-    profile.next_step = sitter_service.calculate_next_step(profile)
-    return profile
+    profile = await sitter_service.update_experience(session, user_id, data, response == SitterResponseMode.SECTION)
+    return profile_update_response(profile, data, response)
 
-@router.patch("/home", response_model=SitterProfileResponse)
+@router.patch("/home", response_model=Union[SitterProfileResponse, SitterSectionResponse])
 async def update_home(
     data: SitterHomeUpdate,
+    response: SitterResponseMode = SitterResponseMode.FULL,
     user_id: UUID = Depends(get_current_user_id),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_session)
 ):
-    profile = sitter_service.update_home(session, user_id, data)
-    profile.next_step = sitter_service.calculate_next_step(profile)
-    return profile
+    profile = await sitter_service.update_home(session, user_id, data, response == SitterResponseMode.SECTION)
+    return profile_update_response(profile, data, response)
 
-@router.patch("/content", response_model=SitterProfileResponse)
+@router.patch("/content", response_model=Union[SitterProfileResponse, SitterSectionResponse])
 async def update_content(
     data: SitterContentUpdate,
+    response: SitterResponseMode = SitterResponseMode.FULL,
     user_id: UUID = Depends(get_current_user_id),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_session)
 ):
-    profile = sitter_service.update_content(session, user_id, data)
-    profile.next_step = sitter_service.calculate_next_step(profile)
-    return profile
+    profile = await sitter_service.update_content(session, user_id, data, response == SitterResponseMode.SECTION)
+    return profile_update_response(profile, data, response)
 
-@router.patch("/pricing", response_model=SitterProfileResponse)
+@router.patch("/pricing", response_model=Union[SitterProfileResponse, SitterSectionResponse])
 async def update_pricing(
     data: SitterPricingUpdate,
+    response: SitterResponseMode = SitterResponseMode.FULL,
+    user_id: UUID = Depends(get_current_user_id),
+    session: AsyncSession = Depends(get_session)
+):
+    profile = await sitter_service.update_pricing(session, user_id, data, response == SitterResponseMode.SECTION)
+    return profile_update_response(profile, data, response)
+
+@router.patch("/profile", response_model=Union[SitterProfileResponse, SitterSectionResponse])
+async def update_profile(
+    data: SitterProfileBatchUpdate,
+    response: SitterResponseMode = SitterResponseMode.FULL,
     user_id: UUID = Depends(get_current_user_id),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_session)
+):
+    # Any subset of the onboarding forms in one request and one transaction
+    profile = await sitter_service.update_profile_sections(session, user_id, data, response == SitterResponseMode.SECTION)
+    return profile_update_response(profile, data, response)
+
+@router.post("/{sitter_id}/reviews", response_model=SitterReviewResponse)
+async def add_review(
+    sitter_id: UUID,
+    data: SitterReviewCreate,
+    user_id: UUID = Depends(get_current_user_id),
+    session: AsyncSession = Depends(get_session)
+):
+    return await review_service.add_review(session, sitter_id, user_id, data)
+
+@router.get("/{sitter_id}/reviews", response_model=SitterReviewListResponse)
+async def list_reviews(
+    sitter_id: UUID,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    session: AsyncSession = Depends(get_read_session)
 ):
-    profile = sitter_service.update_pricing(session, user_id, data)
-    profile.next_step = sitter_service.calculate_next_step(profile)
-    return profile
+    return await review_service.list_reviews(session, sitter_id, limit, cursor)
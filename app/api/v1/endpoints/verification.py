@@ -1,9 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 from app.services import verification_service
-from app.core.security import get_current_user_token
-from app.core.config import settings
-from jose import jwt
+from app.core.security import get_current_user_id
 from uuid import UUID
 from typing import Optional
 
@@ -39,16 +37,6 @@ class PostalCodeInquiryResponse(BaseModel):
     raw_data: dict = {}
     message: str = ""
 
-def get_current_user_id(token: str = Depends(get_current_user_token)) -> UUID:
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        user_id = payload.get("sub")
-        if user_id is None:
-            raise HTTPException(status_code=401, detail="Invalid token")
-        return UUID(user_id)
-    except Exception:
-        raise HTTPException(status_code=401, detail="Invalid token")
-
 @router.post("/shahkar", response_model=ShahkarVerificationResponse)
 async def verify_shahkar_identity(
     request: ShahkarVerificationRequest,
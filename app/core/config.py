@@ -1,16 +1,80 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 
 load_dotenv()
 
+def to_async_url(url: str) -> str:
+    # postgresql://... or postgresql+psycopg2://... -> postgresql+asyncpg://...
+    if not url:
+        return url
+    scheme, sep, rest = url.partition("://")
+    return f"{scheme.split('+')[0]}+asyncpg{sep}{rest}"
+
 class Settings:
     PROJECT_NAME: str = "WagyBackend"
     GOOGLE_CLIENT_ID: str = os.getenv("GOOGLE_CLIENT_ID")
     GOOGLE_CLIENT_SECRET: str = os.getenv("GOOGLE_CLIENT_SECRET")
+    # ID tokens from Google sign-in are checked against these keys, cached per Cache-Control
+    GOOGLE_JWKS_URL: str = os.getenv("GOOGLE_JWKS_URL", "https://www.googleapis.com/oauth2/v3/certs")
+    # The next copy of the keys is fetched this long before the cached one goes stale
+    GOOGLE_JWKS_REFRESH_MARGIN_SECONDS: float = float(os.getenv("GOOGLE_JWKS_REFRESH_MARGIN_SECONDS", 300))
     SECRET_KEY: str = os.getenv("SECRET_KEY") or "super-secret-key"
     DATABASE_URL: str = os.getenv("DATABASE_URL")
+    ASYNC_DATABASE_URL: str = os.getenv("ASYNC_DATABASE_URL") or to_async_url(os.getenv("DATABASE_URL"))
+    # Comma-separated read replica URLs; read-only endpoints are spread across them
+    DATABASE_READ_REPLICA_URLS: list = [url.strip() for url in os.getenv("DATABASE_READ_REPLICA_URLS", "").split(",") if url.strip()]
+    # After a user writes, their reads go to the primary for this long so they never see replica lag
+    READ_YOUR_WRITES_SECONDS: float = float(os.getenv("READ_YOUR_WRITES_SECONDS", 5))
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # Verified access tokens kept per worker; an entry never outlives the token's exp
+    TOKEN_CACHE_SIZE: int = int(os.getenv("TOKEN_CACHE_SIZE", 10000))
+    TOKEN_CACHE_TTL_SECONDS: float = float(os.getenv("TOKEN_CACHE_TTL_SECONDS", 300))
+
+    # State shared by every worker: redis://host:6379/0 across hosts, or a SQLite
+    # file when all workers run on one host
+    SHARED_STORE_URL: str = os.getenv("SHARED_STORE_URL") or "sqlite:///" + os.path.join(tempfile.gettempdir(), "wagy_shared.db")
+    # Revoked tokens: each worker syncs its Bloom filter from the shared store this often
+    REVOCATION_SYNC_SECONDS: float = float(os.getenv("REVOCATION_SYNC_SECONDS", 1))
+    REVOCATION_REBUILD_SECONDS: float = float(os.getenv("REVOCATION_REBUILD_SECONDS", 600))
+    REVOCATION_BLOOM_CAPACITY: int = int(os.getenv("REVOCATION_BLOOM_CAPACITY", 100000))
+    REVOCATION_BLOOM_ERROR_RATE: float = float(os.getenv("REVOCATION_BLOOM_ERROR_RATE", 0.001))
+    # Email OTPs: lifetime, wrong guesses allowed per code, and the cap on codes a
+    # memory:// store holds before dropping those closest to expiry
+    OTP_TTL_SECONDS: int = int(os.getenv("OTP_TTL_SECONDS", 300))
+    OTP_MAX_ATTEMPTS: int = int(os.getenv("OTP_MAX_ATTEMPTS", 5))
+    OTP_MEMORY_MAX_ENTRIES: int = int(os.getenv("OTP_MEMORY_MAX_ENTRIES", 100000))
+
+    # Database connection pool
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", 5))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", 10))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", 30))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", 1800))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
     ALGORITHM: str = "HS256"
+
+    # Search
+    FACET_INDEX_REFRESH_SECONDS: int = int(os.getenv("FACET_INDEX_REFRESH_SECONDS", 30))
+    # Nearby search sends up to this many facet matches to SQL as an id list; larger
+    # match sets filter fetched pages, reading at most SEARCH_MAX_FACET_PAGES per request
+    SEARCH_FACET_ID_LIMIT: int = int(os.getenv("SEARCH_FACET_ID_LIMIT", 2000))
+    SEARCH_MAX_FACET_PAGES: int = int(os.getenv("SEARCH_MAX_FACET_PAGES", 5))
+    # "simple" avoids English-only stemming; profile content is multilingual
+    FULL_TEXT_SEARCH_CONFIG: str = os.getenv("FULL_TEXT_SEARCH_CONFIG", "simple")
+
+    # Mobile OTP gateway
+    MOBILE_OTP_URL: str = os.getenv("MOBILE_OTP_URL", "https://api-staging.hyperlikes.ir/public/core/apiv1/custom_codes")
+    OTP_GATEWAY_TIMEOUT_SECONDS: float = float(os.getenv("OTP_GATEWAY_TIMEOUT_SECONDS", 5))
+    OTP_GATEWAY_CONNECT_TIMEOUT_SECONDS: float = float(os.getenv("OTP_GATEWAY_CONNECT_TIMEOUT_SECONDS", 2))
+    # Retries of attempts that never reached the gateway or got a 502/503/504
+    OTP_GATEWAY_RETRIES: int = int(os.getenv("OTP_GATEWAY_RETRIES", 2))
+    OTP_GATEWAY_BACKOFF_SECONDS: float = float(os.getenv("OTP_GATEWAY_BACKOFF_SECONDS", 0.2))
+    # Consecutive failed calls that open the circuit, and how long it stays open
+    OTP_GATEWAY_BREAKER_THRESHOLD: int = int(os.getenv("OTP_GATEWAY_BREAKER_THRESHOLD", 5))
+    OTP_GATEWAY_BREAKER_RESET_SECONDS: float = float(os.getenv("OTP_GATEWAY_BREAKER_RESET_SECONDS", 30))
+
+    # Pricing
+    LONG_STAY_NIGHTS: int = int(os.getenv("LONG_STAY_NIGHTS", 7))
     
     # Email Config
     MAIL_USERNAME: str = os.getenv("MAIL_USERNAME")
@@ -18,7 +82,16 @@ class Settings:
     MAIL_FROM: str = os.getenv("MAIL_FROM")
     MAIL_PORT: int = int(os.getenv("MAIL_PORT", 465))
     MAIL_SERVER: str = os.getenv("MAIL_SERVER")
-    MAIL_STARTTLS: bool = False
-    MAIL_SSL_TLS: bool = True
+    MAIL_STARTTLS: bool = os.getenv("MAIL_STARTTLS", "false").lower() in ("1", "true", "yes")
+    MAIL_SSL_TLS: bool = os.getenv("MAIL_SSL_TLS", "true").lower() in ("1", "true", "yes")
+    MAIL_TIMEOUT_SECONDS: float = float(os.getenv("MAIL_TIMEOUT_SECONDS", 10))
+    # Outbound queue: emails waiting per worker before requests get a 503, sent per
+    # batch over one connection, and retries of a failed send (backoff doubles each time)
+    MAIL_QUEUE_SIZE: int = int(os.getenv("MAIL_QUEUE_SIZE", 1000))
+    MAIL_BATCH_SIZE: int = int(os.getenv("MAIL_BATCH_SIZE", 50))
+    MAIL_MAX_RETRIES: int = int(os.getenv("MAIL_MAX_RETRIES", 3))
+    MAIL_RETRY_BACKOFF_SECONDS: float = float(os.getenv("MAIL_RETRY_BACKOFF_SECONDS", 2))
+    # The SMTP connection is closed after this long without mail
+    MAIL_IDLE_SECONDS: float = float(os.getenv("MAIL_IDLE_SECONDS", 30))
 
 settings = Settings()
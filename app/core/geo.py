@@ -0,0 +1,111 @@
+import math
+from typing import List, Optional, Tuple
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Precision stored on sitter_profiles.geohash (~4.8m x 4.8m cells).
+GEOHASH_PRECISION = 9
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def encode_geohash(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION) -> str:
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+    while len(chars) < precision:
+        if even:
+            mid = (lng_range[0] + lng_range[1]) / 2
+            if longitude >= mid:
+                bits = (bits << 1) | 1
+                lng_range[0] = mid
+            else:
+                bits <<= 1
+                lng_range[1] = mid
+        else:
+            mid = (lat_range[0] + lat_range[1]) / 2
+            if latitude >= mid:
+                bits = (bits << 1) | 1
+                lat_range[0] = mid
+            else:
+                bits <<= 1
+                lat_range[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_BASE32[bits])
+            bits = 0
+            bit_count = 0
+    return "".join(chars)
+
+
+def cell_size_degrees(precision: int) -> Tuple[float, float]:
+    """Return (lat_degrees, lng_degrees) covered by one cell at ``precision``."""
+    total_bits = precision * 5
+    lng_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+    return 180.0 / (2 ** lat_bits), 360.0 / (2 ** lng_bits)
+
+
+def covering_precision(latitude: float, radius_km: float) -> int:
+    # Pick the finest precision whose cells are still at least radius_km wide,
+    # so the centre cell plus its 8 neighbours always cover the search circle.
+    km_per_lng_degree = 111.32 * max(math.cos(math.radians(latitude)), 0.01)
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        lat_deg, lng_deg = cell_size_degrees(precision)
+        if lat_deg * 110.574 >= radius_km and lng_deg * km_per_lng_degree >= radius_km:
+            return precision
+    return 1
+
+
+def covering_cells(latitude: float, longitude: float, radius_km: float) -> List[str]:
+    precision = covering_precision(latitude, radius_km)
+    lat_deg, lng_deg = cell_size_degrees(precision)
+    cells = []
+    for d_lat in (-1, 0, 1):
+        lat = latitude + d_lat * lat_deg
+        if lat > 90.0 or lat < -90.0:
+            continue
+        for d_lng in (-1, 0, 1):
+            lng = longitude + d_lng * lng_deg
+            lng = (lng + 180.0) % 360.0 - 180.0
+            cell = encode_geohash(lat, lng, precision)
+            if cell not in cells:
+                cells.append(cell)
+    return cells
+
+
+def prefix_upper_bound(prefix: str) -> str:
+    """Smallest string greater than every geohash starting with ``prefix``."""
+    # "~" sorts after every base32 character under the C collation.
+    return prefix + "~"
+
+
+def bounding_box(latitude: float, longitude: float, radius_km: float) -> Tuple[float, float, Optional[float], Optional[float]]:
+    """(min_lat, max_lat, min_lng, max_lng) enclosing the circle of ``radius_km``.
+
+    The longitude bounds are None when the box would cross the antimeridian or a pole.
+    """
+    lat_delta = radius_km / 110.574
+    min_lat, max_lat = latitude - lat_delta, latitude + lat_delta
+    km_per_lng_degree = 111.32 * math.cos(math.radians(latitude))
+    if min_lat <= -90.0 or max_lat >= 90.0 or km_per_lng_degree <= 0:
+        return max(min_lat, -90.0), min(max_lat, 90.0), None, None
+    # Widest at the box edge nearest the pole
+    km_per_lng_degree = 111.32 * math.cos(math.radians(max(abs(min_lat), abs(max_lat))))
+    lng_delta = radius_km / km_per_lng_degree
+    if longitude - lng_delta < -180.0 or longitude + lng_delta > 180.0:
+        return min_lat, max_lat, None, None
+    return min_lat, max_lat, longitude - lng_delta, longitude + lng_delta
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    d_phi = math.radians(lat2 - lat1)
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
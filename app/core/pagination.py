@@ -0,0 +1,76 @@
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, List, Optional, Sequence, Tuple
+from uuid import UUID
+from fastapi import HTTPException
+from sqlalchemy import tuple_
+
+# Keyset ("seek") pagination: a page is fetched with WHERE (sort_key, id) < (last_sort_key, last_id)
+# instead of OFFSET, so page N costs the same as page 1 on an index over (sort_key, id).
+# Cursors are opaque to clients: base64url JSON of the sort name plus the last row's key.
+
+
+def _encode_value(value: Any):
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    if isinstance(value, UUID):
+        return {"u": str(value)}
+    return value
+
+
+def _decode_value(value: Any):
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+        if "u" in value:
+            return UUID(value["u"])
+    return value
+
+
+def encode_cursor(sort: str, key: Sequence[Any]) -> str:
+    payload = json.dumps({"s": sort, "k": [_encode_value(v) for v in key]}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], sort: str) -> Optional[List[Any]]:
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if payload["s"] != sort:
+            raise ValueError("cursor belongs to a different sort order")
+        return [_decode_value(v) for v in payload["k"]]
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+async def paginate_query(session, statement, sort: str, key_columns: Sequence, descending: bool, cursor: Optional[str], limit: int) -> Tuple[list, Optional[str]]:
+    """Apply keyset pagination to ``statement`` ordered by ``key_columns``.
+
+    The last key column must be unique (normally the primary key) so the order is total.
+    Returns the page rows and the cursor for the next page (None on the last page).
+    """
+    key = decode_cursor(cursor, sort)
+    if key is not None:
+        if len(key) != len(key_columns):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        row_key = tuple_(*key_columns)
+        statement = statement.where(row_key < tuple_(*key) if descending else row_key > tuple_(*key))
+
+    order = [c.desc() if descending else c.asc() for c in key_columns]
+    # execute() rather than exec(): single-column selects must still come back as rows
+    rows = (await session.execute(statement.order_by(*order).limit(limit + 1))).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]._mapping
+        next_cursor = encode_cursor(sort, [last[c.key] for c in key_columns])
+    return rows, next_cursor
+
@@ -0,0 +1,223 @@
+import math
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from app.core.config import settings
+from app.core.shared_store import connect_redis, connect_sqlite, store_kind
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over token digests; no false negatives, tunable false positives."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = max(capacity, 1)
+        self.size = max(int(-self.capacity * math.log(error_rate) / math.log(2) ** 2), 8)
+        self.hashes = max(round(self.size / self.capacity * math.log(2)), 1)
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: bytes):
+        # Keys are already SHA-256 digests, so two slices of them give the double hashing
+        h1 = int.from_bytes(key[:8], "big")
+        h2 = int.from_bytes(key[8:16], "big") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, key: bytes):
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: bytes) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class MemoryRevocationBackend:
+    """Revocations held by this process only; for tests and single-worker development."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tokens: Dict[bytes, float] = {}
+        self._log: List[bytes] = []
+
+    def add(self, key: bytes, expires_at: float):
+        with self._lock:
+            if key not in self._tokens:
+                self._tokens[key] = expires_at
+                self._log.append(key)
+
+    def contains(self, key: bytes, now: float) -> bool:
+        return self._tokens.get(key, 0) > now
+
+    def changes(self, cursor: Optional[int]) -> Tuple[List[bytes], Optional[int]]:
+        with self._lock:
+            return self._log[cursor or 0:], len(self._log)
+
+    def live(self, now: float) -> Tuple[List[bytes], Optional[int]]:
+        with self._lock:
+            self._tokens = {key: expires_at for key, expires_at in self._tokens.items() if expires_at > now}
+            self._log = list(self._tokens)
+            return list(self._log), len(self._log)
+
+
+class SQLiteRevocationBackend:
+    """Revoked token digests in a SQLite file shared by every worker on the host.
+
+    The autoincrement row id is the change cursor workers sync their Bloom filters from.
+    """
+
+    def __init__(self, url: str):
+        self.url = url
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = connect_sqlite(self.url)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS revoked_tokens ("
+                "seq INTEGER PRIMARY KEY AUTOINCREMENT, token_key BLOB NOT NULL UNIQUE, expires_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_revoked_tokens_expires_at ON revoked_tokens (expires_at)")
+            self._conn = conn
+        return self._conn
+
+    def add(self, key: bytes, expires_at: float):
+        with self._lock:
+            self._connection().execute(
+                "INSERT INTO revoked_tokens (token_key, expires_at) VALUES (?, ?) ON CONFLICT (token_key) DO NOTHING",
+                (key, expires_at),
+            )
+
+    def contains(self, key: bytes, now: float) -> bool:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT 1 FROM revoked_tokens WHERE token_key = ? AND expires_at > ?", (key, now)
+            ).fetchone()
+        return row is not None
+
+    def changes(self, cursor: Optional[int]) -> Tuple[List[bytes], Optional[int]]:
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT seq, token_key FROM revoked_tokens WHERE seq > ? ORDER BY seq", (cursor or 0,)
+            ).fetchall()
+        return [row[1] for row in rows], rows[-1][0] if rows else cursor
+
+    def live(self, now: float) -> Tuple[List[bytes], Optional[int]]:
+        # Also the only place expired entries are purged
+        with self._lock:
+            conn = self._connection()
+            conn.execute("DELETE FROM revoked_tokens WHERE expires_at <= ?", (now,))
+            rows = conn.execute("SELECT seq, token_key FROM revoked_tokens ORDER BY seq").fetchall()
+        return [row[1] for row in rows], rows[-1][0] if rows else None
+
+
+class RedisRevocationBackend:
+    """Revoked token digests in Redis, for workers spread over several hosts.
+
+    A sorted set scored by expiry holds the live revocations; a capped stream logs each
+    revocation so workers can sync their Bloom filters incrementally.
+    """
+
+    def __init__(self, url: str, prefix: str = "wagy:revoked", log_length: int = 100000):
+        self._redis = connect_redis(url)
+        self._tokens = f"{prefix}:tokens"
+        self._log = f"{prefix}:log"
+        self._log_length = log_length
+
+    def add(self, key: bytes, expires_at: float):
+        pipe = self._redis.pipeline()
+        pipe.zadd(self._tokens, {key: expires_at})
+        pipe.xadd(self._log, {"key": key}, maxlen=self._log_length, approximate=True)
+        pipe.execute()
+
+    def contains(self, key: bytes, now: float) -> bool:
+        expires_at = self._redis.zscore(self._tokens, key)
+        return expires_at is not None and expires_at > now
+
+    def changes(self, cursor: Optional[bytes]) -> Tuple[List[bytes], Optional[bytes]]:
+        entries = self._redis.xrange(self._log, min=b"(" + cursor if cursor else "-")
+        return [fields[b"key"] for _, fields in entries], entries[-1][0] if entries else cursor
+
+    def live(self, now: float) -> Tuple[List[bytes], Optional[bytes]]:
+        # Read the cursor first: a revocation landing in between is seen twice, never missed
+        latest = self._redis.xrevrange(self._log, count=1)
+        self._redis.zremrangebyscore(self._tokens, "-inf", now)
+        return self._redis.zrange(self._tokens, 0, -1), latest[0][0] if latest else None
+
+
+def backend_from_url(url: str):
+    kind = store_kind(url)
+    if kind == "redis":
+        return RedisRevocationBackend(url)
+    if kind == "sqlite":
+        return SQLiteRevocationBackend(url)
+    return MemoryRevocationBackend()
+
+
+class TokenRevocationStore:
+    """Revoked access tokens, checked on every authenticated request.
+
+    The shared backend is the source of truth. Each worker mirrors it in a local Bloom
+    filter, synced at most every ``sync_seconds``, so a token that was never revoked is
+    cleared without leaving the process; only filter hits ask the backend. Entries
+    expire with their token, and the filter is rebuilt from the live set every
+    ``rebuild_seconds`` (or once it fills) to drop them.
+    """
+
+    def __init__(self, backend, capacity: int, error_rate: float, sync_seconds: float, rebuild_seconds: float):
+        self.backend = backend
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_seconds = sync_seconds
+        self.rebuild_seconds = rebuild_seconds
+        self._lock = threading.Lock()
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._cursor = None
+        self._synced_at = 0.0
+        self._rebuilt_at = 0.0
+
+    def _rebuild(self, now: float):
+        keys, cursor = self.backend.live(now)
+        bloom = BloomFilter(max(self.capacity, len(keys) * 2), self.error_rate)
+        for key in keys:
+            bloom.add(key)
+        self._bloom, self._cursor, self._rebuilt_at = bloom, cursor, now
+
+    def _sync(self, now: float):
+        if now - self._synced_at < self.sync_seconds:
+            return
+        with self._lock:
+            if now - self._synced_at < self.sync_seconds:
+                return
+            if now - self._rebuilt_at >= self.rebuild_seconds or self._bloom.count >= self._bloom.capacity:
+                self._rebuild(now)
+            else:
+                keys, self._cursor = self.backend.changes(self._cursor)
+                for key in keys:
+                    self._bloom.add(key)
+            self._synced_at = now
+
+    def revoke(self, key: bytes, expires_at: float):
+        now = time.time()
+        if expires_at <= now:
+            return
+        self.backend.add(key, expires_at)
+        with self._lock:
+            self._bloom.add(key)
+
+    def is_revoked(self, key: bytes) -> bool:
+        now = time.time()
+        self._sync(now)
+        if key not in self._bloom:
+            return False
+        return self.backend.contains(key, now)
+
+
+revocation_store = TokenRevocationStore(
+    backend_from_url(settings.SHARED_STORE_URL),
+    capacity=settings.REVOCATION_BLOOM_CAPACITY,
+    error_rate=settings.REVOCATION_BLOOM_ERROR_RATE,
+    sync_seconds=settings.REVOCATION_SYNC_SECONDS,
+    rebuild_seconds=settings.REVOCATION_REBUILD_SECONDS,
+)
@@ -1,13 +1,21 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Dict, NamedTuple, Optional, Tuple
+from uuid import UUID
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.core.config import settings
+from app.core.revocation import revocation_store
+from app.models.user import UserRole
 from fastapi.security import OAuth2PasswordBearer
 from fastapi import Depends, HTTPException, status
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/token")
+oauth2_scheme_optional = OAuth2PasswordBearer(tokenUrl="api/v1/auth/token", auto_error=False)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
@@ -31,3 +39,126 @@ def create_refresh_token(data: dict, expires_delta: Optional[timedelta] = None):
 
 def get_current_user_token(token: str = Depends(oauth2_scheme)):
     return token
+
+class TokenClaims(NamedTuple):
+    sub: UUID
+    role: Optional[str]
+    exp: float
+
+
+class VerifiedTokenCache:
+    """LRU of tokens whose signature already checked out, keyed by SHA-256 of the token.
+
+    An entry lives until the token's own ``exp`` or ``ttl`` seconds, whichever comes
+    first, so a cached token is never accepted past its expiry. Raw tokens aren't kept.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[bytes, Tuple[float, TokenClaims]]" = OrderedDict()
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: bytes, now: float) -> Optional[TokenClaims]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, claims = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return claims
+
+    def put(self, key: bytes, claims: TokenClaims, now: float):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (min(claims.exp, now + self.ttl), claims)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def discard(self, key: bytes):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {"size": len(self._entries), "max_size": self.max_size, "hits": self.hits, "misses": self.misses}
+
+
+token_cache = VerifiedTokenCache(settings.TOKEN_CACHE_SIZE, settings.TOKEN_CACHE_TTL_SECONDS)
+
+def _token_key(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+def verify_token(token: str) -> TokenClaims:
+    """Claims of a valid token, checking its signature only the first time it's seen.
+
+    Raises JWTError for a bad signature, an expired token or missing claims.
+    """
+    key = _token_key(token)
+    now = time.time()
+    claims = token_cache.get(key, now)
+    if claims is not None:
+        return claims
+    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    try:
+        claims = TokenClaims(sub=UUID(payload["sub"]), role=payload.get("role"), exp=float(payload["exp"]))
+    except (KeyError, ValueError, TypeError) as e:
+        raise JWTError(f"Invalid claims: {e}")
+    token_cache.put(key, claims, now)
+    return claims
+
+def revoke_token(token: str):
+    """Reject ``token`` on every worker until it expires; an invalid token needs no revoking."""
+    try:
+        claims = verify_token(token)
+    except JWTError:
+        return
+    key = _token_key(token)
+    revocation_store.revoke(key, claims.exp)
+    token_cache.discard(key)
+
+def get_current_claims(token: str = Depends(oauth2_scheme)) -> TokenClaims:
+    try:
+        claims = verify_token(token)
+    except JWTError:
+        claims = None
+    if claims is None or revocation_store.is_revoked(_token_key(token)):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return claims
+
+def get_current_user_id(claims: TokenClaims = Depends(get_current_claims)) -> UUID:
+    return claims.sub
+
+def get_current_user_role(claims: TokenClaims = Depends(get_current_claims)) -> Optional[str]:
+    return claims.role
+
+def require_admin(role: Optional[str] = Depends(get_current_user_role)):
+    if role != UserRole.ADMIN:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+
+def get_optional_user_id(token: Optional[str] = Depends(oauth2_scheme_optional)) -> Optional[UUID]:
+    # Used for routing decisions only; endpoints that require auth still validate the token
+    if not token:
+        return None
+    try:
+        return verify_token(token).sub
+    except JWTError:
+        return None
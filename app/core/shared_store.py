@@ -0,0 +1,28 @@
+import sqlite3
+
+# SHARED_STORE_URL schemes: Redis across hosts, a SQLite file across the workers of
+# one host, or memory:// for a single process (tests, local development)
+REDIS_SCHEMES = ("redis://", "rediss://", "unix://")
+SQLITE_SCHEME = "sqlite:///"
+MEMORY_SCHEME = "memory://"
+
+def store_kind(url: str) -> str:
+    if url.startswith(REDIS_SCHEMES):
+        return "redis"
+    if url.startswith(SQLITE_SCHEME):
+        return "sqlite"
+    if url.startswith(MEMORY_SCHEME):
+        return "memory"
+    raise ValueError(f"Unsupported SHARED_STORE_URL: {url}")
+
+def connect_sqlite(url: str) -> sqlite3.Connection:
+    # Autocommit, and WAL so readers in other workers don't wait on a writer
+    conn = sqlite3.connect(url[len(SQLITE_SCHEME):], timeout=5, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    return conn
+
+def connect_redis(url: str):
+    # Only deployments that configure Redis need the package
+    import redis
+
+    return redis.Redis.from_url(url)
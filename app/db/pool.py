@@ -0,0 +1,68 @@
+import threading
+import time
+from typing import Dict, Type
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+
+
+class PoolWaitStats:
+    """Time spent waiting for a connection to be handed out by the pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def record(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.total_wait_seconds += seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            waits = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(self.total_wait_seconds / waits * 1000, 3) if waits else 0.0,
+                "max_wait_ms": round(self.max_wait_seconds * 1000, 3),
+            }
+
+
+# engine name -> wait stats, shared by every pool instance the engine recreates
+POOL_WAIT_STATS: Dict[str, PoolWaitStats] = {}
+
+
+def instrumented_pool_class(name: str) -> Type[AsyncAdaptedQueuePool]:
+    stats = POOL_WAIT_STATS.setdefault(name, PoolWaitStats())
+
+    class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+        def _do_get(self):
+            start = time.perf_counter()
+            try:
+                connection = super()._do_get()
+            except PoolTimeoutError:
+                stats.record(time.perf_counter() - start, timed_out=True)
+                raise
+            stats.record(time.perf_counter() - start)
+            return connection
+
+    return InstrumentedAsyncQueuePool
+
+
+def pool_status(name: str, pool: Pool) -> Dict:
+    status = {
+        "name": name,
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+    }
+    status.update(POOL_WAIT_STATS.get(name, PoolWaitStats()).snapshot())
+    return status
@@ -0,0 +1,93 @@
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+from uuid import UUID
+from app.core.config import settings
+from app.core.shared_store import connect_redis, connect_sqlite, store_kind
+
+
+class MemoryRecentWrites:
+    """Write markers held by this process only; for tests and single-worker development."""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # user id -> wall-clock deadline until which the user's reads stay on the primary
+        self._until: Dict[UUID, float] = {}
+
+    def mark(self, user_id: UUID, ttl: float):
+        now = time.time()
+        with self._lock:
+            if len(self._until) >= self.max_entries:
+                self._until = {key: until for key, until in self._until.items() if until > now}
+            self._until[user_id] = now + ttl
+
+    def is_recent(self, user_id: UUID) -> bool:
+        return self._until.get(user_id, 0) > time.time()
+
+
+class SQLiteRecentWrites:
+    """Write markers in a SQLite file shared by every worker on the host."""
+
+    def __init__(self, url: str):
+        self.url = url
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = connect_sqlite(self.url)
+            conn.execute("CREATE TABLE IF NOT EXISTS recent_writes (user_id TEXT PRIMARY KEY, until REAL NOT NULL)")
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_recent_writes_until ON recent_writes (until)")
+            self._conn = conn
+        return self._conn
+
+    def mark(self, user_id: UUID, ttl: float):
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute("DELETE FROM recent_writes WHERE until <= ?", (now,))
+            conn.execute(
+                "INSERT INTO recent_writes (user_id, until) VALUES (?, ?) "
+                "ON CONFLICT (user_id) DO UPDATE SET until = excluded.until",
+                (str(user_id), now + ttl),
+            )
+
+    def is_recent(self, user_id: UUID) -> bool:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT 1 FROM recent_writes WHERE user_id = ? AND until > ?", (str(user_id), time.time())
+            ).fetchone()
+        return row is not None
+
+
+class RedisRecentWrites:
+    """Write markers as Redis keys that Redis itself expires, for workers on several hosts."""
+
+    def __init__(self, url: str, prefix: str = "wagy:recent-write"):
+        self.prefix = prefix
+        self._redis = connect_redis(url)
+
+    def _key(self, user_id: UUID) -> str:
+        return f"{self.prefix}:{user_id}"
+
+    def mark(self, user_id: UUID, ttl: float):
+        self._redis.set(self._key(user_id), 1, px=int(ttl * 1000))
+
+    def is_recent(self, user_id: UUID) -> bool:
+        return bool(self._redis.exists(self._key(user_id)))
+
+
+def recent_writes_from_url(url: str):
+    kind = store_kind(url)
+    if kind == "redis":
+        return RedisRecentWrites(url)
+    if kind == "sqlite":
+        return SQLiteRecentWrites(url)
+    return MemoryRecentWrites()
+
+
+# Users who wrote within READ_YOUR_WRITES_SECONDS, seen by every worker that reads
+# the shared store, so a read that lands on another worker still skips the replicas
+recent_writes = recent_writes_from_url(settings.SHARED_STORE_URL)
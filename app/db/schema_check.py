@@ -0,0 +1,46 @@
+import os
+import logging
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import inspect
+from app.db.session import engine
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def alembic_config() -> Config:
+    # Absolute paths, so the check works whatever directory the worker was started from
+    config = Config(os.path.join(PROJECT_ROOT, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(PROJECT_ROOT, "alembic"))
+    return config
+
+def check_schema_revision():
+    """Compare the database's Alembic revision with this build's head; never runs DDL.
+
+    Schema changes are applied by `alembic upgrade head` before workers start (see the
+    Dockerfile). A database behind this build stops the worker. One at a revision this
+    build doesn't know was migrated by a newer deploy and is only logged, so old workers
+    keep booting during a rolling deploy.
+    """
+    script = ScriptDirectory.from_config(alembic_config())
+    head = script.get_current_head()
+    with engine.connect() as conn:
+        current = MigrationContext.configure(conn).get_current_revision()
+
+    if current == head:
+        logger.info(f"Database schema is at revision {head}")
+        return
+    if current is not None and current not in {revision.revision for revision in script.walk_revisions()}:
+        logger.warning(f"Database schema is at unknown revision {current}, this build expects {head}")
+        return
+    if current is None and inspect(engine).has_table("sitter_profiles"):
+        # Built by the old create_all at startup: it has 000's tables but no revision
+        raise RuntimeError(
+            f"Database schema has no Alembic revision, this build expects {head}: "
+            "run `alembic stamp 000` (or 001 if its columns exist), then `alembic upgrade head`"
+        )
+    raise RuntimeError(
+        f"Database schema is at revision {current or 'none'}, this build expects {head}: run `alembic upgrade head`"
+    )
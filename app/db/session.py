@@ -1,11 +1,68 @@
-from sqlmodel import create_engine, Session, SQLModel
-from app.core.config import settings
+import itertools
+from typing import Optional
+from uuid import UUID
+from fastapi import Depends
+from starlette.concurrency import run_in_threadpool
+from sqlmodel import create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.core.config import settings, to_async_url
+from app.core.security import get_optional_user_id
+from app.db.pool import instrumented_pool_class, pool_status
+from app.db.recent_writes import recent_writes
 
-engine = create_engine(settings.DATABASE_URL)
+# Synchronous engine for the startup schema check, Alembic and CLI scripts
+engine = create_engine(settings.DATABASE_URL, pool_pre_ping=settings.DB_POOL_PRE_PING)
 
-def create_db_and_tables():
-    SQLModel.metadata.create_all(engine)
+def create_request_engine(url: str, name: str):
+    return create_async_engine(
+        url,
+        poolclass=instrumented_pool_class(name),
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
 
-def get_session():
-    with Session(engine) as session:
+# Request handlers use asyncpg so DB round trips don't block the event loop
+async_engine = create_request_engine(settings.ASYNC_DATABASE_URL, "primary")
+
+read_engines = {
+    f"replica-{i}": create_request_engine(to_async_url(url), f"replica-{i}")
+    for i, url in enumerate(settings.DATABASE_READ_REPLICA_URLS)
+}
+_replica_cycle = itertools.cycle(list(read_engines.values())) if read_engines else None
+
+async def record_write(user_id: UUID):
+    """Send the user's reads to the primary for READ_YOUR_WRITES_SECONDS, on every worker.
+
+    The marker lives in the shared store, since the user's next GET may be served by
+    another worker or host. Without replicas every read is on the primary already.
+    """
+    if read_engines:
+        await run_in_threadpool(recent_writes.mark, user_id, settings.READ_YOUR_WRITES_SECONDS)
+
+async def _read_engine(user_id: Optional[UUID]):
+    if _replica_cycle is None:
+        return async_engine
+    if user_id is not None and await run_in_threadpool(recent_writes.is_recent, user_id):
+        return async_engine
+    return next(_replica_cycle)
+
+def get_pool_metrics():
+    metrics = [pool_status("primary", async_engine.sync_engine.pool)]
+    for name, read_engine in read_engines.items():
+        metrics.append(pool_status(name, read_engine.sync_engine.pool))
+    return metrics
+
+async def get_session():
+    # expire_on_commit=False: attributes stay loaded after commit, since lazy
+    # refreshes are not possible on an async session
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
+
+async def get_read_session(user_id: Optional[UUID] = Depends(get_optional_user_id)):
+    """Session for read-only endpoints: a replica, unless the caller wrote recently."""
+    async with AsyncSession(await _read_engine(user_id), expire_on_commit=False) as session:
         yield session
@@ -1,8 +1,10 @@
 import uuid
 from datetime import date, datetime
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple
 from enum import Enum as PyEnum
-from sqlmodel import Field, SQLModel, Relationship, Column, JSON, ARRAY, String, Float, Date, Boolean, Integer, Text
+from sqlmodel import Field, SQLModel, Relationship, Column, JSON, ARRAY, String, Float, Date, Boolean, Integer, Text, Index
+from sqlalchemy import UniqueConstraint
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from app.models.user import User
 
 # Enums
@@ -108,6 +110,7 @@ class SitterProfile(SQLModel, table=True):
     emergency_contact_phone: Optional[str] = None
 
     # Onboarding Completion Flags
+    onboarding_step: int = Field(default=1) # Furthest step reached; never moves backwards
     is_personal_info_completed: bool = Field(default=False)
     is_location_completed: bool = Field(default=False)
     is_services_selected: bool = Field(default=False)
@@ -126,6 +129,8 @@ class SitterProfile(SQLModel, table=True):
     city: Optional[str] = None
     latitude: Optional[float] = None
     longitude: Optional[float] = None
+    # Geohash of (latitude, longitude); indexed on the sitter_search_index projection
+    geohash: Optional[str] = Field(default=None, sa_column=Column(String(collation="C")))
     service_radius_km: Optional[int] = None
     availability_type: Optional[AvailabilityType] = None
     available_days: List[str] = Field(default=[], sa_column=Column(ARRAY(String)))
@@ -173,6 +178,8 @@ class SitterProfile(SQLModel, table=True):
     training_philosophy: Optional[str] = Field(default=None, sa_column=Column(Text))
     photo_gallery: List[str] = Field(default=[], sa_column=Column(ARRAY(String)))
     intro_video: Optional[str] = None
+    # Weighted tsvector over headline/bio/care routine/training philosophy, maintained by update_content
+    search_vector: Optional[str] = Field(default=None, sa_column=Column(TSVECTOR))
 
     # Supported Services Flags
     is_boarding_supported: bool = Field(default=False)
@@ -181,7 +188,116 @@ class SitterProfile(SQLModel, table=True):
     is_dog_walking_supported: bool = Field(default=False)
     is_day_care_supported: bool = Field(default=False)
 
-    # Service-Specific Criteria (Boarding)
+    # Service-Specific Criteria (Dog Training)
+    training_types: List[str] = Field(default=[], sa_column=Column(ARRAY(String)))
+    training_method: Optional[TrainingMethod] = None
+    training_certifications: List[str] = Field(default=[], sa_column=Column(ARRAY(String)))
+    training_session_duration: Optional[int] = None
+    training_packages: Dict = Field(default={}, sa_column=Column(JSON))
+    training_off_leash: bool = Field(default=False)
+    training_behavioral_mod: bool = Field(default=False)
+
+    # Trust & Quality Signals
+    rating: float = Field(default=0.0)
+    # Running totals over sitter_reviews; rating = rating_sum / review_count, kept in
+    # step by review_service on every insert instead of re-averaging all reviews. A
+    # rating from before sitter_reviews with no reviews behind it counts as one review
+    # (migration 011), so it isn't thrown away by the next review.
+    rating_sum: float = Field(default=0.0)
+    review_count: int = Field(default=0)
+    completed_bookings: int = Field(default=0)
+    repeat_clients: int = Field(default=0)
+    response_time_minutes: Optional[int] = None
+    cancellation_rate: float = Field(default=0.0)
+    # Precomputed from the signals above by ranking_service; only recomputed when they change
+    rank_score: float = Field(default=0.0)
+
+    # Mandatory Safety & Legal
+    insurance_status: bool = Field(default=False)
+    liability_acceptance: bool = Field(default=False)
+    pet_emergency_protocol: Optional[str] = Field(default=None, sa_column=Column(Text))
+    terms_accepted: bool = Field(default=False)
+
+    # Timestamps
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+
+    # Relationships
+    user: Optional[User] = Relationship(back_populates="sitter_profile")
+
+    # Service-specific criteria (1:1, see SITTER_SERVICE_DETAILS). Never lazy loaded:
+    # sitter_service.load_service_details fetches only the services the sitter supports.
+    boarding: Optional["SitterBoarding"] = Relationship(sa_relationship_kwargs={"uselist": False, "lazy": "raise"})
+    house_sitting: Optional["SitterHouseSitting"] = Relationship(sa_relationship_kwargs={"uselist": False, "lazy": "raise"})
+    drop_in: Optional["SitterDropIn"] = Relationship(sa_relationship_kwargs={"uselist": False, "lazy": "raise"})
+    walking: Optional["SitterWalking"] = Relationship(sa_relationship_kwargs={"uselist": False, "lazy": "raise"})
+    daycare: Optional["SitterDayCare"] = Relationship(sa_relationship_kwargs={"uselist": False, "lazy": "raise"})
+
+
+# Column groups for section-scoped loading. Each onboarding form writes (mostly) one
+# group, so writes return and readers load only the groups they need instead of the
+# whole wide row. id, user_id and the timestamps are always loaded.
+SITTER_PROFILE_SECTIONS: Dict[str, Tuple[str, ...]] = {
+    "identity": (
+        "full_name", "profile_photo", "date_of_birth", "phone", "email",
+        "government_id_type", "government_id_number", "government_id_image",
+        "address", "postal_code", "id_verified", "is_phone_verified", "is_shahkar_verified",
+        "background_check_status", "emergency_contact_name", "emergency_contact_phone",
+    ),
+    "onboarding": (
+        "onboarding_step", "is_personal_info_completed", "is_location_completed",
+        "is_services_selected", "is_boarding_completed", "is_house_sitting_completed",
+        "is_drop_in_completed", "is_dog_walking_completed", "is_day_care_completed",
+        "is_experience_completed", "is_home_completed", "is_content_completed",
+        "is_pricing_completed",
+    ),
+    "services": (
+        "is_boarding_supported", "is_house_sitting_supported", "is_drop_in_supported",
+        "is_dog_walking_supported", "is_day_care_supported",
+    ),
+    "location": (
+        "country", "city", "latitude", "longitude", "geohash", "service_radius_km",
+        "availability_type", "available_days", "available_time_slots", "blackout_dates",
+    ),
+    "experience": (
+        "years_of_experience", "pet_experience_types", "breeds_experience", "size_experience",
+        "puppy_experience", "senior_pet_experience", "medication_experience",
+        "behavioral_experience", "first_aid_certified", "vet_clinic_reference",
+    ),
+    "home": (
+        "home_type", "home_ownership", "fenced_yard", "yard_size", "pets_in_home",
+        "own_pets_details", "children_in_home", "smoking_home", "crate_available", "cameras_in_home",
+    ),
+    "pricing": (
+        "base_price", "additional_pet_price", "puppy_rate", "holiday_rate", "long_stay_discount",
+        "cancellation_policy", "payout_method", "payout_verified",
+    ),
+    "content": (
+        "headline", "bio", "care_routine_description", "training_philosophy",
+        "photo_gallery", "intro_video",
+    ),
+    "training": (
+        "training_types", "training_method", "training_certifications",
+        "training_session_duration", "training_packages", "training_off_leash",
+        "training_behavioral_mod",
+    ),
+    "trust": (
+        "rating", "rating_sum", "review_count", "completed_bookings", "repeat_clients",
+        "response_time_minutes", "cancellation_rate", "rank_score",
+    ),
+    "safety": ("insurance_status", "liability_acceptance", "pet_emergency_protocol", "terms_accepted"),
+    "search": ("search_vector",),
+}
+
+SITTER_PROFILE_KEY_COLUMNS = ("id", "user_id", "created_at", "updated_at")
+
+
+# Service-specific criteria, split off sitter_profiles into 1:1 tables keyed by the
+# profile id so sitters offering one service don't carry every other service's columns.
+class SitterBoarding(SQLModel, table=True):
+    __tablename__ = "sitter_boarding"
+
+    sitter_id: uuid.UUID = Field(foreign_key="sitter_profiles.id", primary_key=True)
     boarding_max_pets: Optional[int] = None
     boarding_overnight_supervision: bool = Field(default=False)
     boarding_allowed_pet_types: List[str] = Field(default=[], sa_column=Column(ARRAY(String)))
@@ -190,7 +306,10 @@ class SitterProfile(SQLModel, table=True):
     boarding_sleeping_arrangement: Optional[SleepingArrangement] = None
     boarding_separation_policy: bool = Field(default=False)
 
-    # Service-Specific Criteria (House Sitting)
+class SitterHouseSitting(SQLModel, table=True):
+    __tablename__ = "sitter_house_sitting"
+
+    sitter_id: uuid.UUID = Field(foreign_key="sitter_profiles.id", primary_key=True)
     house_sitting_overnight: bool = Field(default=False)
     house_sitting_daytime_hours: Optional[int] = None
     house_sitting_mail_collection: bool = Field(default=False)
@@ -198,7 +317,10 @@ class SitterProfile(SQLModel, table=True):
     house_sitting_security_check: bool = Field(default=False)
     house_sitting_allowed_access: Optional[AllowedHomeAccess] = None
 
-    # Service-Specific Criteria (Drop-In)
+class SitterDropIn(SQLModel, table=True):
+    __tablename__ = "sitter_drop_in"
+
+    sitter_id: uuid.UUID = Field(foreign_key="sitter_profiles.id", primary_key=True)
     drop_in_duration_min: Optional[int] = None
     drop_in_visits_per_day: Optional[int] = None
     drop_in_feeding: bool = Field(default=False)
@@ -206,7 +328,10 @@ class SitterProfile(SQLModel, table=True):
     drop_in_medication: bool = Field(default=False)
     drop_in_photo_update: bool = Field(default=False)
 
-    # Service-Specific Criteria (Dog Walking)
+class SitterWalking(SQLModel, table=True):
+    __tablename__ = "sitter_walking"
+
+    sitter_id: uuid.UUID = Field(foreign_key="sitter_profiles.id", primary_key=True)
     walking_duration: Optional[WalkDuration] = None
     walking_type: Optional[WalkType] = None
     walking_max_dogs: Optional[int] = None
@@ -214,7 +339,10 @@ class SitterProfile(SQLModel, table=True):
     walking_gps_tracking: bool = Field(default=False)
     walking_weather_policy: Optional[WeatherPolicy] = None
 
-    # Service-Specific Criteria (Doggy Day Care)
+class SitterDayCare(SQLModel, table=True):
+    __tablename__ = "sitter_daycare"
+
+    sitter_id: uuid.UUID = Field(foreign_key="sitter_profiles.id", primary_key=True)
     daycare_hours: Dict = Field(default={}, sa_column=Column(JSON))
     daycare_rest_periods: bool = Field(default=False)
     daycare_structured_play: bool = Field(default=False)
@@ -222,32 +350,102 @@ class SitterProfile(SQLModel, table=True):
     daycare_feeding_schedule: bool = Field(default=False)
     daycare_nap_area: bool = Field(default=False)
 
-    # Service-Specific Criteria (Dog Training)
-    training_types: List[str] = Field(default=[], sa_column=Column(ARRAY(String)))
-    training_method: Optional[TrainingMethod] = None
-    training_certifications: List[str] = Field(default=[], sa_column=Column(ARRAY(String)))
-    training_session_duration: Optional[int] = None
-    training_packages: Dict = Field(default={}, sa_column=Column(JSON))
-    training_off_leash: bool = Field(default=False)
-    training_behavioral_mod: bool = Field(default=False)
+# Relationship name on SitterProfile -> (supported flag, detail table)
+SITTER_SERVICE_DETAILS = {
+    "boarding": ("is_boarding_supported", SitterBoarding),
+    "house_sitting": ("is_house_sitting_supported", SitterHouseSitting),
+    "drop_in": ("is_drop_in_supported", SitterDropIn),
+    "walking": ("is_dog_walking_supported", SitterWalking),
+    "daycare": ("is_day_care_supported", SitterDayCare),
+}
+
+
+# Normalized availability, derived from available_days / available_time_slots / blackout_dates
+# by update_location so date-range searches can use an index instead of scanning profiles
+class SitterAvailability(SQLModel, table=True):
+    __tablename__ = "sitter_availability"
+    __table_args__ = (
+        Index("ix_sitter_availability_weekday_slot", "weekday", "time_slot", "sitter_id"),
+    )
+
+    sitter_id: uuid.UUID = Field(foreign_key="sitter_profiles.id", primary_key=True)
+    weekday: int = Field(primary_key=True) # 0 = Monday
+    time_slot: str = Field(default="*", primary_key=True) # "*" = any time of day
+
+class SitterBlackoutDate(SQLModel, table=True):
+    __tablename__ = "sitter_blackout_dates"
+    __table_args__ = (
+        Index("ix_sitter_blackout_dates_date_sitter", "blackout_date", "sitter_id"),
+    )
+
+    sitter_id: uuid.UUID = Field(foreign_key="sitter_profiles.id", primary_key=True)
+    blackout_date: date = Field(primary_key=True)
+
+
+class SitterReview(SQLModel, table=True):
+    __tablename__ = "sitter_reviews"
+    __table_args__ = (
+        # Newest-first keyset pages of one sitter's reviews
+        Index("ix_sitter_reviews_sitter_id_created_at_id", "sitter_id", "created_at", "id"),
+        # One review per author and sitter, so repeated reviews can't inflate the rating totals
+        UniqueConstraint("sitter_id", "author_id", name="uq_sitter_reviews_sitter_id_author_id"),
+    )
 
-    # Trust & Quality Signals
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    sitter_id: uuid.UUID = Field(foreign_key="sitter_profiles.id")
+    author_id: Optional[uuid.UUID] = Field(default=None, foreign_key="user.id") # None for reviews migrated from the old JSON column
+    rating: int
+    comment: Optional[str] = Field(default=None, sa_column=Column(Text))
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+# Narrow read-optimized projection of SitterProfile holding only the searchable and
+# sortable columns. Rewritten from sitter_profiles in the same transaction as every
+# profile save, so search and listing queries never read the wide row.
+class SitterSearchIndex(SQLModel, table=True):
+    __tablename__ = "sitter_search_index"
+    __table_args__ = (
+        Index("ix_sitter_search_index_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_sitter_search_index_rank_score_id", "rank_score", "id"),
+        Index("ix_sitter_search_index_rating_id", "rating", "id"),
+        Index("ix_sitter_search_index_base_price_id", "base_price", "id"),
+        Index("ix_sitter_search_index_created_at_id", "created_at", "id"),
+        Index("ix_sitter_search_index_years_of_experience_id", "years_of_experience", "id"),
+    )
+
+    id: uuid.UUID = Field(foreign_key="sitter_profiles.id", primary_key=True)
+    user_id: uuid.UUID
+    full_name: str
+    profile_photo: Optional[str] = None
+    headline: Optional[str] = None
+    city: Optional[str] = None
+
+    # Location, C collation so geohash prefix ranges use the B-tree index
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    geohash: Optional[str] = Field(default=None, sa_column=Column(String(collation="C"), index=True))
+    service_radius_km: Optional[int] = None
+
+    # Pricing
+    base_price: float = Field(default=0.0)
+    additional_pet_price: float = Field(default=0.0)
+    puppy_rate: float = Field(default=0.0)
+    holiday_rate: float = Field(default=0.0)
+    long_stay_discount: float = Field(default=0.0)
+
+    # Services
+    is_boarding_supported: bool = Field(default=False)
+    is_house_sitting_supported: bool = Field(default=False)
+    is_drop_in_supported: bool = Field(default=False)
+    is_dog_walking_supported: bool = Field(default=False)
+    is_day_care_supported: bool = Field(default=False)
+
+    # Sorting & ranking
     rating: float = Field(default=0.0)
     completed_bookings: int = Field(default=0)
-    repeat_clients: int = Field(default=0)
-    reviews: Dict = Field(default={}, sa_column=Column(JSON))
-    response_time_minutes: Optional[int] = None
-    cancellation_rate: float = Field(default=0.0)
-
-    # Mandatory Safety & Legal
-    insurance_status: bool = Field(default=False)
-    liability_acceptance: bool = Field(default=False)
-    pet_emergency_protocol: Optional[str] = Field(default=None, sa_column=Column(Text))
-    terms_accepted: bool = Field(default=False)
+    years_of_experience: int = Field(default=0)
+    rank_score: float = Field(default=0.0)
+    search_vector: Optional[str] = Field(default=None, sa_column=Column(TSVECTOR))
 
-    # Timestamps
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
-
-    # Relationships
-    user: Optional[User] = Relationship(back_populates="sitter_profile")
@@ -3,7 +3,7 @@ from datetime import datetime
 from typing import Optional, List
 from enum import Enum as PyEnum
 from sqlmodel import Field, SQLModel, Relationship
-from sqlalchemy import Column, String
+from sqlalchemy import Column, Index, String
 
 class UserStatus(str, PyEnum):
     ACTIVE = "active"
@@ -40,6 +40,10 @@ class User(SQLModel, table=True):
 
 class AuthProvider(SQLModel, table=True):
     __tablename__ = "auth_providers"
+    __table_args__ = (
+        # One account per provider identity; the target of login's INSERT ... ON CONFLICT
+        Index("uq_auth_providers_provider_provider_uid", "provider", "provider_uid", unique=True),
+    )
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     user_id: uuid.UUID = Field(foreign_key="user.id")
     provider: AuthProviderEnum
@@ -0,0 +1,43 @@
+from pydantic import BaseModel
+from typing import List
+
+class PoolMetrics(BaseModel):
+    name: str
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    checkouts: int
+    timeouts: int
+    avg_wait_ms: float
+    max_wait_ms: float
+
+class DatabaseMetrics(BaseModel):
+    pools: List[PoolMetrics]
+
+class GatewayOperationMetrics(BaseModel):
+    operation: str
+    calls: int
+    failures: int
+    avg_latency_ms: float
+    max_latency_ms: float
+
+class GatewayMetrics(BaseModel):
+    circuit: str
+    operations: List[GatewayOperationMetrics]
+
+class MailQueueMetrics(BaseModel):
+    queued: int
+    retrying: int
+    sent: int
+    failed: int
+    retries: int
+    avg_send_ms: float
+    max_send_ms: float
+    avg_queue_wait_ms: float
+
+class TokenCacheMetrics(BaseModel):
+    size: int
+    max_size: int
+    hits: int
+    misses: int
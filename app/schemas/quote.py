@@ -0,0 +1,23 @@
+from pydantic import BaseModel
+from typing import List
+from datetime import date
+from uuid import UUID
+
+class QuoteRequest(BaseModel):
+    sitter_ids: List[UUID]
+    start_date: date
+    end_date: date
+    num_pets: int = 1
+    has_puppy: bool = False
+    holidays: List[date] = []
+
+class SitterQuote(BaseModel):
+    sitter_id: UUID
+    nights: int
+    holiday_nights: int
+    subtotal: float
+    discount: float
+    total: float
+
+class QuoteResponse(BaseModel):
+    quotes: List[SitterQuote]
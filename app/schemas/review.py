@@ -0,0 +1,20 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import datetime
+from uuid import UUID
+
+class SitterReviewCreate(BaseModel):
+    rating: int = Field(..., ge=1, le=5)
+    comment: Optional[str] = Field(default=None, max_length=2000)
+
+class SitterReviewResponse(BaseModel):
+    id: UUID
+    sitter_id: UUID
+    author_id: Optional[UUID]
+    rating: int
+    comment: Optional[str]
+    created_at: datetime
+
+class SitterReviewListResponse(BaseModel):
+    items: List[SitterReviewResponse]
+    next_cursor: Optional[str] = None
@@ -1,5 +1,6 @@
 from pydantic import BaseModel, HttpUrl
-from typing import Optional, List, Dict
+from enum import Enum as PyEnum
+from typing import Any, Optional, List, Dict
 from datetime import date, datetime
 from uuid import UUID
 from app.models.sitter import (
@@ -134,6 +135,21 @@ class SitterPricingUpdate(BaseModel):
     cancellation_policy: CancellationPolicy
     payout_method: PayoutMethod
 
+# --- Batch: any subset of the forms above, saved in one request ---
+class SitterProfileBatchUpdate(BaseModel):
+    personal_info: Optional[SitterPersonalInfoUpdate] = None
+    location: Optional[SitterLocationUpdate] = None
+    services: Optional[SitterServiceSelectionUpdate] = None
+    boarding: Optional[SitterBoardingUpdate] = None
+    house_sitting: Optional[SitterHouseSittingUpdate] = None
+    drop_in: Optional[SitterDropInUpdate] = None
+    walking: Optional[SitterWalkingUpdate] = None
+    daycare: Optional[SitterDayCareUpdate] = None
+    experience: Optional[SitterExperienceUpdate] = None
+    home: Optional[SitterHomeUpdate] = None
+    content: Optional[SitterContentUpdate] = None
+    pricing: Optional[SitterPricingUpdate] = None
+
 # --- Gallery Delete Schema ---
 class SitterGalleryDelete(BaseModel):
     photos: List[str]
@@ -275,3 +291,77 @@ class SitterProfileResponse(BaseModel):
 
     # Next Step Logic
     next_step: Optional[str] = None
+
+class SitterResponseMode(str, PyEnum):
+    FULL = "full" # The whole SitterProfileResponse
+    SECTION = "section" # Only the fields the form wrote, plus progress
+
+class SitterSectionResponse(BaseModel):
+    id: UUID
+    onboarding_step: int
+    next_step: Optional[str] = None
+    section: Dict[str, Any]
+
+# --- Search ---
+class SitterSearchResult(BaseModel):
+    id: UUID
+    user_id: UUID
+    full_name: Optional[str]
+    profile_photo: Optional[str]
+    headline: Optional[str]
+    city: Optional[str]
+    service_radius_km: Optional[int]
+    base_price: float
+    rating: float
+    distance_km: float
+
+class SitterSearchResponse(BaseModel):
+    items: List[SitterSearchResult]
+    next_cursor: Optional[str] = None
+
+class SitterFacetResponse(BaseModel):
+    total: int
+    facets: Dict[str, Dict[str, int]]
+    sitter_ids: List[UUID]
+
+class SitterAvailabilityResponse(BaseModel):
+    sitter_ids: List[UUID]
+    next_cursor: Optional[str] = None
+
+class SitterTextSearchResult(BaseModel):
+    id: UUID
+    user_id: UUID
+    full_name: Optional[str]
+    profile_photo: Optional[str]
+    headline: Optional[str]
+    city: Optional[str]
+    base_price: float
+    rating: float
+    rank: float
+    snippet: Optional[str]
+
+class SitterListItem(BaseModel):
+    id: UUID
+    user_id: UUID
+    full_name: Optional[str]
+    profile_photo: Optional[str]
+    headline: Optional[str]
+    city: Optional[str]
+    base_price: float
+    rating: float
+    rank_score: float
+
+class SitterTextSearchResponse(BaseModel):
+    items: List[SitterTextSearchResult]
+    next_cursor: Optional[str] = None
+
+class SitterSortOrder(str, PyEnum):
+    RANK = "rank"
+    RATING = "rating"
+    PRICE = "price"
+    NEWEST = "newest"
+    EXPERIENCE = "experience"
+
+class SitterListResponse(BaseModel):
+    items: List[SitterListItem]
+    next_cursor: Optional[str] = None
@@ -1,130 +1,145 @@
 import random
 import string
-import requests as http_requests
-from datetime import datetime, timedelta
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlalchemy import exists, literal, union_all
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlmodel.ext.asyncio.session import AsyncSession
 from fastapi import HTTPException
-from google.oauth2 import id_token
-from google.auth.transport import requests
+import httpx
+from jose import JWTError
 from app.core.config import settings
 from app.models.user import User, AuthProvider, AuthProviderEnum
-from app.core.security import create_access_token, create_refresh_token
+from app.core.security import create_access_token, create_refresh_token, revoke_token
 from app.schemas.auth import AuthResponse, AuthData, UserResponse, Tokens
 from app.services.email_service import send_otp_email
-
-# In-memory OTP storage (For production, use Redis)
-otp_storage = {}
-
-# In-memory Token Blacklist (For production, use Redis)
-token_blacklist = set()
-
-MOBILE_OTP_URL = "https://api-staging.hyperlikes.ir/public/core/apiv1/custom_codes"
+from app.services.google_verifier import google_verifier
+from app.services.otp_gateway import OTPGatewayError, otp_gateway
+from app.services.otp_store import OTPCheck, otp_store
+from starlette.concurrency import run_in_threadpool
 
 def generate_otp(length=6):
     return ''.join(random.choices(string.digits, k=length))
 
-async def request_otp(session: Session, email: str):
+async def resolve_user(session: AsyncSession, provider: AuthProviderEnum, provider_uid: str, match_column, new_user: User) -> User:
+    """Find or register the user signing in with ``provider_uid``, in one statement.
+
+    The user linked to the provider wins; otherwise the user whose ``match_column``
+    equals ``new_user``'s value, else ``new_user`` is inserted. A user found without
+    a link gets one. Two first logins racing on the same user both get it: the loser's
+    INSERT hits ON CONFLICT DO NOTHING, and rerunning the statement finds the winner.
+    """
+    users = User.__table__
+    providers = AuthProvider.__table__
+    values = {column.name: getattr(new_user, column.name) for column in users.columns}
+
+    linked = (
+        select(*users.c)
+        .join(providers, providers.c.user_id == users.c.id)
+        .where(providers.c.provider == provider, providers.c.provider_uid == provider_uid)
+        .limit(1)
+        .cte("linked")
+    )
+    matched = (
+        select(*users.c)
+        .where(match_column == values[match_column.name], ~exists(select(linked.c.id)))
+        .cte("matched")
+    )
+    created = (
+        pg_insert(users)
+        .from_select(
+            list(values),
+            select(*[literal(value, type_=users.c[name].type) for name, value in values.items()])
+            .where(~exists(select(linked.c.id)), ~exists(select(matched.c.id))),
+        )
+        .on_conflict_do_nothing()
+        .returning(*users.c)
+        .cte("created")
+    )
+    resolved = union_all(select(*linked.c), select(*matched.c), select(*created.c)).cte("resolved")
+    link = AuthProvider(provider=provider, provider_uid=provider_uid)
+    linked_now = (
+        pg_insert(providers)
+        .from_select(
+            ["id", "user_id", "provider", "provider_uid", "created_at"],
+            select(
+                literal(link.id), resolved.c.id, literal(provider, type_=providers.c.provider.type),
+                literal(provider_uid), literal(link.created_at),
+            ).where(~exists(select(linked.c.id))),
+        )
+        .on_conflict_do_nothing(index_elements=["provider", "provider_uid"])
+        .cte("linked_now")
+    )
+
+    statement = select(resolved).add_cte(linked_now)
+    row = (await session.execute(statement)).first()
+    if row is None:
+        row = (await session.execute(statement)).first()
+    if row is None:
+        raise HTTPException(status_code=409, detail="Account is being created, try again")
+    await session.commit()
+    return User(**row._mapping)
+
+async def request_otp(session: AsyncSession, email: str):
     otp = generate_otp()
-    # Store OTP with expiration (e.g., 5 minutes)
-    otp_storage[email] = {
-        "otp": otp,
-        "expires_at": datetime.utcnow() + timedelta(minutes=5)
-    }
+    # Shared by all workers, so the verify request can land on any of them
+    await run_in_threadpool(otp_store.issue, email, otp, settings.OTP_TTL_SECONDS)
     
     # Send email
-    await send_otp_email(email, otp)
+    send_otp_email(email, otp)
     return {"message": "OTP sent successfully"}
 
-def verify_otp_login(session: Session, email: str, otp: str) -> AuthResponse:
-    stored_data = otp_storage.get(email)
-    
-    if not stored_data:
+async def verify_otp_login(session: AsyncSession, email: str, otp: str) -> AuthResponse:
+    # A verified code is consumed by the store
+    result = await run_in_threadpool(otp_store.verify, email, otp)
+    if result == OTPCheck.MISSING:
         raise HTTPException(status_code=400, detail="OTP not requested or expired")
-    
-    if datetime.utcnow() > stored_data["expires_at"]:
-        del otp_storage[email]
+    if result == OTPCheck.EXPIRED:
         raise HTTPException(status_code=400, detail="OTP expired")
-        
-    if stored_data["otp"] != otp:
+    if result == OTPCheck.TOO_MANY_ATTEMPTS:
+        raise HTTPException(status_code=429, detail="Too many attempts, request a new OTP")
+    if result == OTPCheck.INVALID:
         raise HTTPException(status_code=400, detail="Invalid OTP")
     
-    # OTP Verified. Clear it.
-    del otp_storage[email]
-    
-    # Check if user exists
-    statement = select(User).where(User.email == email)
-    user = session.exec(statement).first()
-    
-    if not user:
-        # Register new user
-        user = User(
-            email=email,
-            is_email_verified=True
-        )
-        session.add(user)
-        session.commit()
-        session.refresh(user)
-        
-        # Add Email Auth Provider (optional, since email is on user record, but good for consistency)
-        auth_provider = AuthProvider(
-            user_id=user.id,
-            provider=AuthProviderEnum.EMAIL,
-            provider_uid=email
-        )
-        session.add(auth_provider)
-        session.commit()
-    
+    user = await resolve_user(
+        session, AuthProviderEnum.EMAIL, email, User.email,
+        User(email=email, is_email_verified=True),
+    )
     return create_auth_response(user)
 
-def request_mobile_otp(phone_number: str):
-    payload = {'phoneNumber': phone_number}
+async def request_mobile_otp(phone_number: str):
     try:
-        response = http_requests.post(MOBILE_OTP_URL, data=payload)
-        response.raise_for_status()
-        return {"message": "OTP sent successfully"}
-    except http_requests.RequestException as e:
-        raise HTTPException(status_code=400, detail=f"Failed to send OTP: {str(e)}")
+        response = await otp_gateway.send_code(phone_number)
+    except OTPGatewayError as e:
+        raise HTTPException(status_code=503, detail=f"Failed to send OTP: {str(e)}")
+    if response.is_error:
+        raise HTTPException(status_code=400, detail=f"Failed to send OTP: gateway returned {response.status_code}")
+    return {"message": "OTP sent successfully"}
 
-def verify_mobile_otp_login(session: Session, phone_number: str, otp: str) -> AuthResponse:
-    payload = {'phoneNumber': phone_number, 'code': otp}
+async def verify_mobile_code(phone_number: str, otp: str):
     try:
-        response = http_requests.put(MOBILE_OTP_URL, data=payload)
-        if response.status_code != 200:
-             raise HTTPException(status_code=400, detail="Invalid OTP")
-    except http_requests.RequestException as e:
-        raise HTTPException(status_code=400, detail=f"Failed to verify OTP: {str(e)}")
+        verified = await otp_gateway.verify_code(phone_number, otp)
+    except OTPGatewayError as e:
+        raise HTTPException(status_code=503, detail=f"Failed to verify OTP: {str(e)}")
+    if not verified:
+        raise HTTPException(status_code=400, detail="Invalid OTP")
 
-    # Check if user exists by phone number
-    statement = select(User).where(User.phone_number == phone_number)
-    user = session.exec(statement).first()
-    
-    if not user:
-        # Register new user
-        user = User(
-            phone_number=phone_number,
-            is_phone_verified=True
-        )
-        session.add(user)
-        session.commit()
-        session.refresh(user)
-        
-        # Add OTP Auth Provider
-        auth_provider = AuthProvider(
-            user_id=user.id,
-            provider=AuthProviderEnum.OTP,
-            provider_uid=phone_number
-        )
-        session.add(auth_provider)
-        session.commit()
-    
+async def verify_mobile_otp_login(session: AsyncSession, phone_number: str, otp: str) -> AuthResponse:
+    await verify_mobile_code(phone_number, otp)
+
+    user = await resolve_user(
+        session, AuthProviderEnum.OTP, phone_number, User.phone_number,
+        User(phone_number=phone_number, is_phone_verified=True),
+    )
     return create_auth_response(user)
 
-def verify_google_token(token: str):
+async def verify_google_token(token: str):
+    # Verified locally; Google's signing keys are cached and refreshed in the background
     try:
-        id_info = id_token.verify_oauth2_token(token, requests.Request(), settings.GOOGLE_CLIENT_ID)
-        return id_info
-    except ValueError as e:
+        return await google_verifier.verify(token)
+    except JWTError as e:
         raise HTTPException(status_code=400, detail=f"Invalid Google token: {str(e)}")
+    except httpx.HTTPError:
+        raise HTTPException(status_code=503, detail="Google sign-in is temporarily unavailable")
 
 def create_auth_response(user: User) -> AuthResponse:
     token_payload = {
@@ -154,61 +169,21 @@ def create_auth_response(user: User) -> AuthResponse:
         )
     )
 
-def authenticate_google_user(session: Session, token: str) -> AuthResponse:
-    id_info = verify_google_token(token)
-    
-    google_user_id = id_info['sub']
-    email = id_info.get('email')
-    name = id_info.get('name')
-    picture = id_info.get('picture')
-
-    # 1. Check if auth_provider exists
-    statement = select(AuthProvider).where(
-        AuthProvider.provider == AuthProviderEnum.GOOGLE,
-        AuthProvider.provider_uid == google_user_id
-    )
-    existing_auth_provider = session.exec(statement).first()
-
-    if existing_auth_provider:
-        user = session.get(User, existing_auth_provider.user_id)
-        return create_auth_response(user)
-
-    # 2. Check if user exists by email (Link account)
-    statement = select(User).where(User.email == email)
-    existing_user = session.exec(statement).first()
-    
-    if existing_user:
-        new_auth_provider = AuthProvider(
-            user_id=existing_user.id,
-            provider=AuthProviderEnum.GOOGLE,
-            provider_uid=google_user_id
-        )
-        session.add(new_auth_provider)
-        session.commit()
-        
-        return create_auth_response(existing_user)
-
-    # 3. Register new user
-    new_user = User(
-        email=email,
-        full_name=name,
-        avatar_url=picture,
-        is_email_verified=True
-    )
-    session.add(new_user)
-    session.commit()
-    session.refresh(new_user)
+async def authenticate_google_user(session: AsyncSession, token: str) -> AuthResponse:
+    id_info = await verify_google_token(token)
     
-    new_auth_provider = AuthProvider(
-        user_id=new_user.id,
-        provider=AuthProviderEnum.GOOGLE,
-        provider_uid=google_user_id
+    # Linked by Google account first, then by email address
+    user = await resolve_user(
+        session, AuthProviderEnum.GOOGLE, id_info['sub'], User.email,
+        User(
+            email=id_info.get('email'),
+            full_name=id_info.get('name'),
+            avatar_url=id_info.get('picture'),
+            is_email_verified=True
+        ),
     )
-    session.add(new_auth_provider)
-    session.commit()
-    
-    return create_auth_response(new_user)
+    return create_auth_response(user)
 
 def logout_user(token: str):
-    token_blacklist.add(token)
+    revoke_token(token)
     return {"message": "Successfully logged out"}
@@ -0,0 +1,130 @@
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import column, delete, exists, true, tuple_, values
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from app.core.pagination import paginate_query
+from app.models.sitter import SitterProfile, SitterAvailability, SitterBlackoutDate
+
+ANY_SLOT = "*"
+
+# Profile columns the normalized availability rows are derived from
+AVAILABILITY_FIELDS = ("available_days", "available_time_slots", "blackout_dates")
+
+_WEEKDAYS = {
+    "mon": 0, "tue": 1, "wed": 2, "thu": 3, "fri": 4, "sat": 5, "sun": 6,
+}
+
+
+def parse_weekday(value) -> Optional[int]:
+    if isinstance(value, int):
+        return value if 0 <= value <= 6 else None
+    text = str(value).strip().lower()
+    if text.isdigit():
+        return parse_weekday(int(text))
+    return _WEEKDAYS.get(text[:3])
+
+
+def _slot_names(value) -> List[str]:
+    # Slots may be given as ["morning", ...], {"morning": true, ...} or a bare string
+    if isinstance(value, dict):
+        return [str(k).strip().lower() for k, enabled in value.items() if enabled]
+    if isinstance(value, (list, tuple, set)):
+        return [str(v).strip().lower() for v in value if v]
+    if isinstance(value, str) and value:
+        return [value.strip().lower()]
+    return []
+
+
+def availability_rows(available_days: Iterable, available_time_slots: Optional[Dict]) -> Set[Tuple[int, str]]:
+    """Flatten the profile's availability fields into (weekday, time_slot) pairs.
+
+    available_time_slots is either keyed by weekday ({"monday": ["morning"]}) or by
+    slot name ({"morning": true}), in which case the slots apply to every available day.
+    """
+    days = {d for d in (parse_weekday(day) for day in available_days or []) if d is not None}
+    per_day: Dict[int, List[str]] = {}
+    shared: List[str] = []
+    for key, value in (available_time_slots or {}).items():
+        weekday = parse_weekday(key)
+        if weekday is not None:
+            per_day[weekday] = _slot_names(value)
+            days.add(weekday)
+        elif value:
+            shared.append(str(key).strip().lower())
+
+    rows = set()
+    for weekday in days:
+        slots = per_day.get(weekday) or shared or [ANY_SLOT]
+        for slot in slots:
+            rows.add((weekday, slot))
+    return rows
+
+
+async def sync_availability(session: AsyncSession, profile: SitterProfile):
+    """Rewrite the normalized availability rows for ``profile`` in the current transaction."""
+    await session.execute(delete(SitterAvailability).where(SitterAvailability.sitter_id == profile.id))
+    await session.execute(delete(SitterBlackoutDate).where(SitterBlackoutDate.sitter_id == profile.id))
+    for weekday, slot in availability_rows(profile.available_days, profile.available_time_slots):
+        session.add(SitterAvailability(sitter_id=profile.id, weekday=weekday, time_slot=slot))
+    for blackout_date in set(profile.blackout_dates or []):
+        session.add(SitterBlackoutDate(sitter_id=profile.id, blackout_date=blackout_date))
+
+
+def availability_upserts(sitter, available_days: Iterable, available_time_slots: Optional[Dict], blackout_dates: Iterable):
+    """Data-modifying CTEs doing what sync_availability does, for the sitter id ``sitter`` returns.
+
+    ``sitter`` is a CTE returning the profile row being written, so the rewrite joins
+    the profile upsert's statement. Rows that no longer apply are deleted and new ones
+    inserted; the two never touch the same key, so they can run in one statement.
+    """
+    sitter_id = select(sitter.c.id).scalar_subquery()
+    ctes = []
+    for model, key_names, keys in (
+        (SitterAvailability, ("weekday", "time_slot"), sorted(availability_rows(available_days, available_time_slots))),
+        (SitterBlackoutDate, ("blackout_date",), sorted({(day,) for day in blackout_dates or []})),
+    ):
+        table = model.__table__
+        key_columns = [table.c[name] for name in key_names]
+        stale = delete(table).where(table.c.sitter_id == sitter_id)
+        if keys:
+            stale = stale.where(tuple_(*key_columns).not_in(keys))
+            rows = values(*[column(c.name, c.type) for c in key_columns], name=f"{table.name}_rows").data(keys)
+            source = select(sitter.c.id, *rows.c).select_from(sitter.join(rows, true()))
+            inserted = pg_insert(table).from_select(["sitter_id", *key_names], source)
+            ctes.append(inserted.on_conflict_do_nothing().cte(f"{table.name}_inserted"))
+        ctes.append(stale.cte(f"{table.name}_deleted"))
+    return ctes
+
+
+def available_sitters_query(start_date: date, end_date: date, time_slot: Optional[str] = None):
+    """Select sitter ids free on every day of [start_date, end_date], optionally in ``time_slot``.
+
+    Sitters are walked in id order and each one's availability and blackout rows are
+    probed by primary key, so a page stops after ``limit`` matches instead of first
+    collecting every sitter free that week; its cost doesn't grow with the sitter count.
+    """
+    span = (end_date - start_date).days + 1
+    weekdays = sorted({(start_date + timedelta(days=i)).weekday() for i in range(min(span, 7))})
+
+    def works_on(weekday: int):
+        conditions = [SitterAvailability.sitter_id == SitterProfile.id, SitterAvailability.weekday == weekday]
+        if time_slot:
+            conditions.append(SitterAvailability.time_slot.in_([time_slot.strip().lower(), ANY_SLOT]))
+        return exists().where(*conditions)
+
+    blacked_out = exists().where(
+        SitterBlackoutDate.sitter_id == SitterProfile.id,
+        SitterBlackoutDate.blackout_date >= start_date,
+        SitterBlackoutDate.blackout_date <= end_date,
+    )
+    return select(SitterProfile.id).where(*[works_on(weekday) for weekday in weekdays], ~blacked_out)
+
+
+async def find_available_sitters(session: AsyncSession, start_date: date, end_date: date, time_slot: Optional[str], limit: int, cursor: Optional[str] = None) -> Tuple[List, Optional[str]]:
+    statement = available_sitters_query(start_date, end_date, time_slot)
+    rows, next_cursor = await paginate_query(
+        session, statement, "availability", [SitterProfile.id], False, cursor, limit
+    )
+    return [row.id for row in rows], next_cursor
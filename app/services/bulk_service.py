@@ -0,0 +1,146 @@
+import io
+from typing import IO, Iterator, List
+from sqlalchemy import delete, insert, select, text
+from app.db.session import engine
+from app.models.sitter import (
+    SitterProfile, SitterAvailability, SitterBlackoutDate, SitterReview, SITTER_SERVICE_DETAILS
+)
+from app.services.availability_service import availability_rows
+from app.services.search_service import search_index_upsert
+
+# Tables holding source data. Projections (sitter_search_index, availability) are
+# rebuilt from sitter_profiles on import rather than exported; review totals travel
+# with sitter_profiles.
+BULK_TABLES = {
+    table.name: table
+    for table in [
+        SitterProfile.__table__,
+        *(model.__table__ for _, model in SITTER_SERVICE_DETAILS.values()),
+        SitterReview.__table__,
+    ]
+}
+
+BULK_FORMATS = ("csv", "ndjson")
+
+# One JSON document per line: with a control-character quote and delimiter, CSV mode
+# never quotes or splits the document, since row_to_json escapes control characters.
+_NDJSON_COPY_OPTIONS = "FORMAT csv, QUOTE E'\\x01', DELIMITER E'\\x02'"
+
+def export_table(table_name: str, out: IO[str], fmt: str = "csv") -> int:
+    """Stream a table to ``out`` with COPY ... TO STDOUT; memory use doesn't grow with the table."""
+    table = BULK_TABLES[table_name]
+    # The model's columns, not *: legacy columns kept for a rolling deploy aren't exported
+    names = ", ".join(f'"{column.name}"' for column in table.columns)
+    if fmt == "csv":
+        statement = f"COPY {table.name} ({names}) TO STDOUT WITH (FORMAT csv, HEADER)"
+    else:
+        statement = f"COPY (SELECT row_to_json(t) FROM (SELECT {names} FROM {table.name}) t) TO STDOUT WITH ({_NDJSON_COPY_OPTIONS})"
+    connection = engine.raw_connection()
+    try:
+        with connection.cursor() as cursor:
+            cursor.copy_expert(statement, out)
+            return cursor.rowcount
+    finally:
+        connection.close()
+
+def _csv_records(lines: Iterator[str]) -> Iterator[str]:
+    # A quoted field may span lines; a record ends where its quote count is even
+    # (COPY escapes quotes by doubling them). Kept raw, so NULL and "" stay distinct.
+    record = ""
+    for line in lines:
+        record += line
+        if record.count('"') % 2 == 0:
+            yield record
+            record = ""
+    if record:
+        yield record
+
+def _batches(records: Iterator[str], batch_size: int) -> Iterator[io.StringIO]:
+    buffer = io.StringIO()
+    count = 0
+    for record in records:
+        buffer.write(record if record.endswith("\n") else record + "\n")
+        count += 1
+        if count == batch_size:
+            buffer.seek(0)
+            yield buffer
+            buffer = io.StringIO()
+            count = 0
+    if count:
+        buffer.seek(0)
+        yield buffer
+
+def _refresh_profile_projections(conn, profile_ids: List):
+    # What upsert_section keeps in step on every write: the search projection and availability rows
+    profiles = SitterProfile.__table__
+    conn.execute(search_index_upsert(profiles, profiles.c.id.in_(profile_ids)))
+    conn.execute(delete(SitterAvailability.__table__).where(SitterAvailability.__table__.c.sitter_id.in_(profile_ids)))
+    conn.execute(delete(SitterBlackoutDate.__table__).where(SitterBlackoutDate.__table__.c.sitter_id.in_(profile_ids)))
+    rows = conn.execute(
+        select(profiles.c.id, profiles.c.available_days, profiles.c.available_time_slots, profiles.c.blackout_dates)
+        .where(profiles.c.id.in_(profile_ids))
+    ).all()
+    availability_data = []
+    blackout_data = []
+    for row in rows:
+        for weekday, slot in availability_rows(row.available_days, row.available_time_slots):
+            availability_data.append({"sitter_id": row.id, "weekday": weekday, "time_slot": slot})
+        for blackout_date in set(row.blackout_dates or []):
+            blackout_data.append({"sitter_id": row.id, "blackout_date": blackout_date})
+    if availability_data:
+        conn.execute(insert(SitterAvailability.__table__), availability_data)
+    if blackout_data:
+        conn.execute(insert(SitterBlackoutDate.__table__), blackout_data)
+
+def import_table(table_name: str, source: IO[str], fmt: str = "csv", batch_size: int = 5000) -> int:
+    """Load a file written by export_table, one COPY FROM and commit per batch.
+
+    Each batch is copied into a temporary staging table and upserted on the primary
+    key, so re-running an import updates rows instead of failing on duplicates.
+    """
+    table = BULK_TABLES[table_name]
+    key_columns = [column.name for column in table.primary_key.columns]
+    key = ", ".join(key_columns)
+    if fmt == "csv":
+        header = source.readline().strip()
+        columns = [name.strip('"') for name in header.split(",")]
+        unknown = [name for name in columns if name not in table.c]
+        if unknown:
+            raise ValueError(f"Unknown columns for {table.name}: {', '.join(unknown)}")
+        names = ", ".join(columns)
+        create_staging = f"CREATE TEMP TABLE bulk_staging ON COMMIT DELETE ROWS AS SELECT {names} FROM {table.name} WITH NO DATA"
+        copy = f"COPY bulk_staging ({names}) FROM STDIN WITH (FORMAT csv)"
+        rows = f"SELECT {names} FROM bulk_staging"
+        records = _csv_records(source)
+    else:
+        columns = [column.name for column in table.columns]
+        names = ", ".join(columns)
+        create_staging = "CREATE TEMP TABLE bulk_staging (doc json) ON COMMIT DELETE ROWS"
+        copy = f"COPY bulk_staging (doc) FROM STDIN WITH ({_NDJSON_COPY_OPTIONS})"
+        records = (line for line in source if line.strip())
+        rows = f"SELECT {', '.join('r.' + name for name in columns)} FROM bulk_staging, json_populate_record(NULL::{table.name}, doc) r"
+
+    updates = ", ".join(f"{name} = EXCLUDED.{name}" for name in columns if name not in key_columns)
+    upsert = text(
+        f"INSERT INTO {table.name} ({names}) {rows} "
+        f"ON CONFLICT ({key}) DO {'UPDATE SET ' + updates if updates else 'NOTHING'} "
+        f"RETURNING {key_columns[0]}"
+    )
+
+    imported = 0
+    with engine.connect() as conn:
+        cursor = conn.connection.dbapi_connection.cursor()
+        conn.execute(text("DROP TABLE IF EXISTS bulk_staging"))
+        conn.execute(text(create_staging))
+        conn.commit()
+        for batch in _batches(records, batch_size):
+            cursor.copy_expert(copy, batch)
+            ids = conn.execute(upsert).scalars().all()
+            if table is SitterProfile.__table__:
+                _refresh_profile_projections(conn, ids)
+            conn.commit()
+            imported += len(ids)
+        cursor.close()
+        conn.execute(text("DROP TABLE bulk_staging"))
+        conn.commit()
+    return imported
@@ -1,26 +1,198 @@
-from fastapi_mail import FastMail, MessageSchema, ConnectionConfig, MessageType
+import asyncio
+import logging
+import time
+from email.message import EmailMessage
+from typing import Dict, List, Optional, Tuple
+import aiosmtplib
+from fastapi import HTTPException
 from app.core.config import settings
-from pydantic import EmailStr
-
-conf = ConnectionConfig(
-    MAIL_USERNAME=settings.MAIL_USERNAME,
-    MAIL_PASSWORD=settings.MAIL_PASSWORD,
-    MAIL_FROM=settings.MAIL_FROM,
-    MAIL_PORT=settings.MAIL_PORT,
-    MAIL_SERVER=settings.MAIL_SERVER,
-    MAIL_STARTTLS=settings.MAIL_STARTTLS,
-    MAIL_SSL_TLS=settings.MAIL_SSL_TLS,
-    USE_CREDENTIALS=True,
-    VALIDATE_CERTS=True
+
+logger = logging.getLogger(__name__)
+
+MailItem = Tuple[EmailMessage, float, int]
+
+
+def is_transient(error: Exception) -> bool:
+    """Whether the same message may go through later: a 4xx reply or connection trouble.
+
+    5xx replies and refused recipients fail the same way on every attempt.
+    """
+    if isinstance(error, aiosmtplib.SMTPResponseException):
+        return 400 <= error.code < 500
+    # SMTPServerDisconnected, SMTPConnectError and the SMTP timeouts are OSErrors too
+    return isinstance(error, OSError)
+
+
+class MailQueue:
+    """Outbound mail, sent in the background over one long-lived SMTP connection.
+
+    Requests only enqueue. A worker task drains the queue in batches of up to
+    ``batch_size`` over the same connection, reconnecting when the server has dropped
+    it and closing it after ``idle_seconds`` without mail. Sends that failed for a
+    transient reason are re-queued with exponential backoff, up to ``max_retries``
+    times; permanent rejections are dropped at once. ``stop`` puts mail waiting on a
+    backoff back in the queue so it is flushed with the rest. The queue is per worker
+    and in memory, so mail still queued when a worker dies is lost; OTP mail expires
+    within minutes anyway.
+    """
+
+    def __init__(self, max_size: int, batch_size: int, max_retries: int, retry_backoff_seconds: float, idle_seconds: float):
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self.idle_seconds = idle_seconds
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._smtp: Optional[aiosmtplib.SMTP] = None
+        # id of the item -> (timer that re-queues it, item), for mail waiting on a backoff
+        self._retrying: Dict[int, Tuple[asyncio.TimerHandle, MailItem]] = {}
+        self._stopping = False
+        self.sent = 0
+        self.failed = 0
+        self.retries = 0
+        self.total_send_seconds = 0.0
+        self.max_send_seconds = 0.0
+        self.total_wait_seconds = 0.0
+
+    def enqueue(self, message: EmailMessage):
+        if self._task is None:
+            self._queue = asyncio.Queue(self.max_size)
+            self._task = asyncio.create_task(self._run())
+        try:
+            self._queue.put_nowait((message, time.monotonic(), 0))
+        except asyncio.QueueFull:
+            raise HTTPException(status_code=503, detail="Too many emails pending, try again shortly")
+
+    async def _connection(self) -> aiosmtplib.SMTP:
+        if self._smtp is None or not self._smtp.is_connected:
+            smtp = aiosmtplib.SMTP(
+                hostname=settings.MAIL_SERVER,
+                port=settings.MAIL_PORT,
+                use_tls=settings.MAIL_SSL_TLS,
+                start_tls=settings.MAIL_STARTTLS,
+                timeout=settings.MAIL_TIMEOUT_SECONDS,
+            )
+            await smtp.connect()
+            if settings.MAIL_USERNAME:
+                await smtp.login(settings.MAIL_USERNAME, settings.MAIL_PASSWORD)
+            self._smtp = smtp
+        return self._smtp
+
+    async def _disconnect(self):
+        smtp, self._smtp = self._smtp, None
+        if smtp is not None and smtp.is_connected:
+            try:
+                await smtp.quit()
+            except aiosmtplib.SMTPException:
+                smtp.close()
+
+    def _retry(self, item: MailItem):
+        self._retrying.pop(id(item), None)
+        try:
+            self._queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self.failed += 1
+            logger.error(f"Dropping email to {item[0]['To']}: queue is full")
+
+    async def _send(self, item: MailItem):
+        message, queued_at, attempt = item
+        start = time.monotonic()
+        try:
+            await (await self._connection()).send_message(message)
+        except (aiosmtplib.SMTPException, OSError) as e:
+            # The connection may be half-dead; the next send opens a fresh one
+            await self._disconnect()
+            if not is_transient(e) or attempt >= self.max_retries:
+                self.failed += 1
+                logger.error(f"Giving up on email to {message['To']} after {attempt + 1} attempts: {e}")
+                return
+            self.retries += 1
+            retry = (message, queued_at, attempt + 1)
+            if self._stopping:
+                # No time left for a backoff; try again within the shutdown flush
+                self._retry(retry)
+                return
+            delay = self.retry_backoff_seconds * 2 ** attempt
+            self._retrying[id(retry)] = (asyncio.get_running_loop().call_later(delay, self._retry, retry), retry)
+            logger.warning(f"Email to {message['To']} failed, retrying in {delay:.1f}s: {e}")
+            return
+        elapsed = time.monotonic() - start
+        self.sent += 1
+        self.total_send_seconds += elapsed
+        self.max_send_seconds = max(self.max_send_seconds, elapsed)
+        self.total_wait_seconds += start - queued_at
+
+    async def _run(self):
+        while True:
+            try:
+                item = await asyncio.wait_for(self._queue.get(), self.idle_seconds)
+            except asyncio.TimeoutError:
+                await self._disconnect()
+                continue
+            batch = [item]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            for item in batch:
+                try:
+                    await self._send(item)
+                except Exception:
+                    self.failed += 1
+                    logger.exception(f"Unexpected error sending email to {item[0]['To']}")
+                finally:
+                    self._queue.task_done()
+
+    async def stop(self, timeout: float = 10):
+        """Give queued mail ``timeout`` seconds to go out, then close the connection."""
+        if self._task is None:
+            return
+        self._stopping = True
+        for handle, item in list(self._retrying.values()):
+            handle.cancel()
+            self._retry(item)
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Shutting down with {self._queue.qsize()} emails unsent")
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._stopping = False
+        await self._disconnect()
+
+    def snapshot(self) -> Dict:
+        sends = self.sent or 1
+        return {
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "retrying": len(self._retrying),
+            "sent": self.sent,
+            "failed": self.failed,
+            "retries": self.retries,
+            "avg_send_ms": round(self.total_send_seconds / sends * 1000, 3),
+            "max_send_ms": round(self.max_send_seconds * 1000, 3),
+            "avg_queue_wait_ms": round(self.total_wait_seconds / sends * 1000, 3),
+        }
+
+
+mail_queue = MailQueue(
+    max_size=settings.MAIL_QUEUE_SIZE,
+    batch_size=settings.MAIL_BATCH_SIZE,
+    max_retries=settings.MAIL_MAX_RETRIES,
+    retry_backoff_seconds=settings.MAIL_RETRY_BACKOFF_SECONDS,
+    idle_seconds=settings.MAIL_IDLE_SECONDS,
 )
 
-async def send_otp_email(email: EmailStr, otp: str):
-    message = MessageSchema(
-        subject="Your Wagy Login OTP",
-        recipients=[email],
-        body=f"Your OTP code is: {otp}",
-        subtype=MessageType.html
-    )
-    
-    fm = FastMail(conf)
-    await fm.send_message(message)
+def build_message(recipients: List[str], subject: str, html: str) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = settings.MAIL_FROM
+    message["To"] = ", ".join(recipients)
+    message["Subject"] = subject
+    message.set_content(html, subtype="html")
+    return message
+
+def send_otp_email(email: str, otp: str):
+    # Returns once queued; delivery happens in the background
+    mail_queue.enqueue(build_message([email], "Your Wagy Login OTP", f"Your OTP code is: {otp}"))
@@ -0,0 +1,216 @@
+import asyncio
+import threading
+import time
+from datetime import datetime, timedelta
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+from uuid import UUID
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.config import settings
+from app.models.sitter import SitterProfile, SITTER_SERVICE_DETAILS
+
+# Boolean columns: one bitmap holding the profiles where the flag is true
+BOOLEAN_FACETS = (
+    "is_boarding_supported",
+    "is_house_sitting_supported",
+    "is_drop_in_supported",
+    "is_dog_walking_supported",
+    "is_day_care_supported",
+    "id_verified",
+    "is_phone_verified",
+    "first_aid_certified",
+    "puppy_experience",
+    "senior_pet_experience",
+    "medication_experience",
+    "fenced_yard",
+    "pets_in_home",
+    "children_in_home",
+    "smoking_home",
+    "crate_available",
+    "cameras_in_home",
+    "boarding_overnight_supervision",
+    "walking_gps_tracking",
+    "training_off_leash",
+    "insurance_status",
+)
+
+# ARRAY(String) and enum columns: one bitmap per distinct value
+VALUE_FACETS = (
+    "pet_experience_types",
+    "size_experience",
+    "breeds_experience",
+    "behavioral_experience",
+    "boarding_allowed_pet_types",
+    "training_types",
+    "available_days",
+    "home_type",
+    "yard_size",
+)
+
+FACETS = BOOLEAN_FACETS + VALUE_FACETS
+
+# Facets stored on a service detail table rather than on sitter_profiles
+_DETAIL_FACETS = {
+    name: model
+    for _, model in SITTER_SERVICE_DETAILS.values()
+    for name in FACETS
+    if name in model.__table__.c
+}
+
+# Rows edited by other workers are picked up by re-reading anything updated
+# since the last sync; the overlap absorbs clock skew between workers.
+SYNC_OVERLAP = timedelta(seconds=5)
+
+FacetKey = Tuple[str, str]
+
+
+def _normalize(value) -> str:
+    if isinstance(value, Enum):
+        value = value.value
+    return str(value).strip().lower()
+
+
+def _facet_keys(fields: Mapping[str, Any]) -> Set[FacetKey]:
+    keys = set()
+    for name in BOOLEAN_FACETS:
+        if fields.get(name):
+            keys.add((name, "true"))
+    for name in VALUE_FACETS:
+        value = fields.get(name)
+        if value is None:
+            continue
+        values = value if isinstance(value, (list, tuple)) else [value]
+        for item in values:
+            if item is not None and item != "":
+                keys.add((name, _normalize(item)))
+    return keys
+
+
+def _profile_keys(row) -> Set[FacetKey]:
+    return _facet_keys({name: getattr(row, name) for name in FACETS})
+
+
+class FacetIndex:
+    """In-process bitmap index over the sitter facet columns.
+
+    Every profile gets a slot number; each (facet, value) pair maps to a Python
+    int used as a bitset over those slots. Filters are bitwise AND/OR over a
+    handful of ints and facet counts are popcounts, so neither touches the database.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._slots: Dict[UUID, int] = {}
+        self._ids: List[UUID] = []
+        self._keys: List[Set[FacetKey]] = []
+        self._bitmaps: Dict[FacetKey, int] = {}
+        self._built = False
+        self._synced_at: Optional[datetime] = None
+        self._checked_at = 0.0
+        self._load_lock: Optional[asyncio.Lock] = None
+
+    def _apply(self, profile_id: UUID, keys: Set[FacetKey]):
+        slot = self._slots.get(profile_id)
+        if slot is None:
+            slot = len(self._ids)
+            self._slots[profile_id] = slot
+            self._ids.append(profile_id)
+            self._keys.append(set())
+        bit = 1 << slot
+        old_keys = self._keys[slot]
+        for key in old_keys - keys:
+            self._bitmaps[key] &= ~bit
+        for key in keys - old_keys:
+            self._bitmaps[key] = self._bitmaps.get(key, 0) | bit
+        self._keys[slot] = keys
+
+    def update_profile(self, profile: SitterProfile):
+        # Detail-table facets keep their bits; writes to those go through update_values
+        self.update_values(profile.id, {name: getattr(profile, name) for name in FACETS if name not in _DETAIL_FACETS})
+
+    def update_values(self, profile_id: UUID, values: Mapping[str, Any]):
+        """Apply a partial write: only the facets present in ``values`` change."""
+        names = {name for name in FACETS if name in values}
+        if not names:
+            return
+        keys = _facet_keys({name: values[name] for name in names})
+        with self._lock:
+            slot = self._slots.get(profile_id)
+            old_keys = self._keys[slot] if slot is not None else set()
+            self._apply(profile_id, {key for key in old_keys if key[0] not in names} | keys)
+
+    async def _load(self, session: AsyncSession, since: Optional[datetime]):
+        columns = [getattr(_DETAIL_FACETS.get(name, SitterProfile), name) for name in FACETS]
+        statement = select(SitterProfile.id, SitterProfile.updated_at, *columns)
+        for model in dict.fromkeys(_DETAIL_FACETS.values()):
+            statement = statement.outerjoin(model, model.sitter_id == SitterProfile.id)
+        if since is not None:
+            statement = statement.where(SitterProfile.updated_at >= since - SYNC_OVERLAP)
+        rows = (await session.exec(statement)).all()
+        with self._lock:
+            for row in rows:
+                self._apply(row.id, _profile_keys(row))
+                if self._synced_at is None or row.updated_at > self._synced_at:
+                    self._synced_at = row.updated_at
+            self._built = True
+            self._checked_at = time.monotonic()
+
+    def _stale(self) -> bool:
+        return not self._built or time.monotonic() - self._checked_at > settings.FACET_INDEX_REFRESH_SECONDS
+
+    async def ensure_fresh(self, session: AsyncSession):
+        if not self._stale():
+            return
+        if self._load_lock is None:
+            self._load_lock = asyncio.Lock()
+        # Single flight: requests arriving during a load wait for it instead of each
+        # running their own, then find the index fresh
+        async with self._load_lock:
+            if not self._built:
+                await self._load(session, None)
+            elif self._stale():
+                await self._load(session, self._synced_at)
+
+    def match(self, filters: Dict[str, List[str]]) -> int:
+        """Bitset of profiles matching ``filters``: AND across facets, OR within one."""
+        with self._lock:
+            result = (1 << len(self._ids)) - 1
+            for name, values in filters.items():
+                if name in BOOLEAN_FACETS:
+                    flag = self._bitmaps.get((name, "true"), 0)
+                    facet_bits = 0
+                    for value in values:
+                        facet_bits |= flag if _normalize(value) in ("true", "1") else result & ~flag
+                else:
+                    facet_bits = 0
+                    for value in values:
+                        facet_bits |= self._bitmaps.get((name, _normalize(value)), 0)
+                result &= facet_bits
+            return result
+
+    def contains(self, bits: int, profile_id: UUID) -> bool:
+        slot = self._slots.get(profile_id)
+        return slot is not None and bool(bits >> slot & 1)
+
+    def profile_ids(self, bits: int, limit: Optional[int] = None) -> List[UUID]:
+        ids = []
+        while bits and (limit is None or len(ids) < limit):
+            low = bits & -bits
+            ids.append(self._ids[low.bit_length() - 1])
+            bits ^= low
+        return ids
+
+    def counts(self, bits: int, facets: Iterable[str] = FACETS) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            counts: Dict[str, Dict[str, int]] = {}
+            for (name, value), bitmap in self._bitmaps.items():
+                if name not in facets:
+                    continue
+                count = (bitmap & bits).bit_count()
+                if count:
+                    counts.setdefault(name, {})[value] = count
+            return counts
+
+
+facet_index = FacetIndex()
@@ -0,0 +1,143 @@
+import asyncio
+import logging
+import re
+import time
+from typing import Dict, Optional
+import httpx
+from jose import JWTError, jwk, jwt
+from jose.exceptions import JWKError
+from jose.backends.base import Key
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_ISSUERS = ["accounts.google.com", "https://accounts.google.com"]
+
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+def cache_lifetime(headers: httpx.Headers, default: float) -> float:
+    """Seconds a JWKS response stays fresh: Cache-Control max-age less the Age it already has."""
+    match = _MAX_AGE.search(headers.get("cache-control", ""))
+    if not match:
+        return default
+    return max(int(match.group(1)) - int(headers.get("age", 0) or 0), 0)
+
+
+class GoogleTokenVerifier:
+    """Verifies Google ID tokens locally against a cached copy of Google's signing keys.
+
+    The JWKS document is fetched once and kept for as long as its Cache-Control allows;
+    a background task (see ``start``) fetches the next copy shortly before that, so a
+    login normally makes no network call. Without the task, or when a token is signed
+    with a key not seen yet (Google rotated), the keys are fetched inline, at most once
+    per ``min_refresh_seconds``. If Google can't be reached the previous keys keep
+    being used.
+    """
+
+    def __init__(
+        self,
+        jwks_url: str,
+        audience: Optional[str],
+        issuers=GOOGLE_ISSUERS,
+        refresh_margin_seconds: float = 300,
+        min_refresh_seconds: float = 30,
+        default_max_age: float = 3600,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.jwks_url = jwks_url
+        self.audience = audience
+        self.issuers = issuers
+        self.refresh_margin_seconds = refresh_margin_seconds
+        self.min_refresh_seconds = min_refresh_seconds
+        self.default_max_age = default_max_age
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._keys: Dict[str, Key] = {}
+        self._expires_at = 0.0
+        self._attempted_at = float("-inf")
+        self._lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def refresh(self, if_older_than: float = 0):
+        """Fetch the keys, unless a fetch was tried within ``if_older_than`` seconds.
+
+        Failed fetches count too, so an outage doesn't put a request timeout on every login.
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if time.monotonic() - self._attempted_at < if_older_than:
+                return
+            self._attempted_at = time.monotonic()
+            if self._client is None:
+                self._client = httpx.AsyncClient(timeout=10.0, transport=self._transport)
+            response = await self._client.get(self.jwks_url)
+            response.raise_for_status()
+            # Parsed once here rather than by every jwt.decode
+            keys = {key["kid"]: jwk.construct(key, key.get("alg", "RS256")) for key in response.json()["keys"]}
+            now = time.monotonic()
+            self._keys = keys
+            self._expires_at = now + cache_lifetime(response.headers, self.default_max_age)
+
+    async def _key(self, kid: Optional[str]) -> Optional[Key]:
+        now = time.monotonic()
+        if kid in self._keys and now < self._expires_at:
+            return self._keys[kid]
+        try:
+            await self.refresh(if_older_than=self.min_refresh_seconds)
+        except (httpx.HTTPError, ValueError, KeyError, JWKError) as e:
+            if not self._keys:
+                raise
+            logger.warning(f"Google JWKS refresh failed, using keys fetched earlier: {e}")
+        return self._keys.get(kid)
+
+    async def verify(self, token: str) -> dict:
+        """Claims of a valid ID token for this app's client ID.
+
+        Raises JWTError for an invalid token, httpx.HTTPError if no keys could be fetched.
+        """
+        key = await self._key(jwt.get_unverified_header(token).get("kid"))
+        if key is None:
+            raise JWTError("Token signed with an unknown key")
+        return jwt.decode(
+            token,
+            key,
+            algorithms=["RS256"],
+            audience=self.audience,
+            issuer=self.issuers,
+            # Sign-in only sends the ID token, so there's no access token to check at_hash against
+            options={"verify_at_hash": False},
+        )
+
+    async def _refresh_loop(self):
+        while True:
+            try:
+                await self.refresh()
+                delay = self._expires_at - time.monotonic() - self.refresh_margin_seconds
+            except (httpx.HTTPError, ValueError, KeyError, JWKError) as e:
+                logger.warning(f"Google JWKS refresh failed: {e}")
+                delay = 0
+            await asyncio.sleep(max(delay, self.min_refresh_seconds))
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+google_verifier = GoogleTokenVerifier(
+    settings.GOOGLE_JWKS_URL,
+    settings.GOOGLE_CLIENT_ID,
+    refresh_margin_seconds=settings.GOOGLE_JWKS_REFRESH_MARGIN_SECONDS,
+)
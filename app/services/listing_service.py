@@ -0,0 +1,40 @@
+from typing import Optional
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.pagination import paginate_query
+from app.models.sitter import SitterSearchIndex
+from app.schemas.sitter import SitterListItem, SitterListResponse, SitterSortOrder
+
+# sort order -> (sort column, descending); each pair is backed by an index on (column, id)
+SORT_COLUMNS = {
+    SitterSortOrder.RANK: (SitterSearchIndex.rank_score, True),
+    SitterSortOrder.RATING: (SitterSearchIndex.rating, True),
+    SitterSortOrder.PRICE: (SitterSearchIndex.base_price, False),
+    SitterSortOrder.NEWEST: (SitterSearchIndex.created_at, True),
+    SitterSortOrder.EXPERIENCE: (SitterSearchIndex.years_of_experience, True),
+}
+
+
+async def list_sitters(session: AsyncSession, sort: SitterSortOrder, cursor: Optional[str], limit: int) -> SitterListResponse:
+    sort_column, descending = SORT_COLUMNS[sort]
+    columns = [
+        SitterSearchIndex.id,
+        SitterSearchIndex.user_id,
+        SitterSearchIndex.full_name,
+        SitterSearchIndex.profile_photo,
+        SitterSearchIndex.headline,
+        SitterSearchIndex.city,
+        SitterSearchIndex.base_price,
+        SitterSearchIndex.rating,
+        SitterSearchIndex.rank_score,
+    ]
+    if not any(column is sort_column for column in columns):
+        columns.append(sort_column)
+    statement = select(*columns)
+    rows, next_cursor = await paginate_query(
+        session, statement, sort.value, [sort_column, SitterSearchIndex.id], descending, cursor, limit
+    )
+    return SitterListResponse(
+        items=[SitterListItem(**row._mapping) for row in rows],
+        next_cursor=next_cursor,
+    )
@@ -0,0 +1,187 @@
+import asyncio
+import random
+import threading
+import time
+from typing import Dict, List, Optional
+import httpx
+from app.core.config import settings
+
+# Errors raised before the request reached the gateway, so retrying can't send a second SMS
+_RETRYABLE_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+_RETRYABLE_STATUS = {502, 503, 504}
+
+
+class OTPGatewayError(Exception):
+    """The gateway couldn't be reached or kept failing after the retries."""
+
+
+class CircuitOpenError(OTPGatewayError):
+    """Calls are short-circuited while the gateway is considered down."""
+
+
+class CircuitBreaker:
+    """Opens after ``failure_threshold`` consecutive failed calls and rejects calls for
+    ``reset_seconds``; then one trial call is let through and decides whether it closes."""
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_running = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_seconds:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._trial_running:
+            self._trial_running = True
+            return True
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self._trial_running = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self._trial_running or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+        self._trial_running = False
+
+
+class GatewayCallStats:
+    """Latency and outcome of every HTTP attempt, per gateway operation."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._operations: Dict[str, Dict] = {}
+
+    def record(self, operation: str, seconds: float, failed: bool):
+        with self._lock:
+            stats = self._operations.setdefault(
+                operation, {"calls": 0, "failures": 0, "total_seconds": 0.0, "max_seconds": 0.0}
+            )
+            stats["calls"] += 1
+            stats["failures"] += failed
+            stats["total_seconds"] += seconds
+            stats["max_seconds"] = max(stats["max_seconds"], seconds)
+
+    def snapshot(self) -> List[Dict]:
+        with self._lock:
+            return [
+                {
+                    "operation": operation,
+                    "calls": stats["calls"],
+                    "failures": stats["failures"],
+                    "avg_latency_ms": round(stats["total_seconds"] / stats["calls"] * 1000, 3),
+                    "max_latency_ms": round(stats["max_seconds"] * 1000, 3),
+                }
+                for operation, stats in self._operations.items()
+            ]
+
+
+class OTPGatewayClient:
+    """Client for the mobile OTP gateway, shared by every request in the worker.
+
+    One keep-alive connection pool with explicit timeouts; attempts that fail before
+    reaching the gateway, or get a 502/503/504, are retried with full-jitter
+    exponential backoff. Calls that still fail count towards the circuit breaker,
+    which then fails fast instead of holding requests for the timeout.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        timeout: float,
+        connect_timeout: float,
+        retries: int,
+        backoff_seconds: float,
+        breaker: CircuitBreaker,
+        max_connections: int = 20,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.url = url
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.retries = retries
+        self.backoff_seconds = backoff_seconds
+        self.breaker = breaker
+        self.stats = GatewayCallStats()
+        self._limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _http(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=self.timeout, limits=self._limits, transport=self._transport)
+        return self._client
+
+    async def _attempts(self, operation: str, method: str, data: Dict) -> httpx.Response:
+        error: Exception
+        for attempt in range(self.retries + 1):
+            if attempt:
+                await asyncio.sleep(random.uniform(0, self.backoff_seconds * 2 ** (attempt - 1)))
+            start = time.perf_counter()
+            try:
+                response = await self._http().request(method, self.url, data=data)
+            except httpx.HTTPError as e:
+                self.stats.record(operation, time.perf_counter() - start, True)
+                error = e
+                if isinstance(e, _RETRYABLE_ERRORS):
+                    continue
+                break
+            failed = response.status_code >= 500
+            self.stats.record(operation, time.perf_counter() - start, failed)
+            if not failed:
+                return response
+            error = OTPGatewayError(f"OTP gateway returned {response.status_code}")
+            if response.status_code not in _RETRYABLE_STATUS:
+                break
+        raise OTPGatewayError(str(error) or type(error).__name__) from error
+
+    async def _call(self, operation: str, method: str, data: Dict) -> httpx.Response:
+        if not self.breaker.allow():
+            raise CircuitOpenError("OTP gateway is unavailable")
+        succeeded = False
+        try:
+            response = await self._attempts(operation, method, data)
+            succeeded = True
+            return response
+        finally:
+            # Any way out other than a response counts as a failure, cancellation
+            # included, so a half-open trial always settles the breaker
+            if succeeded:
+                self.breaker.record_success()
+            else:
+                self.breaker.record_failure()
+
+    async def send_code(self, phone_number: str) -> httpx.Response:
+        return await self._call("send_code", "POST", {"phoneNumber": phone_number})
+
+    async def verify_code(self, phone_number: str, code: str) -> bool:
+        response = await self._call("verify_code", "PUT", {"phoneNumber": phone_number, "code": code})
+        return response.status_code == 200
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+otp_gateway = OTPGatewayClient(
+    settings.MOBILE_OTP_URL,
+    timeout=settings.OTP_GATEWAY_TIMEOUT_SECONDS,
+    connect_timeout=settings.OTP_GATEWAY_CONNECT_TIMEOUT_SECONDS,
+    retries=settings.OTP_GATEWAY_RETRIES,
+    backoff_seconds=settings.OTP_GATEWAY_BACKOFF_SECONDS,
+    breaker=CircuitBreaker(settings.OTP_GATEWAY_BREAKER_THRESHOLD, settings.OTP_GATEWAY_BREAKER_RESET_SECONDS),
+)
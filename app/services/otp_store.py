@@ -0,0 +1,189 @@
+import enum
+import heapq
+import hmac
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from app.core.config import settings
+from app.core.shared_store import connect_redis, connect_sqlite, store_kind
+
+
+class OTPCheck(str, enum.Enum):
+    VERIFIED = "verified"
+    MISSING = "missing"
+    EXPIRED = "expired"
+    INVALID = "invalid"
+    TOO_MANY_ATTEMPTS = "too_many_attempts"
+
+
+def _check(stored_otp: str, otp: str, attempts: int, max_attempts: int) -> OTPCheck:
+    # ``attempts`` already counts this one
+    if attempts > max_attempts:
+        return OTPCheck.TOO_MANY_ATTEMPTS
+    if not hmac.compare_digest(stored_otp, otp):
+        return OTPCheck.INVALID
+    return OTPCheck.VERIFIED
+
+
+class MemoryOTPStore:
+    """OTPs held by this process only; for tests and single-worker development.
+
+    A heap ordered by expiry evicts codes that are never verified, and ``max_entries``
+    caps the store under request floods by dropping the codes closest to expiry.
+    """
+
+    def __init__(self, max_attempts: int, max_entries: int):
+        self.max_attempts = max_attempts
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # identity -> (otp, expires_at, attempts)
+        self._codes: Dict[str, Tuple[str, float, int]] = {}
+        self._expiry: List[Tuple[float, str]] = []
+
+    def _evict(self, now: float):
+        # Heap entries left behind by a reissued or consumed code are skipped
+        while self._expiry and (self._expiry[0][0] <= now or len(self._codes) > self.max_entries):
+            expires_at, identity = heapq.heappop(self._expiry)
+            entry = self._codes.get(identity)
+            if entry is not None and entry[1] == expires_at:
+                del self._codes[identity]
+
+    def issue(self, identity: str, otp: str, ttl: float):
+        now = time.time()
+        with self._lock:
+            self._codes[identity] = (otp, now + ttl, 0)
+            heapq.heappush(self._expiry, (now + ttl, identity))
+            self._evict(now)
+
+    def verify(self, identity: str, otp: str) -> OTPCheck:
+        now = time.time()
+        with self._lock:
+            # Checked before evicting, which would drop the code and report it missing
+            entry = self._codes.get(identity)
+            if entry is not None and entry[1] <= now:
+                del self._codes[identity]
+                return OTPCheck.EXPIRED
+            self._evict(now)
+            entry = self._codes.get(identity)
+            if entry is None:
+                return OTPCheck.MISSING
+            stored_otp, expires_at, attempts = entry
+            result = _check(stored_otp, otp, attempts + 1, self.max_attempts)
+            if result == OTPCheck.VERIFIED:
+                del self._codes[identity]
+            else:
+                self._codes[identity] = (stored_otp, expires_at, attempts + 1)
+            return result
+
+
+class SQLiteOTPStore:
+    """OTPs in a SQLite file shared by every worker on the host.
+
+    Expired rows are deleted oldest-first along the expires_at index on each issue, so
+    the table only holds codes that can still be verified.
+    """
+
+    def __init__(self, url: str, max_attempts: int):
+        self.url = url
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = connect_sqlite(self.url)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS otp_codes ("
+                "identity TEXT PRIMARY KEY, otp TEXT NOT NULL, expires_at REAL NOT NULL, attempts INTEGER NOT NULL DEFAULT 0)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_otp_codes_expires_at ON otp_codes (expires_at)")
+            self._conn = conn
+        return self._conn
+
+    def issue(self, identity: str, otp: str, ttl: float):
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute("DELETE FROM otp_codes WHERE expires_at <= ?", (now,))
+            conn.execute(
+                "INSERT INTO otp_codes (identity, otp, expires_at, attempts) VALUES (?, ?, ?, 0) "
+                "ON CONFLICT (identity) DO UPDATE SET otp = excluded.otp, expires_at = excluded.expires_at, attempts = 0",
+                (identity, otp, now + ttl),
+            )
+
+    def verify(self, identity: str, otp: str) -> OTPCheck:
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            # Counting the attempt and reading the code in one statement keeps the
+            # limit exact when workers verify the same identity concurrently
+            row = conn.execute(
+                "UPDATE otp_codes SET attempts = attempts + 1 WHERE identity = ? RETURNING otp, expires_at, attempts",
+                (identity,),
+            ).fetchone()
+            if row is None:
+                return OTPCheck.MISSING
+            stored_otp, expires_at, attempts = row
+            if expires_at <= now:
+                conn.execute("DELETE FROM otp_codes WHERE identity = ? AND expires_at = ?", (identity, expires_at))
+                return OTPCheck.EXPIRED
+            result = _check(stored_otp, otp, attempts, self.max_attempts)
+            if result == OTPCheck.VERIFIED:
+                # Only one concurrent verify of the same code deletes it
+                deleted = conn.execute(
+                    "DELETE FROM otp_codes WHERE identity = ? AND otp = ?", (identity, stored_otp)
+                ).rowcount
+                if not deleted:
+                    return OTPCheck.MISSING
+            return result
+
+
+# Count the attempt, check and consume in one step, so concurrent verifies from
+# different workers can neither exceed the limit nor both succeed
+_REDIS_VERIFY = """
+local otp = redis.call('HGET', KEYS[1], 'otp')
+if not otp then return 'missing' end
+local attempts = redis.call('HINCRBY', KEYS[1], 'attempts', 1)
+if attempts > tonumber(ARGV[2]) then return 'too_many_attempts' end
+if otp ~= ARGV[1] then return 'invalid' end
+redis.call('DEL', KEYS[1])
+return 'verified'
+"""
+
+
+class RedisOTPStore:
+    """OTPs in Redis hashes that Redis itself expires, for workers on several hosts."""
+
+    def __init__(self, url: str, max_attempts: int, prefix: str = "wagy:otp"):
+        self.max_attempts = max_attempts
+        self.prefix = prefix
+        self._redis = connect_redis(url)
+        self._verify = self._redis.register_script(_REDIS_VERIFY)
+
+    def _key(self, identity: str) -> str:
+        return f"{self.prefix}:{identity}"
+
+    def issue(self, identity: str, otp: str, ttl: float):
+        key = self._key(identity)
+        pipe = self._redis.pipeline()
+        # A new code starts a new attempt count
+        pipe.delete(key)
+        pipe.hset(key, mapping={"otp": otp, "attempts": 0})
+        pipe.pexpire(key, int(ttl * 1000))
+        pipe.execute()
+
+    def verify(self, identity: str, otp: str) -> OTPCheck:
+        return OTPCheck(self._verify(keys=[self._key(identity)], args=[otp, self.max_attempts]).decode())
+
+
+def store_from_url(url: str):
+    kind = store_kind(url)
+    if kind == "redis":
+        return RedisOTPStore(url, settings.OTP_MAX_ATTEMPTS)
+    if kind == "sqlite":
+        return SQLiteOTPStore(url, settings.OTP_MAX_ATTEMPTS)
+    return MemoryOTPStore(settings.OTP_MAX_ATTEMPTS, settings.OTP_MEMORY_MAX_ENTRIES)
+
+
+otp_store = store_from_url(settings.SHARED_STORE_URL)
@@ -0,0 +1,70 @@
+from datetime import timedelta
+from typing import List
+import numpy as np
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from fastapi import HTTPException
+from app.core.config import settings
+from app.models.sitter import SitterSearchIndex
+from app.schemas.quote import QuoteRequest, QuoteResponse, SitterQuote
+
+MAX_QUOTE_SITTERS = 500
+
+
+def _count_holiday_nights(data: QuoteRequest, nights: int) -> int:
+    stay = {data.start_date + timedelta(days=i) for i in range(nights)}
+    return len(stay.intersection(data.holidays))
+
+
+async def quote_stay(session: AsyncSession, data: QuoteRequest) -> QuoteResponse:
+    if data.end_date < data.start_date:
+        raise HTTPException(status_code=400, detail="end_date must not be before start_date")
+    if data.num_pets < 1:
+        raise HTTPException(status_code=400, detail="num_pets must be at least 1")
+    if len(data.sitter_ids) > MAX_QUOTE_SITTERS:
+        raise HTTPException(status_code=400, detail=f"Cannot quote more than {MAX_QUOTE_SITTERS} sitters at once")
+    if not data.sitter_ids:
+        return QuoteResponse(quotes=[])
+
+    # Same-day stays (drop-in, day care) are billed as one unit
+    nights = max((data.end_date - data.start_date).days, 1)
+    holiday_nights = _count_holiday_nights(data, nights)
+    regular_nights = nights - holiday_nights
+
+    statement = select(
+        SitterSearchIndex.id,
+        SitterSearchIndex.base_price,
+        SitterSearchIndex.additional_pet_price,
+        SitterSearchIndex.puppy_rate,
+        SitterSearchIndex.holiday_rate,
+        SitterSearchIndex.long_stay_discount,
+    ).where(SitterSearchIndex.id.in_(data.sitter_ids))
+    rows = (await session.exec(statement)).all()
+    if not rows:
+        return QuoteResponse(quotes=[])
+
+    sitter_ids: List = [row.id for row in rows]
+    prices = np.array([row[1:] for row in rows], dtype=np.float64)
+    base, additional_pet, puppy, holiday, long_stay_discount = prices.T
+
+    # Every sitter is priced in one pass of array arithmetic
+    extras = additional_pet * (data.num_pets - 1) + puppy * float(data.has_puppy)
+    holiday_base = np.where(holiday > 0, holiday, base)
+    subtotal = regular_nights * (base + extras) + holiday_nights * (holiday_base + extras)
+    discount_pct = np.clip(long_stay_discount, 0, 100) if nights >= settings.LONG_STAY_NIGHTS else np.zeros_like(subtotal)
+    discount = np.round(subtotal * discount_pct / 100.0, 2)
+    subtotal = np.round(subtotal, 2)
+    total = subtotal - discount
+
+    quotes = [
+        SitterQuote(
+            sitter_id=sitter_id,
+            nights=nights,
+            holiday_nights=holiday_nights,
+            subtotal=float(subtotal[i]),
+            discount=float(discount[i]),
+            total=float(total[i]),
+        )
+        for i, sitter_id in enumerate(sitter_ids)
+    ]
+    return QuoteResponse(quotes=quotes)
@@ -0,0 +1,95 @@
+import math
+from typing import Optional
+from sqlmodel import Session, select
+from sqlalchemy import inspect, update, bindparam
+from app.models.sitter import SitterProfile, SitterSearchIndex
+
+RANK_INPUTS = (
+    "rating",
+    "completed_bookings",
+    "repeat_clients",
+    "cancellation_rate",
+    "response_time_minutes",
+)
+
+# Ratings are shrunk towards this prior until a sitter has enough bookings,
+# so one 5-star stay doesn't outrank a long track record.
+PRIOR_RATING = 3.5
+PRIOR_WEIGHT = 5
+# Booking count at which the volume component saturates
+BOOKINGS_SATURATION = 100
+
+WEIGHTS = {
+    "rating": 0.45,
+    "volume": 0.20,
+    "repeat": 0.15,
+    "reliability": 0.10,
+    "responsiveness": 0.10,
+}
+
+
+def compute_rank_score(
+    rating: float,
+    completed_bookings: int,
+    repeat_clients: int,
+    cancellation_rate: float,
+    response_time_minutes: Optional[int],
+) -> float:
+    bookings = max(completed_bookings or 0, 0)
+    rating_component = ((rating or 0.0) * bookings + PRIOR_RATING * PRIOR_WEIGHT) / (bookings + PRIOR_WEIGHT) / 5.0
+    volume = min(math.log1p(bookings) / math.log1p(BOOKINGS_SATURATION), 1.0)
+    repeat = min((repeat_clients or 0) / bookings, 1.0) if bookings else 0.0
+    # cancellation_rate may be stored as a fraction or as a percentage
+    rate = cancellation_rate or 0.0
+    rate = rate / 100.0 if rate > 1 else rate
+    reliability = 1.0 - min(max(rate, 0.0), 1.0)
+    if response_time_minutes is None:
+        responsiveness = 0.5
+    else:
+        responsiveness = 1.0 / (1.0 + max(response_time_minutes, 0) / 60.0)
+
+    score = (
+        WEIGHTS["rating"] * rating_component
+        + WEIGHTS["volume"] * volume
+        + WEIGHTS["repeat"] * repeat
+        + WEIGHTS["reliability"] * reliability
+        + WEIGHTS["responsiveness"] * responsiveness
+    )
+    return round(score * 100, 4)
+
+
+def refresh_rank_score(profile: SitterProfile) -> bool:
+    """Recompute ``rank_score`` if any of its inputs changed since the row was loaded."""
+    state = inspect(profile)
+    if state.persistent and not any(state.attrs[name].history.has_changes() for name in RANK_INPUTS):
+        return False
+    profile.rank_score = compute_rank_score(*(getattr(profile, name) for name in RANK_INPUTS))
+    return True
+
+
+def backfill_rank_scores(session: Session, batch_size: int = 1000) -> int:
+    statements = [
+        update(table).where(table.c.id == bindparam("b_id")).values(rank_score=bindparam("b_rank_score"))
+        for table in (SitterProfile.__table__, SitterSearchIndex.__table__)
+    ]
+    columns = [getattr(SitterProfile, name) for name in RANK_INPUTS]
+    updated = 0
+    last_id = None
+    while True:
+        query = select(SitterProfile.id, *columns).order_by(SitterProfile.id).limit(batch_size)
+        if last_id is not None:
+            query = query.where(SitterProfile.id > last_id)
+        rows = session.exec(query).all()
+        if not rows:
+            break
+        params = [
+            {"b_id": row.id, "b_rank_score": compute_rank_score(*(getattr(row, name) for name in RANK_INPUTS))}
+            for row in rows
+        ]
+        for statement in statements:
+            session.execute(statement, params)
+        session.commit()
+        updated += len(rows)
+        last_id = rows[-1].id
+    return updated
+
@@ -0,0 +1,90 @@
+from typing import Optional
+from uuid import UUID
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import insert, literal, update
+from sqlalchemy.exc import IntegrityError
+from fastapi import HTTPException
+from app.core.pagination import paginate_query
+from app.db.session import record_write
+from app.models.sitter import SitterProfile, SitterReview
+from app.schemas.review import SitterReviewCreate, SitterReviewListResponse, SitterReviewResponse
+from app.services.ranking_service import RANK_INPUTS, compute_rank_score
+from app.services.search_service import search_index_upsert
+
+
+async def add_review(session: AsyncSession, sitter_id: UUID, author_id: UUID, data: SitterReviewCreate) -> SitterReviewResponse:
+    """Store a review and fold it into the sitter's rating without reading the other reviews.
+
+    One statement bumps rating_sum / review_count on the profile and inserts the review
+    from the same WITH; its row lock orders concurrent reviews of one sitter. A second
+    writes the rank_score derived from the new rating, plus the search projection.
+
+    Sitters can't review their own profile, and each author reviews a sitter once: a
+    second review violates uq_sitter_reviews_sitter_id_author_id, which aborts the
+    whole statement, bump included, and answers 409.
+    """
+    profiles = SitterProfile.__table__
+    reviews = SitterReview.__table__
+    review = SitterReview(sitter_id=sitter_id, author_id=author_id, rating=data.rating, comment=data.comment)
+    values = {column.name: getattr(review, column.name) for column in reviews.columns}
+
+    bumped = (
+        update(profiles)
+        .where(profiles.c.id == sitter_id, profiles.c.user_id != author_id)
+        .values(
+            rating_sum=profiles.c.rating_sum + review.rating,
+            review_count=profiles.c.review_count + 1,
+            rating=(profiles.c.rating_sum + review.rating) / (profiles.c.review_count + 1),
+            updated_at=review.created_at,
+        )
+        .returning(profiles.c.id, *[profiles.c[name] for name in RANK_INPUTS])
+        .cte("bumped")
+    )
+    # Selected from the UPDATE, so a missing sitter or the owner's own profile inserts nothing
+    source = select(*[
+        bumped.c.id if name == "sitter_id" else literal(value, type_=reviews.c[name].type)
+        for name, value in values.items()
+    ])
+    inserted = insert(reviews).from_select(list(values), source).cte("inserted")
+    try:
+        row = (await session.execute(select(bumped).add_cte(inserted))).first()
+    except IntegrityError as e:
+        await session.rollback()
+        if "uq_sitter_reviews_sitter_id_author_id" in str(e.orig):
+            raise HTTPException(status_code=409, detail="You have already reviewed this sitter")
+        raise
+    if row is None:
+        owner_id = (await session.execute(select(profiles.c.user_id).where(profiles.c.id == sitter_id))).scalar()
+        if owner_id is None:
+            raise HTTPException(status_code=404, detail="Sitter not found")
+        raise HTTPException(status_code=403, detail="You can't review your own sitter profile")
+
+    rank_score = compute_rank_score(*(getattr(row, name) for name in RANK_INPUTS))
+    ranked = (
+        update(profiles)
+        .where(profiles.c.id == sitter_id)
+        .values(rank_score=rank_score)
+        .returning(*profiles.c)
+        .cte("ranked")
+    )
+    projected = search_index_upsert(ranked).cte("projected")
+    await session.execute(select(ranked.c.id).add_cte(projected))
+    await session.commit()
+    await record_write(author_id)
+    return SitterReviewResponse(**values)
+
+
+async def list_reviews(session: AsyncSession, sitter_id: UUID, limit: int, cursor: Optional[str] = None) -> SitterReviewListResponse:
+    # Newest first, seeking on ix_sitter_reviews_sitter_id_created_at_id
+    statement = select(
+        SitterReview.id, SitterReview.sitter_id, SitterReview.author_id,
+        SitterReview.rating, SitterReview.comment, SitterReview.created_at,
+    ).where(SitterReview.sitter_id == sitter_id)
+    rows, next_cursor = await paginate_query(
+        session, statement, "reviews", [SitterReview.created_at, SitterReview.id], True, cursor, limit
+    )
+    return SitterReviewListResponse(
+        items=[SitterReviewResponse(**row._mapping) for row in rows],
+        next_cursor=next_cursor,
+    )
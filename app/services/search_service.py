@@ -0,0 +1,220 @@
+import math
+from datetime import date
+from typing import Any, Dict, List, Mapping, Optional
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import and_, any_, bindparam, or_, func, cast, literal_column
+from sqlalchemy.dialects.postgresql import ARRAY, REGCONFIG, UUID as PG_UUID, insert as pg_insert
+from app.core.config import settings
+from app.core.pagination import encode_cursor, paginate_query
+from app.core.geo import EARTH_RADIUS_KM, bounding_box, covering_cells, prefix_upper_bound
+from app.models.sitter import SitterProfile, SitterSearchIndex
+from app.schemas.sitter import (
+    SitterSearchResult, SitterSearchResponse, SitterFacetResponse,
+    SitterTextSearchResult, SitterTextSearchResponse
+)
+from app.services.facet_index import facet_index
+from app.services.availability_service import available_sitters_query
+
+
+def distance_km_expression(latitude: float, longitude: float):
+    """Haversine distance in SQL from (latitude, longitude) to the indexed sitter, as geo.haversine_km computes it."""
+    lat, lng = SitterSearchIndex.latitude, SitterSearchIndex.longitude
+    a = (
+        func.power(func.sin(func.radians(lat - latitude) / 2), 2)
+        + math.cos(math.radians(latitude)) * func.cos(func.radians(lat))
+        * func.power(func.sin(func.radians(lng - longitude) / 2), 2)
+    )
+    # least() guards asin against rounding just past 1 for antipodal points
+    return 2 * EARTH_RADIUS_KM * func.asin(func.least(func.sqrt(a), 1.0))
+
+
+async def search_nearby(
+    session: AsyncSession,
+    latitude: float,
+    longitude: float,
+    radius_km: float,
+    limit: int,
+    facets: Dict[str, List[str]] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    time_slot: Optional[str] = None,
+    cursor: Optional[str] = None,
+) -> SitterSearchResponse:
+    facet_bits = None
+    if facets:
+        await facet_index.ensure_fresh(session)
+        facet_bits = facet_index.match(facets)
+        if not facet_bits:
+            return SitterSearchResponse(items=[], next_cursor=None)
+
+    # Each covering cell is a contiguous geohash range, so every branch of the OR
+    # is a B-tree range scan on ix_sitter_search_index_geohash. The bounding box and
+    # distance filters then drop the cells' corners in SQL, and the page is cut by
+    # ORDER BY distance, id LIMIT there too.
+    cells = covering_cells(latitude, longitude, radius_km)
+    ranges = [
+        and_(SitterSearchIndex.geohash >= cell, SitterSearchIndex.geohash < prefix_upper_bound(cell))
+        for cell in cells
+    ]
+    min_lat, max_lat, min_lng, max_lng = bounding_box(latitude, longitude, radius_km)
+    conditions = [or_(*ranges), SitterSearchIndex.latitude.between(min_lat, max_lat)]
+    if min_lng is not None:
+        conditions.append(SitterSearchIndex.longitude.between(min_lng, max_lng))
+    distance = distance_km_expression(latitude, longitude)
+    # The owner must be inside the search radius and inside the sitter's own service area
+    conditions += [distance <= radius_km, distance <= SitterSearchIndex.service_radius_km]
+    distance = distance.label("distance_km")
+    statement = select(
+        SitterSearchIndex.id,
+        SitterSearchIndex.user_id,
+        SitterSearchIndex.full_name,
+        SitterSearchIndex.profile_photo,
+        SitterSearchIndex.headline,
+        SitterSearchIndex.city,
+        SitterSearchIndex.service_radius_km,
+        SitterSearchIndex.base_price,
+        SitterSearchIndex.rating,
+        distance,
+    ).where(*conditions)
+    if start_date:
+        available = available_sitters_query(start_date, end_date or start_date, time_slot)
+        statement = statement.where(SitterSearchIndex.id.in_(available))
+    if facet_bits is not None and facet_bits.bit_count() <= settings.SEARCH_FACET_ID_LIMIT:
+        # Few enough matches to hand to SQL, which then pages them like any other filter
+        ids = bindparam("facet_ids", facet_index.profile_ids(facet_bits), type_=ARRAY(PG_UUID(as_uuid=True)))
+        statement = statement.where(SitterSearchIndex.id == any_(ids))
+        facet_bits = None
+
+    # Otherwise the bitmaps filter the fetched rows: keep reading pages until one more
+    # match than needed shows whether another page exists, but no more than
+    # SEARCH_MAX_FACET_PAGES of them. Past that the page may come back short (even
+    # empty) with a cursor to continue from where the scan stopped.
+    key_columns = [distance, SitterSearchIndex.id]
+    rows = []
+    page_cursor = cursor
+    pages = 0
+    while len(rows) <= limit and pages < settings.SEARCH_MAX_FACET_PAGES:
+        page, page_cursor = await paginate_query(session, statement, "distance", key_columns, False, page_cursor, limit)
+        rows.extend(row for row in page if facet_bits is None or facet_index.contains(facet_bits, row.id))
+        pages += 1
+        if page_cursor is None:
+            break
+
+    next_cursor = page_cursor
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor("distance", [rows[-1].distance_km, rows[-1].id])
+    items = [
+        SitterSearchResult(
+            id=row.id,
+            user_id=row.user_id,
+            full_name=row.full_name,
+            profile_photo=row.profile_photo,
+            headline=row.headline,
+            city=row.city,
+            service_radius_km=row.service_radius_km,
+            base_price=row.base_price,
+            rating=row.rating,
+            distance_km=round(row.distance_km, 3),
+        )
+        for row in rows
+    ]
+    return SitterSearchResponse(items=items, next_cursor=next_cursor)
+
+
+async def facet_search(session: AsyncSession, facets: Dict[str, List[str]], limit: int) -> SitterFacetResponse:
+    await facet_index.ensure_fresh(session)
+    bits = facet_index.match(facets)
+    return SitterFacetResponse(
+        total=bits.bit_count(),
+        facets=facet_index.counts(bits),
+        sitter_ids=facet_index.profile_ids(bits, limit),
+    )
+
+
+# Weights rank a hit in the headline above one in the bio, above the longer free-text fields
+_TEXT_SEARCH_FIELDS = (
+    ("headline", "A"),
+    ("bio", "B"),
+    ("care_routine_description", "C"),
+    ("training_philosophy", "C"),
+)
+
+TEXT_SEARCH_FIELDS = tuple(name for name, _ in _TEXT_SEARCH_FIELDS)
+
+_HEADLINE_OPTIONS = "MaxFragments=2, MaxWords=25, MinWords=8, StartSel=<b>, StopSel=</b>"
+
+
+def _text_search_config():
+    return cast(settings.FULL_TEXT_SEARCH_CONFIG, REGCONFIG)
+
+
+def search_vector_expression(fields: Mapping[str, Any]):
+    """SQL expression computing ``search_vector`` from content field values (or columns) by name."""
+    vector = None
+    for name, weight in _TEXT_SEARCH_FIELDS:
+        # setweight takes a "char" label, which a bound VARCHAR parameter doesn't resolve to
+        label = literal_column(f"'{weight}'")
+        part = func.setweight(func.to_tsvector(_text_search_config(), func.coalesce(fields.get(name), "")), label)
+        vector = part if vector is None else vector.op("||")(part)
+    return vector
+
+
+async def text_search(session: AsyncSession, query_text: str, limit: int, cursor: Optional[str] = None) -> SitterTextSearchResponse:
+    query = func.websearch_to_tsquery(_text_search_config(), query_text)
+    rank = func.ts_rank_cd(SitterSearchIndex.search_vector, query).label("rank")
+
+    # Rank and cut to one page on the narrow projection (GIN index + tsvector column),
+    # then build snippets (the expensive part) from the profile text for that page alone.
+    matches = select(
+        SitterSearchIndex.id,
+        SitterSearchIndex.user_id,
+        SitterSearchIndex.full_name,
+        SitterSearchIndex.profile_photo,
+        SitterSearchIndex.headline,
+        SitterSearchIndex.city,
+        SitterSearchIndex.base_price,
+        SitterSearchIndex.rating,
+        rank,
+    ).where(SitterSearchIndex.search_vector.op("@@")(query))
+    page, next_cursor = await paginate_query(session, matches, "text", [rank, SitterSearchIndex.id], True, cursor, limit)
+    if not page:
+        return SitterTextSearchResponse(items=[], next_cursor=None)
+
+    document = func.concat_ws(" ", *[getattr(SitterProfile, name) for name, _ in _TEXT_SEARCH_FIELDS])
+    snippet = func.ts_headline(_text_search_config(), document, query, _HEADLINE_OPTIONS)
+    statement = select(SitterProfile.id, snippet.label("snippet")).where(
+        SitterProfile.id.in_([row.id for row in page])
+    )
+    snippets = {row.id: row.snippet for row in await session.exec(statement)}
+
+    items = [SitterTextSearchResult(**row._mapping, snippet=snippets.get(row.id)) for row in page]
+    return SitterTextSearchResponse(items=items, next_cursor=next_cursor)
+
+
+def search_index_upsert(source, where=None):
+    """INSERT ... SELECT ... ON CONFLICT rewriting sitter_search_index rows from ``source``.
+
+    ``source`` is sitter_profiles or anything exposing the same columns, e.g. a
+    data-modifying CTE returning the profile row that was just written.
+    """
+    columns = [column.name for column in SitterSearchIndex.__table__.columns]
+    rows = select(*[source.c[name] for name in columns])
+    if where is not None:
+        rows = rows.where(where)
+    statement = pg_insert(SitterSearchIndex.__table__).from_select(columns, rows)
+    return statement.on_conflict_do_update(
+        index_elements=["id"],
+        set_={name: statement.excluded[name] for name in columns if name != "id"},
+    )
+
+
+async def sync_search_index(session: AsyncSession, profile_id):
+    """Copy the profile's projected columns into sitter_search_index in the current transaction.
+
+    Runs as one INSERT ... SELECT ... ON CONFLICT so the projection always mirrors the
+    flushed sitter_profiles row, including SQL-computed values like search_vector.
+    """
+    source = SitterProfile.__table__
+    await session.execute(search_index_upsert(source, source.c.id == profile_id))
@@ -1,31 +1,124 @@
 from uuid import UUID
-from sqlmodel import Session, select
+from datetime import date, datetime
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.orm import load_only
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy import Date, cast, func, inspect, literal
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from fastapi import HTTPException
-from app.models.sitter import SitterProfile
+from app.models.sitter import (
+    SitterProfile, SITTER_PROFILE_SECTIONS, SITTER_PROFILE_KEY_COLUMNS, SITTER_SERVICE_DETAILS
+)
 from app.models.user import User
 from app.schemas.sitter import (
     SitterPersonalInfoUpdate, SitterLocationUpdate, SitterBoardingUpdate,
     SitterWalkingUpdate, SitterExperienceUpdate, SitterHomeUpdate,
     SitterContentUpdate, SitterPricingUpdate, SitterGalleryDelete,
     SitterHouseSittingUpdate, SitterDropInUpdate, SitterDayCareUpdate,
-    SitterServiceSelectionUpdate
+    SitterServiceSelectionUpdate, SitterProfileBatchUpdate
 )
-from app.services.auth_service import request_mobile_otp, verify_mobile_otp_login
+from app.services.auth_service import request_mobile_otp, verify_mobile_code
 from app.services.verification_service import verify_shahkar
-from typing import List, Optional
+from app.core.geo import encode_geohash
+from app.services.facet_index import facet_index
+from app.services.availability_service import AVAILABILITY_FIELDS, availability_upserts, sync_availability
+from app.services.search_service import (
+    TEXT_SEARCH_FIELDS, search_index_upsert, search_vector_expression, sync_search_index
+)
+from app.services.ranking_service import refresh_rank_score
+from app.db.session import record_write
+from typing import Any, Dict, Iterable, List, Optional
 import os
 import logging
 import traceback
-import httpx
 
 logger = logging.getLogger(__name__)
 
-def get_or_create_profile(session: Session, user_id: UUID) -> SitterProfile:
+# Groups behind SitterProfileResponse; trust, safety and the search vector are never
+# returned by the profile endpoints, so they stay unloaded there.
+PROFILE_RESPONSE_SECTIONS = (
+    "identity", "onboarding", "services", "location", "experience", "home", "pricing",
+    "content", "training",
+)
+
+def section_columns(sections: Iterable[str], extra: Iterable[str] = ()) -> List[str]:
+    # Key columns, then each group's columns, then any extras, without duplicates
+    names = list(SITTER_PROFILE_KEY_COLUMNS)
+    for section in sections:
+        names.extend(SITTER_PROFILE_SECTIONS[section])
+    names.extend(extra)
+    return list(dict.fromkeys(names))
+
+PROFILE_RESPONSE_COLUMNS = section_columns(PROFILE_RESPONSE_SECTIONS)
+
+# SitterProfileBatchUpdate form -> (completion flag, onboarding step), in wizard order
+PROFILE_FORMS = {
+    "personal_info": ("is_personal_info_completed", 2),
+    "location": ("is_location_completed", 3),
+    "services": ("is_services_selected", 4),
+    "boarding": ("is_boarding_completed", 5),
+    "house_sitting": ("is_house_sitting_completed", 5),
+    "drop_in": ("is_drop_in_completed", 5),
+    "walking": ("is_dog_walking_completed", 5),
+    "daycare": ("is_day_care_completed", 5),
+    "experience": ("is_experience_completed", 6),
+    "home": ("is_home_completed", 7),
+    "content": ("is_content_completed", 9),
+    "pricing": ("is_pricing_completed", 10),
+}
+
+def profile_load_options(columns: Iterable[str]):
+    return load_only(*[getattr(SitterProfile, name) for name in columns])
+
+async def load_service_details(session: AsyncSession, profile: SitterProfile, services: Optional[Iterable[str]] = None):
+    """Attach service detail rows: the given ``services``, or each one the sitter supports.
+
+    All of them come back in one query, outer joined on the profile id; unsupported
+    services are set to None without being fetched.
+    """
+    wanted = {}
+    for key, (flag, model) in SITTER_SERVICE_DETAILS.items():
+        if getattr(profile, flag) if services is None else key in services:
+            wanted[key] = model
+        elif services is None:
+            set_committed_value(profile, key, None)
+    if not wanted:
+        return
+    statement = select(SitterProfile.id, *wanted.values())
+    for model in wanted.values():
+        statement = statement.outerjoin(model, model.sitter_id == SitterProfile.id)
+    statement = statement.where(SitterProfile.id == profile.id)
+    row = (await session.execute(statement.execution_options(populate_existing=True))).one()
+    for key, detail in zip(wanted, row[1:]):
+        set_committed_value(profile, key, detail)
+
+def profile_fields(profile: SitterProfile) -> Dict[str, Any]:
+    """Flatten the profile's loaded columns and attached service details into one mapping."""
+    state = inspect(profile)
+    fields = {
+        column.name: getattr(profile, column.name)
+        for column in SitterProfile.__table__.columns
+        if column.name not in state.unloaded
+    }
+    for key, (_, model) in SITTER_SERVICE_DETAILS.items():
+        if key in state.unloaded:
+            continue
+        # A supported service whose form hasn't been saved yet reads as the defaults
+        detail = getattr(profile, key) or model()
+        fields.update({
+            column.name: getattr(detail, column.name)
+            for column in model.__table__.columns
+            if column.name != "sitter_id"
+        })
+    return fields
+
+async def get_or_create_profile(session: AsyncSession, user_id: UUID) -> SitterProfile:
     statement = select(SitterProfile).where(SitterProfile.user_id == user_id)
-    profile = session.exec(statement).first()
+    profile = (await session.exec(statement)).first()
     if not profile:
         # Get user to pre-fill name/phone if available
-        user = session.get(User, user_id)
+        user = await session.get(User, user_id)
         profile = SitterProfile(
             user_id=user_id,
             full_name=user.full_name or "",
@@ -35,16 +128,164 @@ def get_or_create_profile(session: Session, user_id: UUID) -> SitterProfile:
             date_of_birth=user.created_at.date(), # Placeholder, needs update
             onboarding_step=1 # Start at step 1
         )
+        refresh_rank_score(profile)
         session.add(profile)
-        session.commit()
-        session.refresh(profile)
+        await session.flush()
+        await sync_search_index(session, profile.id)
+        await session.commit()
+        await session.refresh(profile)
+        await record_write(user_id)
     return profile
 
-def update_step(profile: SitterProfile, step: int):
-    # Only update if the new step is greater than the current step
-    # This allows users to go back without resetting their progress indicator
-    if step > profile.onboarding_step:
-        profile.onboarding_step = step
+async def save_profile(session: AsyncSession, profile: SitterProfile):
+    profile.updated_at = datetime.utcnow()
+    refresh_rank_score(profile)
+    session.add(profile)
+    await session.flush()
+    # Same transaction as the profile write, so search never sees a half-applied update
+    await sync_search_index(session, profile.id)
+    await session.commit()
+    await session.refresh(profile)
+    await load_service_details(session, profile)
+    await record_write(profile.user_id)
+    # Keep this worker's facet bitmaps in step with the committed row
+    facet_index.update_profile(profile)
+
+def _new_profile_values(user_id: UUID) -> Dict[str, Any]:
+    # Column values for a first write. Identity fields come from the user row through
+    # scalar subqueries, so creating the profile needs no SELECT beforehand.
+    user = User.__table__
+
+    def from_user(column):
+        return select(column).where(user.c.id == user_id).scalar_subquery()
+
+    profile = SitterProfile(user_id=user_id, full_name="", phone="", date_of_birth=date.today())
+    refresh_rank_score(profile)
+    values = {column.name: getattr(profile, column.name) for column in SitterProfile.__table__.columns}
+    values.update(
+        full_name=func.coalesce(from_user(user.c.full_name), ""),
+        phone=func.coalesce(from_user(user.c.phone_number), ""),
+        email=from_user(user.c.email),
+        profile_photo=from_user(user.c.avatar_url),
+        date_of_birth=cast(from_user(user.c.created_at), Date), # Placeholder, needs update
+    )
+    return values
+
+def _service_detail_upserts(upserted, values: Dict[str, Any]):
+    # One data-modifying CTE per service whose detail columns are in ``values``,
+    # inserting from the upserted profile row so a first write needs its id from nowhere else
+    ctes = {}
+    for key, (_, model) in SITTER_SERVICE_DETAILS.items():
+        table = model.__table__
+        written = {name: value for name, value in values.items() if name in table.c and name != "sitter_id"}
+        if not written:
+            continue
+        defaults = model()
+        row = {column.name: getattr(defaults, column.name) for column in table.columns if column.name != "sitter_id"}
+        row.update(written)
+        source = select(upserted.c.id, *[literal(value, type_=table.c[name].type) for name, value in row.items()])
+        statement = pg_insert(table).from_select(["sitter_id", *row], source)
+        statement = statement.on_conflict_do_update(
+            index_elements=["sitter_id"],
+            set_={name: statement.excluded[name] for name in written},
+        ).returning(*table.c)
+        ctes[key] = statement.cte(f"{key}_upserted")
+    return ctes
+
+async def upsert_section(
+    session: AsyncSession,
+    user_id: UUID,
+    values: Dict[str, Any],
+    completed_flag: Optional[str] = None,
+    step: Optional[int] = None,
+    section_only: bool = False,
+) -> SitterProfile:
+    """Write one onboarding section with a single INSERT ... ON CONFLICT (user_id) DO UPDATE ... RETURNING.
+
+    Creates the profile on first write, otherwise only touches the section's columns, its
+    completion flag and onboarding_step. The returned row also rewrites the
+    sitter_search_index entry in the same statement, through a data-modifying CTE.
+
+    Service detail columns in ``values`` go to their 1:1 table, and a full set of
+    availability fields to the normalized availability rows, through further CTEs of
+    the same statement; the service details come back in its result too.
+
+    The profile comes back with the SitterProfileResponse columns and supported service
+    details loaded or, with ``section_only``, just the written columns and services plus
+    what calculate_next_step reads.
+    """
+    table = SitterProfile.__table__
+    values = dict(values)
+    values["updated_at"] = datetime.utcnow()
+    if completed_flag:
+        values[completed_flag] = True
+    if values.get("latitude") is not None and values.get("longitude") is not None:
+        values["geohash"] = encode_geohash(values["latitude"], values["longitude"])
+
+    profile_values = {name: value for name, value in values.items() if name in table.c}
+    insert_values = {**_new_profile_values(user_id), **profile_values}
+    update_values = dict(profile_values)
+    if step is not None:
+        insert_values["onboarding_step"] = max(step, 1)
+        # Only move forward, so going back to an earlier form keeps the progress indicator
+        update_values["onboarding_step"] = func.greatest(table.c.onboarding_step, step)
+    if any(name in values for name in TEXT_SEARCH_FIELDS):
+        insert_values["search_vector"] = search_vector_expression(insert_values)
+        update_values["search_vector"] = search_vector_expression(
+            {name: values.get(name, table.c[name]) for name in TEXT_SEARCH_FIELDS}
+        )
+
+    upserted = (
+        pg_insert(table)
+        .values(insert_values)
+        .on_conflict_do_update(index_elements=["user_id"], set_=update_values)
+        .returning(*table.c)
+        .cte("upserted")
+    )
+    projected = search_index_upsert(upserted).cte("projected")
+    details = _service_detail_upserts(upserted, values)
+    ctes = [projected, *details.values()]
+    # The normalized availability rows are rewritten by the same statement when the
+    # write carries every field they derive from
+    availability = [name for name in AVAILABILITY_FIELDS if name in values]
+    if len(availability) == len(AVAILABILITY_FIELDS):
+        ctes += availability_upserts(upserted, *[values[name] for name in AVAILABILITY_FIELDS])
+    # The CTE returns the full row to the projection; only the wanted columns leave the server
+    if section_only:
+        written = [name for name in profile_values if name not in SITTER_PROFILE_SECTIONS["search"]]
+        columns = section_columns(("onboarding", "services"), written)
+    else:
+        columns = PROFILE_RESPONSE_COLUMNS
+    if availability and len(availability) < len(AVAILABILITY_FIELDS):
+        columns = list(dict.fromkeys([*columns, *AVAILABILITY_FIELDS]))
+
+    # Service details come back from the same statement: written services from their
+    # upsert's RETURNING and, for the full response, the others from their tables
+    # (the statement's snapshot predates only the rows it writes itself)
+    sources = {}
+    for key, (_, model) in SITTER_SERVICE_DETAILS.items():
+        if key in details:
+            sources[key] = details[key]
+        elif not section_only:
+            sources[key] = model.__table__
+    rows = select(*[upserted.c[name] for name in columns])
+    for source in sources.values():
+        rows = rows.add_columns(*source.c).outerjoin(source, source.c.sitter_id == upserted.c.id)
+    models = [SITTER_SERVICE_DETAILS[key][1] for key in sources]
+    statement = select(SitterProfile, *models).from_statement(rows.add_cte(*ctes))
+    result = await session.execute(statement.execution_options(populate_existing=True))
+    profile, *loaded = result.one()
+    for key, detail in zip(sources, loaded):
+        # As load_service_details: the full response leaves unsupported services empty
+        supported = getattr(profile, SITTER_SERVICE_DETAILS[key][0])
+        set_committed_value(profile, key, detail if section_only or supported else None)
+
+    if availability and len(availability) < len(AVAILABILITY_FIELDS):
+        await sync_availability(session, profile)
+    await session.commit()
+    await record_write(user_id)
+    facet_index.update_values(profile.id, values)
+    return profile
 
 def calculate_next_step(profile: SitterProfile) -> str:
     if not profile.is_personal_info_completed:
@@ -77,98 +318,87 @@ def calculate_next_step(profile: SitterProfile) -> str:
         
     return "Review"
 
-async def update_personal_info(session: Session, user_id: UUID, data: SitterPersonalInfoUpdate):
-    try:
-        logger.info(f"Updating personal info for user {user_id}")
-        profile = get_or_create_profile(session, user_id)
-        user = session.get(User, user_id)
-        
-        # Determine phone number to use for verification
-        phone_to_verify = data.phone if data.phone else (profile.phone or user.phone_number)
-        
-        # Shahkar Verification if government_id_number is provided
-        if data.government_id_number:
-            logger.info(f"Verifying Shahkar for phone {phone_to_verify} and ID {data.government_id_number}")
-            if not phone_to_verify:
-                 raise HTTPException(status_code=400, detail="Phone number is required for identity verification")
-                 
-            try:
-                shahkar_response = await verify_shahkar('0'+phone_to_verify, data.government_id_number)
-                logger.info(f"Shahkar response: {shahkar_response}")
-                # Check if matched is true
-                # Response structure: {"response_body": {"data": {"matched": true}, ...}, "result": 1}
-                matched = False
-                if shahkar_response.get("result") == 1:
-                    data_body = shahkar_response.get("response_body", {}).get("data", {})
-                    if data_body and data_body.get("matched") is True:
-                        matched = True
-                
-                if matched:
-                    profile.is_shahkar_verified = True
-                else:
-                    profile.is_shahkar_verified = False
-                    profile.is_phone_verified = False # Explicitly set to False
-                    
-                    # We need to commit these changes before raising exception so they persist
-                    session.add(profile)
-                    session.commit()
-                    
-                    raise HTTPException(status_code=400, detail="Phone number and national ID do not match")
-                    
-            except HTTPException as e:
-                logger.error(f"Shahkar verification HTTP error: {e.detail}")
-                raise e
-            except Exception as e:
-                logger.error(f"Shahkar verification failed: {e}")
-                raise HTTPException(status_code=500, detail=f"Identity verification failed: {str(e)}")
-
-        # Handle phone verification logic (OTP)
-        if data.phone and data.phone != user.phone_number:
-            logger.info(f"Phone number change detected. Requesting OTP for {data.phone}")
-            request_mobile_otp(data.phone)
-            raise HTTPException(status_code=403, detail="Phone number verification required. OTP sent to the new number.")
+async def _personal_info_values(session: AsyncSession, user_id: UUID, data: SitterPersonalInfoUpdate) -> Dict[str, Any]:
+    # Identity and phone checks for the personal info form; raises when the form can't be saved
+    user = await session.get(User, user_id)
+    values = data.dict(exclude_unset=True)
+    values.pop("phone", None) # Phone changes go through OTP verification below
+
+    # Determine phone number to use for verification
+    phone_to_verify = data.phone
+    if not phone_to_verify:
+        statement = select(SitterProfile.phone).where(SitterProfile.user_id == user_id)
+        phone_to_verify = (await session.exec(statement)).first() or user.phone_number
+    
+    # Shahkar Verification if government_id_number is provided
+    if data.government_id_number:
+        logger.info(f"Verifying Shahkar for phone {phone_to_verify} and ID {data.government_id_number}")
+        if not phone_to_verify:
+             raise HTTPException(status_code=400, detail="Phone number is required for identity verification")
+             
+        try:
+            shahkar_response = await verify_shahkar('0'+phone_to_verify, data.government_id_number)
+            logger.info(f"Shahkar response: {shahkar_response}")
+            # Check if matched is true
+            # Response structure: {"response_body": {"data": {"matched": true}, ...}, "result": 1}
+            matched = False
+            if shahkar_response.get("result") == 1:
+                data_body = shahkar_response.get("response_body", {}).get("data", {})
+                if data_body and data_body.get("matched") is True:
+                    matched = True
             
-        # If phone is same or not provided, proceed with update
-        for key, value in data.dict(exclude_unset=True).items():
-            if key == 'phone':
-                 continue # Skip phone update here
-            setattr(profile, key, value)
-        
-        # If phone matches user.phone_number, we can sync it to profile
-        if user.phone_number:
-            profile.phone = user.phone_number
-            profile.is_phone_verified = True
+            if matched:
+                values["is_shahkar_verified"] = True
+            else:
+                # Persist the failed verification before raising
+                await upsert_section(session, user_id, {
+                    "is_shahkar_verified": False,
+                    "is_phone_verified": False, # Explicitly set to False
+                })
+                
+                raise HTTPException(status_code=400, detail="Phone number and national ID do not match")
+                
+        except HTTPException as e:
+            logger.error(f"Shahkar verification HTTP error: {e.detail}")
+            raise e
+        except Exception as e:
+            logger.error(f"Shahkar verification failed: {e}")
+            raise HTTPException(status_code=500, detail=f"Identity verification failed: {str(e)}")
 
-        profile.is_personal_info_completed = True
-        update_step(profile, 2) # Completed Step 2
+    # Handle phone verification logic (OTP)
+    if data.phone and data.phone != user.phone_number:
+        logger.info(f"Phone number change detected. Requesting OTP for {data.phone}")
+        await request_mobile_otp(data.phone)
+        raise HTTPException(status_code=403, detail="Phone number verification required. OTP sent to the new number.")
         
-        session.add(profile)
-        session.commit()
-        session.refresh(profile)
-        return profile
+    # If phone matches user.phone_number, we can sync it to profile
+    if user.phone_number:
+        values["phone"] = user.phone_number
+        values["is_phone_verified"] = True
+
+    return values
+
+async def update_personal_info(session: AsyncSession, user_id: UUID, data: SitterPersonalInfoUpdate, section_only: bool = False):
+    try:
+        logger.info(f"Updating personal info for user {user_id}")
+        values = await _personal_info_values(session, user_id, data)
+
+        # Completed Step 2
+        return await upsert_section(session, user_id, values, "is_personal_info_completed", 2, section_only)
     except Exception as e:
         logger.error(f"Error in update_personal_info: {e}")
         traceback.print_exc()
         raise e
 
-def verify_profile_phone_update(session: Session, user_id: UUID, phone: str, otp: str):
-    import requests as http_requests
-    MOBILE_OTP_URL = "https://api-staging.hyperlikes.ir/public/core/apiv1/custom_codes"
-    
-    payload = {'phoneNumber': phone, 'code': otp}
-    try:
-        response = http_requests.put(MOBILE_OTP_URL, data=payload)
-        if response.status_code != 200:
-             raise HTTPException(status_code=400, detail="Invalid OTP")
-    except http_requests.RequestException as e:
-        raise HTTPException(status_code=400, detail=f"Failed to verify OTP: {str(e)}")
-        
+async def verify_profile_phone_update(session: AsyncSession, user_id: UUID, phone: str, otp: str):
+    await verify_mobile_code(phone, otp)
+
     # OTP Verified. Update User and Profile.
-    user = session.get(User, user_id)
+    user = await session.get(User, user_id)
     
     # Check if phone number is already taken by another user
     existing_user_statement = select(User).where(User.phone_number == phone)
-    existing_user = session.exec(existing_user_statement).first()
+    existing_user = (await session.exec(existing_user_statement)).first()
     
     if existing_user and existing_user.id != user_id:
         raise HTTPException(status_code=400, detail="Phone number already in use by another account")
@@ -177,33 +407,17 @@ def verify_profile_phone_update(session: Session, user_id: UUID, phone: str, otp
     user.is_phone_verified = True
     session.add(user)
     
-    profile = get_or_create_profile(session, user_id)
-    profile.phone = phone
-    profile.is_phone_verified = True
-    session.add(profile)
-    
-    session.commit()
-    session.refresh(profile)
-    return profile
+    # The user change is flushed ahead of the upsert and committed with it
+    return await upsert_section(session, user_id, {"phone": phone, "is_phone_verified": True})
 
-def update_profile_photo(session: Session, user_id: UUID, photo_path: str):
-    profile = get_or_create_profile(session, user_id)
-    profile.profile_photo = photo_path
-    session.add(profile)
-    session.commit()
-    session.refresh(profile)
-    return profile
+async def update_profile_photo(session: AsyncSession, user_id: UUID, photo_path: str):
+    return await upsert_section(session, user_id, {"profile_photo": photo_path})
 
-def update_government_id_image(session: Session, user_id: UUID, photo_path: str):
-    profile = get_or_create_profile(session, user_id)
-    profile.government_id_image = photo_path
-    session.add(profile)
-    session.commit()
-    session.refresh(profile)
-    return profile
+async def update_government_id_image(session: AsyncSession, user_id: UUID, photo_path: str):
+    return await upsert_section(session, user_id, {"government_id_image": photo_path})
 
-def add_gallery_photos(session: Session, user_id: UUID, photo_paths: List[str]):
-    profile = get_or_create_profile(session, user_id)
+async def add_gallery_photos(session: AsyncSession, user_id: UUID, photo_paths: List[str]):
+    profile = await get_or_create_profile(session, user_id)
     
     # Ensure photo_gallery is a list
     current_gallery = list(profile.photo_gallery) if profile.photo_gallery else []
@@ -213,13 +427,11 @@ def add_gallery_photos(session: Session, user_id: UUID, photo_paths: List[str]):
         
     profile.photo_gallery = current_gallery + photo_paths
     
-    session.add(profile)
-    session.commit()
-    session.refresh(profile)
+    await save_profile(session, profile)
     return profile
 
-def delete_gallery_photos(session: Session, user_id: UUID, data: SitterGalleryDelete):
-    profile = get_or_create_profile(session, user_id)
+async def delete_gallery_photos(session: AsyncSession, user_id: UUID, data: SitterGalleryDelete):
+    profile = await get_or_create_profile(session, user_id)
     current_gallery = list(profile.photo_gallery) if profile.photo_gallery else []
     
     # Filter out photos to be deleted
@@ -247,158 +459,88 @@ def delete_gallery_photos(session: Session, user_id: UUID, data: SitterGalleryDe
                     pass # Log error or ignore if file doesn't exist
                     
     profile.photo_gallery = new_gallery
-    session.add(profile)
-    session.commit()
-    session.refresh(profile)
+    await save_profile(session, profile)
     return profile
 
-def update_location(session: Session, user_id: UUID, data: SitterLocationUpdate):
-    profile = get_or_create_profile(session, user_id)
-    for key, value in data.dict(exclude_unset=True).items():
-        setattr(profile, key, value)
-    
-    profile.is_location_completed = True
-    update_step(profile, 3) # Completed Step 3
-    
-    session.add(profile)
-    session.commit()
-    session.refresh(profile)
-    return profile
+async def update_location(session: AsyncSession, user_id: UUID, data: SitterLocationUpdate, section_only: bool = False):
+    # Completed Step 3
+    return await upsert_section(session, user_id, data.dict(exclude_unset=True), "is_location_completed", 3, section_only)
 
-def update_service_selection(session: Session, user_id: UUID, data: SitterServiceSelectionUpdate):
-    profile = get_or_create_profile(session, user_id)
-    for key, value in data.dict(exclude_unset=True).items():
-        setattr(profile, key, value)
-    
-    profile.is_services_selected = True
-    update_step(profile, 4) # Completed Step 4 (Service Selection)
-    
-    session.add(profile)
-    session.commit()
-    session.refresh(profile)
-    return profile
+async def update_service_selection(session: AsyncSession, user_id: UUID, data: SitterServiceSelectionUpdate, section_only: bool = False):
+    # Completed Step 4 (Service Selection)
+    return await upsert_section(session, user_id, data.dict(exclude_unset=True), "is_services_selected", 4, section_only)
 
-def update_boarding_service(session: Session, user_id: UUID, data: SitterBoardingUpdate):
-    profile = get_or_create_profile(session, user_id)
-    for key, value in data.dict(exclude_unset=True).items():
-        setattr(profile, key, value)
-    
-    profile.is_boarding_completed = True
-    update_step(profile, 5) # Completed Step 5 (Services)
-    
-    session.add(profile)
-    session.commit()
-    session.refresh(profile)
-    return profile
+async def update_boarding_service(session: AsyncSession, user_id: UUID, data: SitterBoardingUpdate, section_only: bool = False):
+    # Completed Step 5 (Services)
+    return await upsert_section(session, user_id, data.dict(exclude_unset=True), "is_boarding_completed", 5, section_only)
 
-def update_walking_service(session: Session, user_id: UUID, data: SitterWalkingUpdate):
-    profile = get_or_create_profile(session, user_id)
-    for key, value in data.dict(exclude_unset=True).items():
-        setattr(profile, key, value)
-    
-    profile.is_dog_walking_completed = True
-    update_step(profile, 5) # Completed Step 5 (Services)
-    
-    session.add(profile)
-    session.commit()
-    session.refresh(profile)
-    return profile
+async def update_walking_service(session: AsyncSession, user_id: UUID, data: SitterWalkingUpdate, section_only: bool = False):
+    # Completed Step 5 (Services)
+    return await upsert_section(session, user_id, data.dict(exclude_unset=True), "is_dog_walking_completed", 5, section_only)
 
-def update_house_sitting_service(session: Session, user_id: UUID, data: SitterHouseSittingUpdate):
-    profile = get_or_create_profile(session, user_id)
-    for key, value in data.dict(exclude_unset=True).items():
-        setattr(profile, key, value)
-    
-    profile.is_house_sitting_completed = True
-    update_step(profile, 5) # Completed Step 5 (Services)
-    
-    session.add(profile)
-    session.commit()
-    session.refresh(profile)
-    return profile
+async def update_house_sitting_service(session: AsyncSession, user_id: UUID, data: SitterHouseSittingUpdate, section_only: bool = False):
+    # Completed Step 5 (Services)
+    return await upsert_section(session, user_id, data.dict(exclude_unset=True), "is_house_sitting_completed", 5, section_only)
 
-def update_drop_in_service(session: Session, user_id: UUID, data: SitterDropInUpdate):
-    profile = get_or_create_profile(session, user_id)
-    for key, value in data.dict(exclude_unset=True).items():
-        setattr(profile, key, value)
-    
-    profile.is_drop_in_completed = True
-    update_step(profile, 5) # Completed Step 5 (Services)
-    
-    session.add(profile)
-    session.commit()
-    session.refresh(profile)
-    return profile
+async def update_drop_in_service(session: AsyncSession, user_id: UUID, data: SitterDropInUpdate, section_only: bool = False):
+    # Completed Step 5 (Services)
+    return await upsert_section(session, user_id, data.dict(exclude_unset=True), "is_drop_in_completed", 5, section_only)
 
-def update_daycare_service(session: Session, user_id: UUID, data: SitterDayCareUpdate):
-    profile = get_or_create_profile(session, user_id)
-    for key, value in data.dict(exclude_unset=True).items():
-        setattr(profile, key, value)
-    
-    profile.is_day_care_completed = True
-    update_step(profile, 5) # Completed Step 5 (Services)
-    
-    session.add(profile)
-    session.commit()
-    session.refresh(profile)
-    return profile
+async def update_daycare_service(session: AsyncSession, user_id: UUID, data: SitterDayCareUpdate, section_only: bool = False):
+    # Completed Step 5 (Services)
+    return await upsert_section(session, user_id, data.dict(exclude_unset=True), "is_day_care_completed", 5, section_only)
 
-def update_experience(session: Session, user_id: UUID, data: SitterExperienceUpdate):
-    profile = get_or_create_profile(session, user_id)
-    for key, value in data.dict(exclude_unset=True).items():
-        setattr(profile, key, value)
-    
-    profile.is_experience_completed = True
-    update_step(profile, 6) # Completed Step 6
-    
-    session.add(profile)
-    session.commit()
-    session.refresh(profile)
-    return profile
+async def update_experience(session: AsyncSession, user_id: UUID, data: SitterExperienceUpdate, section_only: bool = False):
+    # Completed Step 6
+    return await upsert_section(session, user_id, data.dict(exclude_unset=True), "is_experience_completed", 6, section_only)
 
-def update_home(session: Session, user_id: UUID, data: SitterHomeUpdate):
-    profile = get_or_create_profile(session, user_id)
-    for key, value in data.dict(exclude_unset=True).items():
-        setattr(profile, key, value)
-    
-    profile.is_home_completed = True
-    update_step(profile, 7) # Completed Step 7
-    
-    session.add(profile)
-    session.commit()
-    session.refresh(profile)
-    return profile
+async def update_home(session: AsyncSession, user_id: UUID, data: SitterHomeUpdate, section_only: bool = False):
+    # Completed Step 7
+    return await upsert_section(session, user_id, data.dict(exclude_unset=True), "is_home_completed", 7, section_only)
 
-def update_content(session: Session, user_id: UUID, data: SitterContentUpdate):
-    profile = get_or_create_profile(session, user_id)
-    for key, value in data.dict(exclude_unset=True).items():
-        setattr(profile, key, value)
-    
-    profile.is_content_completed = True
-    update_step(profile, 9) # Completed Step 9
-    
-    session.add(profile)
-    session.commit()
-    session.refresh(profile)
-    return profile
+async def update_content(session: AsyncSession, user_id: UUID, data: SitterContentUpdate, section_only: bool = False):
+    # Completed Step 9
+    return await upsert_section(session, user_id, data.dict(exclude_unset=True), "is_content_completed", 9, section_only)
 
-def update_pricing(session: Session, user_id: UUID, data: SitterPricingUpdate):
-    profile = get_or_create_profile(session, user_id)
-    for key, value in data.dict(exclude_unset=True).items():
-        setattr(profile, key, value)
-    
-    profile.is_pricing_completed = True
-    update_step(profile, 10) # Completed Step 10
+async def update_pricing(session: AsyncSession, user_id: UUID, data: SitterPricingUpdate, section_only: bool = False):
+    # Completed Step 10
+    return await upsert_section(session, user_id, data.dict(exclude_unset=True), "is_pricing_completed", 10, section_only)
 
-    session.add(profile)
-    session.commit()
-    session.refresh(profile)
-    return profile
+async def update_profile_sections(session: AsyncSession, user_id: UUID, data: SitterProfileBatchUpdate, section_only: bool = False):
+    """Save several onboarding forms through a single upsert_section call.
 
-def get_profile(session: Session, user_id: UUID):
-    statement = select(SitterProfile).where(SitterProfile.user_id == user_id)
-    profile = session.exec(statement).first()
+    Forms are merged in wizard order, so a field sent by two forms (e.g.
+    is_boarding_supported) takes the later form's value, as with separate requests.
+    Each form sets its completion flag and onboarding_step moves to the furthest one.
+    """
+    values = {}
+    step = None
+    for name, (completed_flag, form_step) in PROFILE_FORMS.items():
+        form = getattr(data, name)
+        if form is None:
+            continue
+        if name == "personal_info":
+            values.update(await _personal_info_values(session, user_id, form))
+        else:
+            values.update(form.dict(exclude_unset=True))
+        values[completed_flag] = True
+        step = max(step or 1, form_step)
+    if step is None:
+        raise HTTPException(status_code=400, detail="At least one form is required")
+    return await upsert_section(session, user_id, values, step=step, section_only=section_only)
+
+async def get_profile(session: AsyncSession, user_id: UUID, read_session: Optional[AsyncSession] = None):
+    # Look up on the read session (possibly a replica); creating goes to the primary
+    statement = (
+        select(SitterProfile)
+        .where(SitterProfile.user_id == user_id)
+        .options(profile_load_options(PROFILE_RESPONSE_COLUMNS))
+    )
+    profile = (await (read_session or session).exec(statement)).first()
     if not profile:
         # Create empty profile if not exists, so frontend can start onboarding
-        return get_or_create_profile(session, user_id)
+        profile = await get_or_create_profile(session, user_id)
+        await load_service_details(session, profile)
+        return profile
+    await load_service_details(read_session or session, profile)
     return profile
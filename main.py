@@ -2,9 +2,12 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from app.core.config import settings
-from app.db.session import create_db_and_tables
+from app.db.session import async_engine, read_engines
 from app.api.v1.api import api_router
-from app.db.migration_fix import run_fix
+from app.db.schema_check import check_schema_revision
+from app.services.google_verifier import google_verifier
+from app.services.otp_gateway import otp_gateway
+from app.services.email_service import mail_queue
 import os
 
 app = FastAPI(
@@ -33,9 +36,22 @@ app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
 
 @app.on_event("startup")
 def on_startup():
-    # Run the migration fix before creating tables (or after, order matters less for ALTER)
-    run_fix()
-    create_db_and_tables()
+    # Schema changes live in alembic/versions; startup only checks they were applied
+    check_schema_revision()
+
+@app.on_event("startup")
+async def start_background_tasks():
+    if settings.GOOGLE_CLIENT_ID:
+        google_verifier.start()
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    await google_verifier.stop()
+    await otp_gateway.aclose()
+    await mail_queue.stop()
+    await async_engine.dispose()
+    for read_engine in read_engines.values():
+        await read_engine.dispose()
 
 app.include_router(api_router, prefix="/api/v1")
 
@@ -0,0 +1,63 @@
+import argparse
+import sys
+from sqlmodel import Session
+from app.db.session import engine
+# Import all models to ensure they are registered with SQLModel.metadata
+from app.models.user import User, AuthProvider
+from app.models.sitter import SitterProfile
+from app.services.ranking_service import backfill_rank_scores
+from app.services.bulk_service import BULK_FORMATS, BULK_TABLES, export_table, import_table
+
+def backfill_rank_score(args):
+    print("Recomputing sitter rank scores...")
+    with Session(engine) as session:
+        updated = backfill_rank_scores(session, batch_size=args.batch_size)
+    print(f"Updated {updated} sitter profiles.")
+
+def export_sitters(args):
+    # Progress goes to stderr so the data can be piped from stdout
+    if args.output:
+        with open(args.output, "w", newline="") as out:
+            exported = export_table(args.table, out, args.format)
+    else:
+        exported = export_table(args.table, sys.stdout, args.format)
+    print(f"Exported {exported} rows from {args.table}.", file=sys.stderr)
+
+def import_sitters(args):
+    print(f"Importing into {args.table}...")
+    if args.input:
+        with open(args.input, newline="") as source:
+            imported = import_table(args.table, source, args.format, args.batch_size)
+    else:
+        imported = import_table(args.table, sys.stdin, args.format, args.batch_size)
+    print(f"Imported {imported} rows into {args.table}.")
+
+def main():
+    parser = argparse.ArgumentParser(description="Wagy maintenance commands")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    rank_parser = subparsers.add_parser("backfill-rank-score", help="Recompute rank_score for every sitter")
+    rank_parser.add_argument("--batch-size", type=int, default=1000)
+    rank_parser.set_defaults(func=backfill_rank_score)
+
+    export_parser = subparsers.add_parser("export-sitters", help="Stream a sitter table as CSV or NDJSON using COPY")
+    export_parser.add_argument("--table", choices=list(BULK_TABLES), default="sitter_profiles")
+    export_parser.add_argument("--format", choices=BULK_FORMATS, default="csv")
+    export_parser.add_argument("--output", help="File to write (default: stdout)")
+    export_parser.set_defaults(func=export_sitters)
+
+    import_parser = subparsers.add_parser(
+        "import-sitters",
+        help="Upsert an export-sitters file using COPY FROM in batches; import sitter_profiles before the service and review tables",
+    )
+    import_parser.add_argument("--table", choices=list(BULK_TABLES), default="sitter_profiles")
+    import_parser.add_argument("--format", choices=BULK_FORMATS, default="csv")
+    import_parser.add_argument("--input", help="File to read (default: stdin)")
+    import_parser.add_argument("--batch-size", type=int, default=5000)
+    import_parser.set_defaults(func=import_sitters)
+
+    args = parser.parse_args()
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
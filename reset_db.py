@@ -1,5 +1,7 @@
 from sqlmodel import SQLModel
+from alembic import command
 from app.db.session import engine
+from app.db.schema_check import alembic_config
 # Import all models to ensure they are registered with SQLModel.metadata
 from app.models.user import User, AuthProvider
 from app.models.sitter import SitterProfile
@@ -9,6 +11,8 @@ def reset_database():
     SQLModel.metadata.drop_all(engine)
     print("Creating all tables...")
     SQLModel.metadata.create_all(engine)
+    # The tables now match the models, i.e. the latest migration
+    command.stamp(alembic_config(), "head")
     print("Database reset complete.")
 
 if __name__ == "__main__":
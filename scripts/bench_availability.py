@@ -0,0 +1,90 @@
+"""Benchmark of "who is free from X to Y" as the number of sitters grows.
+
+Compares the indexed query behind GET /sitters/availability with what the opaque
+availability columns allowed before: loading every profile and checking it in Python.
+Sitters are seeded into the database at DATABASE_URL inside a transaction that is
+rolled back at the end. Run from the repository root:
+
+    python -m scripts.bench_availability --sizes 1000 10000 100000
+"""
+import argparse
+import random
+import statistics
+import time
+from datetime import date, timedelta
+from sqlalchemy import select, text
+from app.db.session import engine
+from app.models.sitter import SitterProfile
+from app.services.availability_service import availability_rows, available_sitters_query
+from scripts.bench_data import seed_sitters
+
+
+def median_ms(run, repeat: int) -> float:
+    run()  # warm up caches and the plan
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def indexed(connection, start_date: date, end_date: date, time_slot: str, limit: int):
+    # The first page, as find_available_sitters fetches it
+    statement = available_sitters_query(start_date, end_date, time_slot)
+    return connection.execute(statement.order_by(SitterProfile.id).limit(limit)).all()
+
+
+def scan_profiles(connection, start_date: date, end_date: date, time_slot: str, limit: int):
+    span = (end_date - start_date).days + 1
+    weekdays = {(start_date + timedelta(days=i)).weekday() for i in range(min(span, 7))}
+    rows = connection.execute(
+        select(
+            SitterProfile.id,
+            SitterProfile.available_days,
+            SitterProfile.available_time_slots,
+            SitterProfile.blackout_dates,
+        )
+    )
+    free = []
+    for row in rows:
+        slots = availability_rows(row.available_days, row.available_time_slots)
+        days = {weekday for weekday, slot in slots if slot in (time_slot, "*")}
+        if weekdays <= days and not any(start_date <= day <= end_date for day in row.blackout_dates or []):
+            free.append(row.id)
+    return sorted(free)[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--days", type=int, default=3, help="Length of the requested date range")
+    parser.add_argument("--time-slot", default="morning")
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    start_date = date.today() + timedelta(days=7)
+    end_date = start_date + timedelta(days=args.days - 1)
+    query = (start_date, end_date, args.time_slot, args.limit)
+
+    print(f"{'sitters':>9} {'indexed ms':>11} {'scan ms':>9}")
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        try:
+            seeded = 0
+            for size in sorted(args.sizes):
+                seed_sitters(connection, size - seeded, rng)
+                seeded = size
+                connection.execute(text("ANALYZE sitter_profiles, sitter_availability, sitter_blackout_dates"))
+                fast = median_ms(lambda: indexed(connection, *query), args.repeat)
+                slow = median_ms(lambda: scan_profiles(connection, *query), max(args.repeat // 10, 1))
+                print(f"{size:>9} {fast:>11.2f} {slow:>9.2f}")
+        finally:
+            transaction.rollback()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Synthetic sitters for the benchmark scripts.
+
+Most scripts seed inside a transaction they roll back at the end, so they can point
+at a development database without leaving rows behind; the load test needs the rows
+visible to other connections, so it commits them and calls ``delete_sitters``.
+"""
+import random
+import uuid
+from datetime import date, datetime, timedelta
+from typing import List
+from sqlalchemy import delete, insert, select
+from app.core.geo import encode_geohash
+from app.models.user import User
+from app.models.sitter import SitterAvailability, SitterBlackoutDate, SitterProfile, SitterSearchIndex
+from app.services.availability_service import availability_rows
+from app.services.search_service import search_index_upsert
+
+WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+TIME_SLOTS = ["morning", "afternoon", "evening"]
+
+
+def seed_sitters(connection, count: int, rng: random.Random, batch_size: int = 5000) -> List[uuid.UUID]:
+    """Insert ``count`` sitters with their availability rows and search index rows; returns their ids."""
+    today = date.today()
+    ids = []
+    for start in range(0, count, batch_size):
+        users, profiles, availability, blackouts = [], [], [], []
+        for _ in range(min(batch_size, count - start)):
+            user = User(email=f"bench-{uuid.uuid4().hex}@example.com", full_name="Bench Sitter")
+            latitude, longitude = 35.7 + rng.uniform(-0.5, 0.5), 51.4 + rng.uniform(-0.5, 0.5)
+            profile = SitterProfile(
+                user_id=user.id,
+                full_name="Bench Sitter",
+                date_of_birth=date(1990, 1, 1),
+                phone="09120000000",
+                city="Tehran",
+                latitude=latitude,
+                longitude=longitude,
+                geohash=encode_geohash(latitude, longitude),
+                service_radius_km=rng.choice([5, 10, 20]),
+                available_days=rng.sample(WEEKDAYS, rng.randint(2, 6)),
+                available_time_slots={slot: True for slot in rng.sample(TIME_SLOTS, rng.randint(1, 3))},
+                blackout_dates=sorted({today + timedelta(days=rng.randint(0, 90)) for _ in range(rng.randint(0, 4))}),
+                base_price=round(rng.uniform(10, 80), 2),
+                rating=round(rng.uniform(3, 5), 1),
+                rank_score=rng.random(),
+                years_of_experience=rng.randint(0, 15),
+                created_at=datetime.utcnow() - timedelta(seconds=rng.randint(0, 365 * 86400)),
+            )
+            users.append(user.model_dump())
+            profiles.append(profile.model_dump())
+            availability.extend(
+                {"sitter_id": profile.id, "weekday": weekday, "time_slot": slot}
+                for weekday, slot in availability_rows(profile.available_days, profile.available_time_slots)
+            )
+            blackouts.extend({"sitter_id": profile.id, "blackout_date": day} for day in profile.blackout_dates)
+            ids.append(profile.id)
+        connection.execute(insert(User.__table__), users)
+        connection.execute(insert(SitterProfile.__table__), profiles)
+        connection.execute(insert(SitterAvailability.__table__), availability)
+        if blackouts:
+            connection.execute(insert(SitterBlackoutDate.__table__), blackouts)
+        source = SitterProfile.__table__
+        connection.execute(search_index_upsert(source, source.c.id.in_([p["id"] for p in profiles])))
+    return ids
+
+
+def delete_sitters(connection, ids: List[uuid.UUID]):
+    """Remove sitters created by ``seed_sitters`` in a committed transaction, and their users."""
+    profiles = SitterProfile.__table__
+    user_ids = connection.execute(select(profiles.c.user_id).where(profiles.c.id.in_(ids))).scalars().all()
+    connection.execute(delete(SitterSearchIndex.__table__).where(SitterSearchIndex.__table__.c.id.in_(ids)))
+    for model in (SitterAvailability, SitterBlackoutDate):
+        connection.execute(delete(model.__table__).where(model.__table__.c.sitter_id.in_(ids)))
+    connection.execute(delete(profiles).where(profiles.c.id.in_(ids)))
+    connection.execute(delete(User.__table__).where(User.__table__.c.id.in_(user_ids)))
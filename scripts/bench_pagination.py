@@ -0,0 +1,72 @@
+"""Benchmark of a deep page of GET /sitters/list: keyset cursor vs OFFSET.
+
+Sitters are seeded into the database at DATABASE_URL inside a transaction that is
+rolled back at the end. Run from the repository root:
+
+    python -m scripts.bench_pagination --sitters 50000 --page 1000 --page-size 20
+"""
+import argparse
+import random
+import statistics
+import time
+from sqlalchemy import select, text, tuple_
+from app.db.session import engine
+from app.models.sitter import SitterSearchIndex
+from app.schemas.sitter import SitterSortOrder
+from app.services.listing_service import SORT_COLUMNS
+from scripts.bench_data import seed_sitters
+
+
+def median_ms(run, repeat: int) -> float:
+    run()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def page_statement(sort: SitterSortOrder):
+    sort_column, descending = SORT_COLUMNS[sort]
+    keys = [sort_column, SitterSearchIndex.id]
+    order = [c.desc() if descending else c.asc() for c in keys]
+    return select(SitterSearchIndex.id, SitterSearchIndex.full_name, sort_column).order_by(*order), keys, descending
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sitters", type=int, default=50000)
+    parser.add_argument("--page", type=int, default=1000)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    skipped = (args.page - 1) * args.page_size
+    if skipped + args.page_size > args.sitters:
+        parser.error(f"page {args.page} of {args.page_size} needs at least {skipped + args.page_size} sitters")
+
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        try:
+            seed_sitters(connection, args.sitters, random.Random(args.seed))
+            connection.execute(text("ANALYZE sitter_search_index"))
+            print(f"page {args.page} of {args.page_size} over {args.sitters} sitters")
+            print(f"{'sort':>11} {'offset ms':>10} {'keyset ms':>10}")
+            for sort in SitterSortOrder:
+                statement, keys, descending = page_statement(sort)
+                offset_page = statement.offset(skipped).limit(args.page_size)
+                # The cursor of page N carries the key of the last row on page N - 1
+                last = connection.execute(statement.offset(skipped - 1).limit(1)).one()._mapping
+                row_key, cursor = tuple_(*keys), tuple_(*[last[c.key] for c in keys])
+                keyset_page = statement.where(row_key < cursor if descending else row_key > cursor).limit(args.page_size)
+                assert connection.execute(offset_page).all() == connection.execute(keyset_page).all()
+                offset_ms = median_ms(lambda: connection.execute(offset_page).all(), args.repeat)
+                keyset_ms = median_ms(lambda: connection.execute(keyset_page).all(), args.repeat)
+                print(f"{sort.value:>11} {offset_ms:>10.2f} {keyset_ms:>10.2f}")
+        finally:
+            transaction.rollback()
+
+
+if __name__ == "__main__":
+    main()
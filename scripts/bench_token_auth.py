@@ -0,0 +1,50 @@
+"""Microbenchmark of bearer-token checks: a signature check per request vs the verified-token cache.
+
+Run from the repository root:
+
+    python -m scripts.bench_token_auth --tokens 100 --requests 100000
+"""
+import argparse
+import random
+import time
+import uuid
+from jose import jwt
+from app.core.config import settings
+from app.core.security import create_access_token, get_current_claims, token_cache, verify_token
+
+
+def decode_every_time(token: str):
+    # What every authenticated request did before the cache
+    return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+
+
+def per_call_us(check, tokens, requests: int) -> float:
+    start = time.perf_counter()
+    for token in tokens:
+        check(token)
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tokens", type=int, default=100, help="Distinct users making the requests")
+    parser.add_argument("--requests", type=int, default=100000)
+    args = parser.parse_args()
+
+    users = [create_access_token({"sub": str(uuid.uuid4()), "role": "user"}) for _ in range(args.tokens)]
+    tokens = [random.choice(users) for _ in range(args.requests)]
+
+    uncached = per_call_us(decode_every_time, tokens, args.requests)
+    token_cache.clear()
+    cached = per_call_us(verify_token, tokens, args.requests)
+    token_cache.clear()
+    dependency = per_call_us(get_current_claims, tokens, args.requests)
+    print(f"{args.requests} requests from {args.tokens} tokens")
+    print(f"jwt.decode per request:     {uncached:8.2f} us/request")
+    print(f"verify_token (cached):      {cached:8.2f} us/request  ({uncached / cached:.1f}x)")
+    print(f"get_current_claims:         {dependency:8.2f} us/request  (cache + revocation check)")
+    print(f"cache: {token_cache.snapshot()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Load test of one worker's DB throughput: blocking psycopg2 Session vs asyncpg AsyncSession.
+
+Each simulated request loads a sitter profile the way GET /sitters/me does, plus an
+optional server-side delay standing in for a slower query or network hop. "sync"
+runs it on a Session inside the coroutine, as the handlers did before they moved to
+AsyncSession, so every round trip blocks the event loop; "async" uses AsyncSession on
+the request engine. Both run ``--concurrency`` requests at a time on one event loop.
+
+Sitters are committed to the database at DATABASE_URL / ASYNC_DATABASE_URL for the
+run and deleted afterwards. Run from the repository root:
+
+    python -m scripts.load_test_async_db --concurrency 50 --seconds 10 --db-latency-ms 5
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from sqlalchemy import func, select as sa_select
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.db.session import async_engine, engine
+from app.models.sitter import SitterProfile
+from app.services.sitter_service import PROFILE_RESPONSE_COLUMNS, profile_load_options
+from scripts.bench_data import delete_sitters, seed_sitters
+
+
+def profile_statement(user_id):
+    return select(SitterProfile).where(SitterProfile.user_id == user_id).options(profile_load_options(PROFILE_RESPONSE_COLUMNS))
+
+
+async def sync_request(user_id, delay: float):
+    with Session(engine) as session:
+        profile = session.exec(profile_statement(user_id)).one()
+        if delay:
+            session.exec(sa_select(func.pg_sleep(delay)))
+    return profile
+
+
+async def async_request(user_id, delay: float):
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        profile = (await session.exec(profile_statement(user_id))).one()
+        if delay:
+            await session.exec(sa_select(func.pg_sleep(delay)))
+    return profile
+
+
+async def run(request, user_ids, concurrency: int, seconds: float, delay: float):
+    completed = 0
+    lags = []
+    deadline = time.perf_counter() + seconds
+
+    async def client(rng: random.Random):
+        nonlocal completed
+        while time.perf_counter() < deadline:
+            await request(rng.choice(user_ids), delay)
+            completed += 1
+
+    async def ticker():
+        # How late a 10 ms timer fires: what every other request on the worker waits
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            await asyncio.sleep(0.01)
+            lags.append(time.perf_counter() - start - 0.01)
+
+    started = time.perf_counter()
+    await asyncio.gather(ticker(), *[client(random.Random(i)) for i in range(concurrency)])
+    elapsed = time.perf_counter() - started
+    return {
+        "requests_per_second": completed / elapsed,
+        "loop_lag_p50_ms": statistics.median(lags) * 1000,
+        "loop_lag_max_ms": max(lags) * 1000,
+    }
+
+
+async def main(args):
+    with engine.begin() as connection:
+        ids = seed_sitters(connection, args.sitters, random.Random(args.seed))
+        user_ids = connection.execute(
+            sa_select(SitterProfile.user_id).where(SitterProfile.id.in_(ids))
+        ).scalars().all()
+    try:
+        print(f"{args.concurrency} concurrent requests for {args.seconds}s, {args.db_latency_ms} ms DB delay each")
+        print(f"{'session':>8} {'req/s':>9} {'loop lag p50 ms':>16} {'loop lag max ms':>16}")
+        for name, request in (("sync", sync_request), ("async", async_request)):
+            await request(user_ids[0], 0)  # open the pool before timing
+            result = await run(request, user_ids, args.concurrency, args.seconds, args.db_latency_ms / 1000)
+            print(
+                f"{name:>8} {result['requests_per_second']:>9.1f}"
+                f" {result['loop_lag_p50_ms']:>16.2f} {result['loop_lag_max_ms']:>16.2f}"
+            )
+    finally:
+        await async_engine.dispose()
+        with engine.begin() as connection:
+            delete_sitters(connection, ids)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sitters", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--db-latency-ms", type=float, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    asyncio.run(main(parser.parse_args()))
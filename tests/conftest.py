@@ -0,0 +1,14 @@
+import os
+
+# Settings are read at import time. Nothing here connects to Postgres: engines only
+# connect on first use, and shared state stays in this process.
+os.environ.setdefault("DATABASE_URL", "postgresql+psycopg2://postgres@localhost/wagy_test")
+os.environ.setdefault("SHARED_STORE_URL", "memory://")
+os.environ.setdefault("MAIL_FROM", "otp@example.com")
+
+import pytest
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
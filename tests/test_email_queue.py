@@ -0,0 +1,125 @@
+import asyncio
+import socket
+import pytest
+from aiosmtpd.controller import Controller
+from app.core.config import settings
+from app.services.email_service import MailQueue, build_message
+
+pytestmark = pytest.mark.anyio
+
+
+class SinkHandler:
+    """Accepts mail into ``received``; replies with the scripted codes in ``data_replies`` first."""
+
+    def __init__(self):
+        self.received = []
+        self.data_replies = []
+        self.refused = set()
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address in self.refused:
+            return "550 No such user here"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        if self.data_replies:
+            return self.data_replies.pop(0)
+        self.received.append(envelope.rcpt_tos)
+        return "250 Message accepted for delivery"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def sink(monkeypatch):
+    handler = SinkHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=free_port())
+    controller.start()
+    monkeypatch.setattr(settings, "MAIL_SERVER", controller.hostname)
+    monkeypatch.setattr(settings, "MAIL_PORT", controller.port)
+    monkeypatch.setattr(settings, "MAIL_SSL_TLS", False)
+    monkeypatch.setattr(settings, "MAIL_STARTTLS", False)
+    monkeypatch.setattr(settings, "MAIL_USERNAME", None)
+    yield handler
+    controller.stop()
+
+
+def make_queue(retry_backoff_seconds=0.01):
+    return MailQueue(
+        max_size=100, batch_size=10, max_retries=2, retry_backoff_seconds=retry_backoff_seconds, idle_seconds=30
+    )
+
+
+async def wait_for(condition, timeout=5.0):
+    async def poll():
+        while not condition():
+            await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(poll(), timeout)
+
+
+async def test_delivers_queued_mail(sink):
+    queue = make_queue()
+    for n in range(3):
+        queue.enqueue(build_message([f"user{n}@example.com"], "OTP", "1234"))
+    await queue.stop()
+    assert sink.received == [["user0@example.com"], ["user1@example.com"], ["user2@example.com"]]
+    assert queue.snapshot()["sent"] == 3
+
+
+async def test_retries_temporary_rejection(sink):
+    sink.data_replies = ["451 Try again later"]
+    queue = make_queue()
+    queue.enqueue(build_message(["user@example.com"], "OTP", "1234"))
+    await wait_for(lambda: queue.sent == 1)
+    await queue.stop()
+    assert sink.received == [["user@example.com"]]
+    assert queue.retries == 1
+    assert queue.failed == 0
+
+
+async def test_refused_recipient_is_not_retried(sink):
+    sink.refused.add("nobody@example.com")
+    queue = make_queue()
+    queue.enqueue(build_message(["nobody@example.com"], "OTP", "1234"))
+    await queue.stop()
+    assert sink.received == []
+    assert queue.retries == 0
+    assert queue.failed == 1
+
+
+async def test_permanent_rejection_is_not_retried(sink):
+    sink.data_replies = ["554 Message rejected"]
+    queue = make_queue()
+    queue.enqueue(build_message(["user@example.com"], "OTP", "1234"))
+    await queue.stop()
+    assert sink.received == []
+    assert queue.retries == 0
+    assert queue.failed == 1
+
+
+async def test_stop_flushes_mail_waiting_on_backoff(sink):
+    sink.data_replies = ["451 Try again later"]
+    queue = make_queue(retry_backoff_seconds=60)
+    queue.enqueue(build_message(["user@example.com"], "OTP", "1234"))
+    await wait_for(lambda: queue.retries == 1)
+    assert queue.snapshot()["retrying"] == 1
+    await asyncio.wait_for(queue.stop(timeout=5), 10)
+    assert sink.received == [["user@example.com"]]
+    assert queue.snapshot()["retrying"] == 0
+    assert queue.sent == 1
+
+
+async def test_unreachable_server_gives_up_after_retries(sink, monkeypatch):
+    monkeypatch.setattr(settings, "MAIL_PORT", free_port())
+    queue = make_queue()
+    queue.enqueue(build_message(["user@example.com"], "OTP", "1234"))
+    await wait_for(lambda: queue.failed == 1)
+    await queue.stop()
+    assert queue.retries == 2
+    assert queue.sent == 0
@@ -0,0 +1,113 @@
+import time
+import httpx
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import JWTError, jwk, jwt
+from app.services.google_verifier import GoogleTokenVerifier
+
+pytestmark = pytest.mark.anyio
+
+JWKS_URL = "https://issuer.example.com/certs"
+CLIENT_ID = "wagy-test.apps.googleusercontent.com"
+
+
+def private_pem() -> bytes:
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    return key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption())
+
+
+class FakeIssuer:
+    """Signs ID tokens and serves the matching JWKS document, like Google would."""
+
+    def __init__(self):
+        self.keys = {}
+        self.fetches = 0
+        self.rotate()
+
+    def rotate(self):
+        kid = f"key-{len(self.keys) + 1}"
+        self.keys = {kid: private_pem()}
+        self.kid = kid
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.fetches += 1
+        keys = [
+            {**jwk.construct(pem, "RS256").public_key().to_dict(), "kid": kid, "use": "sig"}
+            for kid, pem in self.keys.items()
+        ]
+        return httpx.Response(200, json={"keys": keys}, headers={"Cache-Control": "public, max-age=3600"})
+
+    def token(self, **claims) -> str:
+        now = int(time.time())
+        payload = {
+            "iss": "https://accounts.google.com",
+            "aud": CLIENT_ID,
+            "sub": "1234567890",
+            "email": "ann@example.com",
+            "iat": now,
+            "exp": now + 3600,
+            **claims,
+        }
+        return jwt.encode(payload, self.keys[self.kid], algorithm="RS256", headers={"kid": self.kid})
+
+
+@pytest.fixture
+def issuer():
+    return FakeIssuer()
+
+
+@pytest.fixture
+async def verifier(issuer):
+    verifier = GoogleTokenVerifier(
+        JWKS_URL, CLIENT_ID, min_refresh_seconds=0, transport=httpx.MockTransport(issuer.handler)
+    )
+    yield verifier
+    await verifier.stop()
+
+
+async def test_valid_token(issuer, verifier):
+    claims = await verifier.verify(issuer.token())
+    assert claims["email"] == "ann@example.com"
+    # Keys stay cached for the max-age of the JWKS response
+    await verifier.verify(issuer.token())
+    assert issuer.fetches == 1
+
+
+async def test_expired_token(issuer, verifier):
+    now = int(time.time())
+    with pytest.raises(JWTError):
+        await verifier.verify(issuer.token(iat=now - 7200, exp=now - 3600))
+
+
+async def test_wrong_audience(issuer, verifier):
+    with pytest.raises(JWTError):
+        await verifier.verify(issuer.token(aud="someone-else.apps.googleusercontent.com"))
+
+
+async def test_wrong_issuer(issuer, verifier):
+    with pytest.raises(JWTError):
+        await verifier.verify(issuer.token(iss="https://evil.example.com"))
+
+
+async def test_unknown_kid_refreshes_keys(issuer, verifier):
+    await verifier.verify(issuer.token())
+    issuer.rotate()
+    claims = await verifier.verify(issuer.token())
+    assert claims["sub"] == "1234567890"
+    assert issuer.fetches == 2
+
+
+async def test_unknown_kid_refresh_is_rate_limited(issuer):
+    verifier = GoogleTokenVerifier(
+        JWKS_URL, CLIENT_ID, min_refresh_seconds=60, transport=httpx.MockTransport(issuer.handler)
+    )
+    try:
+        await verifier.verify(issuer.token())
+        forged = jwt.encode({"aud": CLIENT_ID}, private_pem(), algorithm="RS256", headers={"kid": "unknown"})
+        for _ in range(3):
+            with pytest.raises(JWTError):
+                await verifier.verify(forged)
+    finally:
+        await verifier.stop()
+    assert issuer.fetches == 1
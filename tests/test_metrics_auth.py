@@ -0,0 +1,45 @@
+import uuid
+import httpx
+import pytest
+from fastapi import FastAPI
+from app.api.v1.endpoints import metrics
+from app.core.security import create_access_token
+from app.models.user import UserRole
+
+pytestmark = pytest.mark.anyio
+
+PATHS = ["/metrics/db-pool", "/metrics/token-cache", "/metrics/otp-gateway", "/metrics/email-queue"]
+
+
+@pytest.fixture
+async def client():
+    app = FastAPI()
+    app.include_router(metrics.router, prefix="/metrics")
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+def bearer(role=None) -> dict:
+    claims = {"sub": str(uuid.uuid4())}
+    if role is not None:
+        claims["role"] = role
+    return {"Authorization": f"Bearer {create_access_token(claims)}"}
+
+
+@pytest.mark.parametrize("path", PATHS)
+async def test_anonymous_request_is_unauthorized(client, path):
+    response = await client.get(path)
+    assert response.status_code == 401
+
+
+@pytest.mark.parametrize("role", [None, UserRole.USER.value])
+@pytest.mark.parametrize("path", PATHS)
+async def test_non_admin_is_forbidden(client, path, role):
+    response = await client.get(path, headers=bearer(role))
+    assert response.status_code == 403
+
+
+@pytest.mark.parametrize("path", PATHS)
+async def test_admin_reads_metrics(client, path):
+    response = await client.get(path, headers=bearer(UserRole.ADMIN.value))
+    assert response.status_code == 200
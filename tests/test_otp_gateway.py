@@ -0,0 +1,183 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import anyio
+import pytest
+from app.services.otp_gateway import CircuitBreaker, CircuitOpenError, OTPGatewayClient, OTPGatewayError
+
+pytestmark = pytest.mark.anyio
+
+
+class MockGateway(ThreadingHTTPServer):
+    """Local stand-in for the OTP gateway, answering with scripted (status, delay) replies."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), MockGatewayHandler)
+        self.replies = []
+        self.requests = []
+        self.connections = 0
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/custom_codes"
+
+
+class MockGatewayHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def _reply(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.server.requests.append((self.command, self.rfile.read(length).decode()))
+        status, delay = self.server.replies.pop(0) if self.server.replies else (200, 0)
+        time.sleep(delay)
+        self.send_response(status)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    do_POST = do_PUT = _reply
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def gateway():
+    server = MockGateway()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_client(url, retries=2, threshold=3, reset_seconds=30.0, timeout=2.0):
+    return OTPGatewayClient(
+        url,
+        timeout=timeout,
+        connect_timeout=1.0,
+        retries=retries,
+        backoff_seconds=0.01,
+        breaker=CircuitBreaker(threshold, reset_seconds),
+    )
+
+
+async def test_calls_share_one_keep_alive_connection(gateway):
+    client = make_client(gateway.url)
+    try:
+        await client.send_code("9120000000")
+        assert await client.verify_code("9120000000", "1234")
+    finally:
+        await client.aclose()
+    assert gateway.requests == [("POST", "phoneNumber=9120000000"), ("PUT", "phoneNumber=9120000000&code=1234")]
+    assert gateway.connections == 1
+    assert {stats["operation"]: stats["calls"] for stats in client.stats.snapshot()} == {"send_code": 1, "verify_code": 1}
+
+
+async def test_wrong_code_is_not_a_gateway_failure(gateway):
+    gateway.replies = [(400, 0)]
+    client = make_client(gateway.url)
+    try:
+        assert not await client.verify_code("9120000000", "0000")
+    finally:
+        await client.aclose()
+    assert client.breaker.failures == 0
+
+
+async def test_retries_unavailable_gateway(gateway):
+    gateway.replies = [(503, 0), (502, 0), (200, 0)]
+    client = make_client(gateway.url)
+    try:
+        await client.send_code("9120000000")
+    finally:
+        await client.aclose()
+    assert len(gateway.requests) == 3
+    assert client.stats.snapshot()[0]["failures"] == 2
+    assert client.breaker.state == "closed"
+
+
+async def test_server_error_is_not_retried(gateway):
+    gateway.replies = [(500, 0)]
+    client = make_client(gateway.url)
+    try:
+        with pytest.raises(OTPGatewayError):
+            await client.send_code("9120000000")
+    finally:
+        await client.aclose()
+    assert len(gateway.requests) == 1
+    assert client.breaker.failures == 1
+
+
+async def test_breaker_opens_and_fails_fast(gateway):
+    gateway.replies = [(500, 0)] * 3
+    client = make_client(gateway.url, threshold=3)
+    try:
+        for _ in range(3):
+            with pytest.raises(OTPGatewayError):
+                await client.send_code("9120000000")
+        with pytest.raises(CircuitOpenError):
+            await client.send_code("9120000000")
+    finally:
+        await client.aclose()
+    assert len(gateway.requests) == 3
+    assert client.breaker.state == "open"
+
+
+async def test_half_open_trial_closes_breaker(gateway):
+    client = make_client(gateway.url, threshold=1, reset_seconds=0.05)
+    gateway.replies = [(500, 0)]
+    try:
+        with pytest.raises(OTPGatewayError):
+            await client.send_code("9120000000")
+        assert client.breaker.state == "open"
+        await anyio.sleep(0.06)
+        assert client.breaker.state == "half_open"
+        await client.send_code("9120000000")
+    finally:
+        await client.aclose()
+    assert client.breaker.state == "closed"
+
+
+async def test_cancelled_half_open_trial_does_not_wedge_breaker(gateway):
+    client = make_client(gateway.url, threshold=1, reset_seconds=0.05)
+    gateway.replies = [(500, 0), (200, 1.0)]
+    try:
+        with pytest.raises(OTPGatewayError):
+            await client.send_code("9120000000")
+        await anyio.sleep(0.06)
+        # The trial is abandoned mid-request, e.g. the client disconnected
+        with anyio.move_on_after(0.1):
+            await client.send_code("9120000000")
+        assert client.breaker.state == "open"
+        await anyio.sleep(0.06)
+        assert client.breaker.allow()
+    finally:
+        await client.aclose()
+
+
+async def test_unexpected_error_in_half_open_trial_does_not_wedge_breaker(gateway, monkeypatch):
+    client = make_client(gateway.url, threshold=1, reset_seconds=0.05)
+    gateway.replies = [(500, 0)]
+    try:
+        with pytest.raises(OTPGatewayError):
+            await client.send_code("9120000000")
+        await anyio.sleep(0.06)
+
+        async def broken_request(*args, **kwargs):
+            raise RuntimeError("bug in the transport")
+
+        monkeypatch.setattr(client._http(), "request", broken_request)
+        with pytest.raises(RuntimeError):
+            await client.send_code("9120000000")
+        monkeypatch.undo()
+        await anyio.sleep(0.06)
+        await client.send_code("9120000000")
+    finally:
+        await client.aclose()
+    assert client.breaker.state == "closed"
@@ -0,0 +1,38 @@
+import time
+import pytest
+from app.core.shared_store import SQLITE_SCHEME
+from app.services.otp_store import MemoryOTPStore, OTPCheck, SQLiteOTPStore
+
+MAX_ATTEMPTS = 3
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return MemoryOTPStore(MAX_ATTEMPTS, max_entries=100)
+    return SQLiteOTPStore(SQLITE_SCHEME + str(tmp_path / "otp.db"), MAX_ATTEMPTS)
+
+
+def test_code_verifies_once(store):
+    store.issue("+989120000000", "123456", ttl=60)
+    assert store.verify("+989120000000", "123456") == OTPCheck.VERIFIED
+    assert store.verify("+989120000000", "123456") == OTPCheck.MISSING
+
+
+def test_unknown_identity_is_missing(store):
+    assert store.verify("+989120000000", "123456") == OTPCheck.MISSING
+
+
+def test_expired_code_reports_expired(store, monkeypatch):
+    store.issue("+989120000000", "123456", ttl=60)
+    later = time.time() + 61
+    monkeypatch.setattr(time, "time", lambda: later)
+    assert store.verify("+989120000000", "123456") == OTPCheck.EXPIRED
+    assert store.verify("+989120000000", "123456") == OTPCheck.MISSING
+
+
+def test_attempts_are_limited(store):
+    store.issue("+989120000000", "123456", ttl=60)
+    for _ in range(MAX_ATTEMPTS):
+        assert store.verify("+989120000000", "000000") == OTPCheck.INVALID
+    assert store.verify("+989120000000", "123456") == OTPCheck.TOO_MANY_ATTEMPTS
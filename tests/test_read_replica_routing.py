@@ -0,0 +1,96 @@
+import sqlite3
+import uuid
+import anyio
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.core.config import settings
+from app.db import session as db_session
+from app.db.recent_writes import SQLiteRecentWrites
+
+pytestmark = pytest.mark.anyio
+
+
+def make_database(path):
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE profiles (user_id TEXT PRIMARY KEY, name TEXT)")
+    conn.commit()
+    conn.close()
+    return create_async_engine(f"sqlite+aiosqlite:///{path}")
+
+
+@pytest.fixture
+def databases(tmp_path, monkeypatch):
+    """A primary and a replica SQLite file; the replica never receives the writes, like one lagging behind."""
+    primary = make_database(tmp_path / "primary.db")
+    replica = make_database(tmp_path / "replica.db")
+    monkeypatch.setattr(db_session, "async_engine", primary)
+    monkeypatch.setattr(db_session, "read_engines", {"replica-0": replica})
+    monkeypatch.setattr(db_session, "_replica_cycle", iter(lambda: replica, None))
+    return primary, replica
+
+
+def use_worker(monkeypatch, store):
+    # Each worker process has its own store object over the same shared file
+    monkeypatch.setattr(db_session, "recent_writes", store)
+
+
+async def read_name(user_id):
+    sessions = db_session.get_read_session(user_id)
+    session = await sessions.__anext__()
+    try:
+        result = await session.exec(text("SELECT name FROM profiles WHERE user_id = :id").bindparams(id=str(user_id)))
+        return result.scalar()
+    finally:
+        await sessions.aclose()
+
+
+async def write_name(user_id, name):
+    async with db_session.AsyncSession(db_session.async_engine) as session:
+        await session.exec(text("INSERT INTO profiles VALUES (:id, :name)").bindparams(id=str(user_id), name=name))
+        await session.commit()
+    await db_session.record_write(user_id)
+
+
+async def test_reads_go_to_replica_without_recent_write(databases, tmp_path, monkeypatch):
+    primary, replica = databases
+    use_worker(monkeypatch, SQLiteRecentWrites(f"sqlite:///{tmp_path / 'shared.db'}"))
+    assert await db_session._read_engine(uuid.uuid4()) is replica
+    assert await db_session._read_engine(None) is replica
+
+
+async def test_read_after_write_on_another_worker_sees_the_write(databases, tmp_path, monkeypatch):
+    primary, replica = databases
+    shared = f"sqlite:///{tmp_path / 'shared.db'}"
+    user_id, other_id = uuid.uuid4(), uuid.uuid4()
+
+    use_worker(monkeypatch, SQLiteRecentWrites(shared))
+    await write_name(user_id, "Ann")
+
+    use_worker(monkeypatch, SQLiteRecentWrites(shared))
+    assert await db_session._read_engine(user_id) is primary
+    assert await read_name(user_id) == "Ann"
+    # Other users keep reading from the replica
+    assert await db_session._read_engine(other_id) is replica
+
+
+async def test_reads_return_to_replica_after_window(databases, tmp_path, monkeypatch):
+    primary, replica = databases
+    monkeypatch.setattr(settings, "READ_YOUR_WRITES_SECONDS", 0.05)
+    use_worker(monkeypatch, SQLiteRecentWrites(f"sqlite:///{tmp_path / 'shared.db'}"))
+    user_id = uuid.uuid4()
+    await write_name(user_id, "Ann")
+    assert await db_session._read_engine(user_id) is primary
+
+    await anyio.sleep(0.1)
+    assert await db_session._read_engine(user_id) is replica
+    assert await read_name(user_id) is None
+
+
+async def test_no_marker_without_replicas(tmp_path, monkeypatch):
+    store = SQLiteRecentWrites(f"sqlite:///{tmp_path / 'shared.db'}")
+    use_worker(monkeypatch, store)
+    monkeypatch.setattr(db_session, "read_engines", {})
+    user_id = uuid.uuid4()
+    await db_session.record_write(user_id)
+    assert not store.is_recent(user_id)